@@ -0,0 +1,116 @@
+from time import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from reviews.models import User
+
+# Поля пользователя, которые попадают в токен и нужны для проверки прав.
+USER_CLAIMS = ('username', 'role', 'is_superuser')
+# Поля, изменение которых делает устаревшими уже выданные токены.
+AUTH_FIELDS = USER_CLAIMS + ('is_active',)
+
+USER_STATE_KEY = 'jwt-user-state:{}'
+USER_CHANGED_KEY = 'jwt-user-changed:{}'
+
+
+class ClaimsAccessToken(AccessToken):
+    """ Токен доступа с логином, ролью и признаком суперпользователя. """
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        for claim in USER_CLAIMS:
+            token[claim] = getattr(user, claim)
+        return token
+
+
+def load_user_state(user_id):
+    return User.objects.filter(pk=user_id).values(*AUTH_FIELDS).first()
+
+
+def invalidate_user_state(user_id, changed_at):
+    """
+    Сбрасывает кешированные права пользователя.
+    Токены, выданные до changed_at, проверяются по базе, а не по
+    содержимому токена. Кеш локален для процесса, поэтому в остальных
+    процессах права обновятся не позже чем через JWT_USER_CACHE_TIMEOUT
+    секунд.
+    """
+    cache.delete(USER_STATE_KEY.format(user_id))
+    cache.set(
+        USER_CHANGED_KEY.format(user_id), changed_at,
+        settings.JWT_USER_CACHE_TIMEOUT,
+    )
+
+
+def token_state(validated_token, changed_at):
+    """
+    Права из содержимого токена и срок, на который им можно доверять,
+    или None. Токену доверяют только первые JWT_USER_CACHE_TIMEOUT
+    секунд после выдачи: метка изменения прав хранится в кеше процесса
+    и может отсутствовать, а роль к этому времени уже поменяться.
+    """
+    if not all(claim in validated_token for claim in USER_CLAIMS):
+        return None
+    issued_at = validated_token.get('iat', 0)
+    if changed_at is not None and issued_at <= changed_at:
+        return None
+    trusted_for = issued_at + settings.JWT_USER_CACHE_TIMEOUT - int(time())
+    if trusted_for <= 0:
+        return None
+    state = {claim: validated_token[claim] for claim in USER_CLAIMS}
+    state['is_active'] = True
+    return state, trusted_for
+
+
+class CachedClaimsJWTAuthentication(JWTAuthentication):
+    """
+    JWT-аутентификация без запроса пользователя к базе.
+    Права берутся из свежего токена и кешируются на JWT_USER_CACHE_TIMEOUT
+    секунд; старые токены и токены, выданные до изменения роли,
+    проверяются по базе.
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(
+                _('Token contained no recognizable user identification')
+            )
+
+        state_key = USER_STATE_KEY.format(user_id)
+        changed_key = USER_CHANGED_KEY.format(user_id)
+        cached = cache.get_many((state_key, changed_key))
+        state = cached.get(state_key)
+        if state is None:
+            from_token = token_state(validated_token, cached.get(changed_key))
+            if from_token is not None:
+                state, timeout = from_token
+            else:
+                state = load_user_state(user_id)
+                timeout = settings.JWT_USER_CACHE_TIMEOUT
+            if state is not None:
+                cache.set(state_key, state, timeout)
+
+        if state is None:
+            raise AuthenticationFailed(
+                _('User not found'), code='user_not_found'
+            )
+        if not state['is_active']:
+            raise AuthenticationFailed(
+                _('User is inactive'), code='user_inactive'
+            )
+
+        user = User(id=user_id, **state)
+        user._state.adding = False
+        user._state.db = DEFAULT_DB_ALIAS
+        return user
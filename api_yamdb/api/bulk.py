@@ -0,0 +1,304 @@
+from django.conf import settings
+from django.db import IntegrityError, connection, transaction
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+from rest_framework.status import HTTP_201_CREATED, HTTP_400_BAD_REQUEST
+
+from reviews.changelog import record_instances
+from reviews.constants import CHANGE_CREATED, CHANGE_UPDATED
+from reviews.db import reset_sequences
+from reviews.models import Category, Genre, Title, User
+
+from .caching import bump_response_version, object_version_name
+from .filters import TITLE_FILTER_FIELDS
+from .serializers import (TitleBulkSerializer, TitleSerializerPost,
+                          UsersBulkSerializer)
+
+CREATED = 'created'
+UPDATED = 'updated'
+ERROR = 'error'
+CONFLICT_MESSAGE = (
+    'Пакет конфликтует с параллельным изменением, повторите запрос.'
+)
+
+TitleGenre = Title.genre.through
+
+
+def check_batch(data):
+    """Тело пакетного запроса: список не длиннее API_BULK_MAX_SIZE."""
+    if not isinstance(data, list) or not data:
+        raise ValidationError(
+            {'non_field_errors': ['Ожидается непустой список объектов.']}
+        )
+    if len(data) > settings.API_BULK_MAX_SIZE:
+        raise ValidationError({'non_field_errors': [
+            f'В одном запросе не больше {settings.API_BULK_MAX_SIZE} '
+            f'объектов.'
+        ]})
+    return data
+
+
+def bulk_status(results):
+    """201, если записан хотя бы один элемент пакета, иначе 400."""
+    if any(result['status'] != ERROR for result in results):
+        return HTTP_201_CREATED
+    return HTTP_400_BAD_REQUEST
+
+
+def add_error(errors, field, message):
+    errors.setdefault(field, []).append(message)
+
+
+def provision_users(data):
+    """
+    Пакетное создание пользователей.
+    Уникальность логинов и адресов проверяется двумя запросами на весь
+    пакет, пользователи создаются через bulk_create.
+    Возвращает результат для каждого элемента в порядке запроса.
+    """
+    serializers = [
+        UsersBulkSerializer(data=item) for item in check_batch(data)
+    ]
+    valid = [
+        serializer for serializer in serializers if serializer.is_valid()
+    ]
+    usernames = [item.validated_data['username'] for item in valid]
+    emails = [item.validated_data['email'] for item in valid]
+    taken_usernames = set(User.objects.filter(
+        username__in=usernames
+    ).values_list('username', flat=True))
+    taken_emails = set(User.objects.filter(
+        email__in=emails
+    ).values_list('email', flat=True))
+
+    results = []
+    users = []
+    for serializer in serializers:
+        if serializer.errors:
+            results.append({'status': ERROR, 'errors': serializer.errors})
+            continue
+        values = serializer.validated_data
+        errors = {}
+        # Повтор внутри пакета считается занятым значением.
+        if values['username'] in taken_usernames:
+            add_error(errors, 'username',
+                      'Пользователь с таким именем уже существует.')
+        if values['email'] in taken_emails:
+            add_error(errors, 'email',
+                      'Пользователь с такой почтой уже существует.')
+        if errors:
+            results.append({'status': ERROR, 'errors': errors})
+            continue
+        # Отклонённый элемент не занимает свои значения.
+        taken_usernames.add(values['username'])
+        taken_emails.add(values['email'])
+        users.append(User(**values))
+        results.append({'status': CREATED, 'data': serializer.data})
+
+    try:
+        with transaction.atomic():
+            User.objects.bulk_create(users)
+    except IntegrityError:
+        # Пользователь с тем же логином появился между проверкой и
+        # вставкой: пакет целиком можно отправить повторно.
+        raise ValidationError({'non_field_errors': [CONFLICT_MESSAGE]})
+    return results
+
+
+def slug_ids(model, slugs):
+    return dict(
+        model.objects.filter(slug__in=slugs).values_list('slug', 'id')
+    )
+
+
+def assign_ids(titles):
+    """
+    id новых произведений для связей с жанрами.
+    Без RETURNING в bulk_create id выдаются явно после текущего максимума.
+    Где поддерживается SELECT ... FOR UPDATE, последняя строка блокируется
+    до конца транзакции и параллельный пакет ждёт её фиксации. Иначе
+    (SQLite) или на пустой таблице параллельные пакеты могут получить
+    одинаковые id: второй завершится IntegrityError и CONFLICT_MESSAGE.
+    """
+    if connection.features.can_return_rows_from_bulk_insert or not titles:
+        return False
+    last = Title.objects.order_by('-id').values_list('id', flat=True)
+    if connection.features.has_select_for_update:
+        last = last.select_for_update()
+    first = (last.first() or 0) + 1
+    for pk, title in enumerate(titles, start=first):
+        title.pk = pk
+    return True
+
+
+def title_errors(values, categories, genres, existing, updated):
+    """Проверка элемента по слагам и произведениям, загруженным заранее."""
+    errors = {}
+    if 'category' in values and values['category'] not in categories:
+        add_error(errors, 'category',
+                  f'Категория {values["category"]} не найдена.')
+    for slug in values.get('genre', ()):
+        if slug not in genres:
+            add_error(errors, 'genre', f'Жанр {slug} не найден.')
+    pk = values.get('id')
+    if pk is not None and (pk not in existing or pk in updated):
+        add_error(errors, 'id',
+                  f'Произведение {pk} не найдено или повторяется в пакете.')
+    return errors
+
+
+def write_titles(created, updated, updated_fields, title_genres):
+    """Запись пакета: новые и изменённые произведения, связи с жанрами."""
+    with transaction.atomic():
+        explicit_ids = assign_ids(created)
+        Title.objects.bulk_create(created)
+        if explicit_ids:
+            reset_sequences([Title])
+        if updated:
+            # bulk_update не заполняет auto_now, а замена жанров тоже
+            # меняет произведение.
+            now = timezone.now()
+            for title in updated.values():
+                title.updated_at = now
+            Title.objects.bulk_update(
+                updated.values(), [*updated_fields, 'updated_at']
+            )
+        replaced = [
+            title.pk for title, _ in title_genres if title.pk in updated
+        ]
+        if replaced:
+            TitleGenre.objects.filter(title_id__in=replaced).delete()
+        TitleGenre.objects.bulk_create([
+            TitleGenre(title_id=title.pk, genre_id=genre_id)
+            for title, genre_ids in title_genres
+            for genre_id in dict.fromkeys(genre_ids)
+        ])
+        record_instances(created, CHANGE_CREATED)
+        record_instances(updated.values(), CHANGE_UPDATED)
+
+
+def upsert_titles(data):
+    """
+    Пакетное создание и обновление произведений в одной транзакции.
+    Слаги категорий и жанров разрешаются двумя запросами на весь пакет,
+    произведения и связи с жанрами записываются через bulk_create.
+    Возвращает результат для каждого элемента в порядке запроса.
+    """
+    serializers = [
+        TitleBulkSerializer(data=item) for item in check_batch(data)
+    ]
+    valid = [
+        serializer.validated_data for serializer in serializers
+        if serializer.is_valid()
+    ]
+    categories = slug_ids(
+        Category, {values['category'] for values in valid
+                   if 'category' in values}
+    )
+    genres = slug_ids(
+        Genre, {slug for values in valid for slug in values.get('genre', ())}
+    )
+    update_ids = {values['id'] for values in valid if 'id' in values}
+    existing = Title.objects.in_bulk(update_ids) if update_ids else {}
+
+    results = []
+    created = []
+    updated = {}
+    updated_fields = set()
+    title_genres = []
+    for serializer in serializers:
+        if serializer.errors:
+            results.append({'status': ERROR, 'errors': serializer.errors})
+            continue
+        values = dict(serializer.validated_data)
+        errors = title_errors(values, categories, genres, existing, updated)
+        if errors:
+            results.append({'status': ERROR, 'errors': errors})
+            continue
+
+        pk = values.pop('id', None)
+        genre_slugs = values.pop('genre', None)
+        title = build_title(pk, values, categories, existing)
+        if pk is None:
+            created.append(title)
+        else:
+            updated[pk] = title
+            updated_fields.update(values)
+        if genre_slugs is not None:
+            title_genres.append(
+                (title, [genres[slug] for slug in genre_slugs])
+            )
+        results.append({
+            'status': CREATED if pk is None else UPDATED,
+            'title': title,
+        })
+
+    try:
+        write_titles(created, updated, updated_fields, title_genres)
+    except IntegrityError:
+        raise ValidationError({'non_field_errors': [CONFLICT_MESSAGE]})
+    # bulk_create и bulk_update не вызывают сигналы.
+    if created or updated:
+        names = [object_version_name(Title, pk) for pk in updated]
+        if (created or title_genres
+                or updated_fields & set(TITLE_FILTER_FIELDS[Title])):
+            names.append(Title._meta.label_lower)
+        bump_response_version(*names)
+    return with_title_data(results)
+
+
+def build_title(pk, values, categories, existing):
+    """Новое произведение или существующее с изменёнными полями."""
+    if 'category' in values:
+        values['category_id'] = categories[values.pop('category')]
+    if pk is None:
+        return Title(**values)
+    title = existing[pk]
+    for field, value in values.items():
+        setattr(title, field, value)
+    return title
+
+
+def with_title_data(results):
+    """Записанные произведения в ответе - как в одиночном запросе."""
+    written = Title.objects.select_related('category').prefetch_related(
+        'genre'
+    ).in_bulk([
+        result['title'].pk for result in results if 'title' in result
+    ])
+    for result in results:
+        title = result.pop('title', None)
+        if title is not None:
+            result['data'] = TitleSerializerPost(written[title.pk]).data
+    return results
+
+
+def parse_ids(value):
+    """Список id из строки 1,2,3 без повторов, в порядке запроса."""
+    try:
+        ids = [int(item) for item in value.split(',') if item.strip()]
+    except ValueError:
+        raise ValidationError({'ids': ['Ожидается список id через запятую.']})
+    ids = list(dict.fromkeys(ids))
+    if not ids:
+        raise ValidationError({'ids': ['Укажите хотя бы один id.']})
+    if len(ids) > settings.TITLES_MULTI_GET_MAX_IDS:
+        raise ValidationError({'ids': [
+            f'В одном запросе не больше '
+            f'{settings.TITLES_MULTI_GET_MAX_IDS} id.'
+        ]})
+    return ids
+
+
+def get_titles(queryset, value):
+    """
+    Произведения по списку id в порядке запроса и отсутствующие id.
+    Рейтинг хранится в таблице, поэтому хватает запроса произведений
+    и запроса жанров.
+    """
+    ids = parse_ids(value)
+    titles = queryset.in_bulk(ids)
+    return (
+        [titles[pk] for pk in ids if pk in titles],
+        [pk for pk in ids if pk not in titles],
+    )
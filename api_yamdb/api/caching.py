@@ -0,0 +1,65 @@
+from hashlib import md5
+from time import time_ns
+
+from django.conf import settings
+from django.core.cache import caches
+
+RESPONSE_VERSION_KEY = 'api-response-version:{}'
+RESPONSE_KEY = 'api-response:{}:{}:{}'
+# Версия, которая меняется при любом изменении: по ней видно, что
+# запись произошла, пока собирался ответ.
+ANY_CHANGE = '*'
+
+
+def response_cache():
+    return caches[settings.API_RESPONSE_CACHE]
+
+
+def response_versions(names):
+    """
+    Текущие версии для набора имён: модели (reviews.genre) или
+    отдельного объекта (reviews.title:5).
+    Начальная версия - время, поэтому после вытеснения ключа версии
+    старые ответы не становятся снова действительными.
+    """
+    cache = response_cache()
+    keys = {RESPONSE_VERSION_KEY.format(name): name for name in names}
+    found = cache.get_many(keys)
+    missing = [key for key in keys if key not in found]
+    if missing:
+        for key in missing:
+            cache.add(key, time_ns(), None)
+        found.update(cache.get_many(missing))
+    return {keys[key]: version for key, version in found.items()}
+
+
+def response_version(name):
+    return response_versions([name])[name]
+
+
+def bump_response_version(*names):
+    """
+    Делает недействительными ответы, зависящие от этих имён.
+    ANY_CHANGE меняется первым: запрос, увидевший новую версию объекта,
+    увидит и новую ANY_CHANGE.
+    """
+    cache = response_cache()
+    for name in (ANY_CHANGE, *names):
+        key = RESPONSE_VERSION_KEY.format(name)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, time_ns(), None)
+
+
+def object_version_name(model, pk):
+    return f'{model._meta.label_lower}:{pk}'
+
+
+def response_cache_key(label, request, version=None):
+    """Ключ ответа: модель, версия и полный адрес запроса."""
+    url = request.build_absolute_uri()
+    digest = md5(url.encode('utf-8')).hexdigest()
+    if version is None:
+        version = response_version(label)
+    return RESPONSE_KEY.format(label, version, digest)
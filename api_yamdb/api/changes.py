@@ -0,0 +1,184 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Max, Q
+from django.utils import timezone
+from rest_framework.exceptions import APIException, ValidationError
+from rest_framework.pagination import _positive_int
+from rest_framework.status import HTTP_410_GONE
+
+from reviews.constants import (CHANGE_CREATED, CHANGE_DELETED, CHANGE_PRUNED,
+                               ENTITY_COMMENT, ENTITY_REVIEW, ENTITY_TITLE)
+from reviews.models import ChangeLog, Comments, Review, Title
+
+from .serializers import CommentSerializer, ReviewSerializer, TitleSerializer
+
+CURSOR_PARAM = 'cursor'
+ENTITY_PARAM = 'entity'
+LIMIT_PARAM = 'limit'
+
+# Запрос и сериализатор текущего состояния объектов каждого типа.
+ENTITY_SOURCES = {
+    ENTITY_TITLE: (
+        Title.objects.select_related('category').prefetch_related('genre'),
+        TitleSerializer,
+    ),
+    ENTITY_REVIEW: (
+        Review.objects.select_related('title', 'author'),
+        ReviewSerializer,
+    ),
+    ENTITY_COMMENT: (
+        Comments.objects.select_related('review', 'author'),
+        CommentSerializer,
+    ),
+}
+
+
+class CursorExpired(APIException):
+    status_code = HTTP_410_GONE
+    default_detail = ('Курсор устарел: записи журнала удалены, '
+                      'нужна полная синхронизация.')
+    default_code = 'cursor_expired'
+
+
+def parse_cursor(value):
+    try:
+        cursor = int(value)
+    except (TypeError, ValueError):
+        cursor = -1
+    if cursor < 0:
+        raise ValidationError({CURSOR_PARAM: ['Некорректный курсор.']})
+    return cursor
+
+
+def parse_entities(value):
+    if not value:
+        return None
+    entities = [name.strip() for name in value.split(',') if name.strip()]
+    unknown = set(entities) - set(ENTITY_SOURCES)
+    if unknown:
+        raise ValidationError({ENTITY_PARAM: [
+            f'Неизвестные типы: {", ".join(sorted(unknown))}.'
+        ]})
+    return entities
+
+
+def parse_limit(value):
+    try:
+        return _positive_int(
+            value, strict=True, cutoff=settings.CHANGE_FEED_MAX_PAGE_SIZE
+        )
+    except (TypeError, ValueError):
+        return settings.CHANGE_FEED_PAGE_SIZE
+
+
+def settled_changes():
+    """
+    Записи старше CHANGE_FEED_SETTLE_DELAY секунд.
+    Id записи выдаётся до фиксации транзакции изменения: параллельная
+    транзакция с большим id может зафиксироваться раньше, и курсор
+    пропустил бы меньшую запись, ставшую видимой позже.
+    """
+    queryset = ChangeLog.objects.all()
+    delay = settings.CHANGE_FEED_SETTLE_DELAY
+    if delay:
+        queryset = queryset.filter(
+            changed_at__lte=timezone.now() - timedelta(seconds=delay)
+        )
+    return queryset
+
+
+def check_cursor(cursor):
+    """
+    Курсор устарел, если после него есть граница очистки журнала
+    или он больше последней записи (журнал очищен или база заменена).
+    """
+    bounds = ChangeLog.objects.aggregate(
+        last=Max('id'),
+        pruned=Max('id', filter=Q(action=CHANGE_PRUNED)),
+    )
+    last = bounds['last'] or 0
+    pruned = bounds['pruned'] or 0
+    if cursor < pruned or cursor > last:
+        raise CursorExpired
+
+
+def compact(entries):
+    """
+    Последняя запись для каждого объекта пачки: данные в ответе
+    всё равно текущие. Созданный в пачке объект остаётся created.
+    """
+    latest = {}
+    created = set()
+    for entry in entries:
+        key = (entry.entity, entry.object_id)
+        if entry.action == CHANGE_CREATED:
+            created.add(key)
+        latest.pop(key, None)
+        latest[key] = entry
+    return [
+        (entry, CHANGE_CREATED if key in created else entry.action)
+        for key, entry in latest.items()
+    ]
+
+
+def load_objects(entity, ids):
+    """Текущее состояние объектов одного типа: id -> данные."""
+    queryset, serializer_class = ENTITY_SOURCES[entity]
+    objects = list(queryset.filter(pk__in=ids))
+    data = serializer_class(objects, many=True).data
+    return {obj.pk: item for obj, item in zip(objects, data)}
+
+
+def change_data(entries):
+    ids = {}
+    for entry, action in entries:
+        if action != CHANGE_DELETED:
+            ids.setdefault(entry.entity, set()).add(entry.object_id)
+    return {
+        entity: load_objects(entity, entity_ids)
+        for entity, entity_ids in ids.items()
+    }
+
+
+def read_changes(cursor, entities=None, limit=None):
+    """
+    Пачка изменений после курсора.
+    Для созданных и изменённых объектов возвращается текущее состояние,
+    для удалённых - запись без данных. Объект, удалённый после записи
+    в журнал, отдаётся как удалённый.
+    """
+    limit = limit or settings.CHANGE_FEED_PAGE_SIZE
+    queryset = settled_changes().filter(id__gt=cursor).exclude(
+        action=CHANGE_PRUNED
+    )
+    if entities:
+        queryset = queryset.filter(entity__in=entities)
+    entries = list(queryset.order_by('id')[:limit + 1])
+    has_more = len(entries) > limit
+    entries = entries[:limit]
+
+    compacted = compact(entries)
+    data = change_data(compacted)
+    results = []
+    for entry, action in compacted:
+        item = data.get(entry.entity, {}).get(entry.object_id)
+        results.append({
+            'cursor': entry.pk,
+            'entity': entry.entity,
+            'id': entry.object_id,
+            'parent_id': entry.parent_id,
+            'action': CHANGE_DELETED if item is None else action,
+            'changed_at': entry.changed_at,
+            'data': item,
+        })
+    return {
+        'cursor': entries[-1].pk if entries else cursor,
+        'has_more': has_more,
+        'results': results,
+    }
+
+
+def head_cursor():
+    """Текущая позиция журнала для начала синхронизации."""
+    return settled_changes().aggregate(last=Max('id'))['last'] or 0
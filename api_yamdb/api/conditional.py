@@ -0,0 +1,68 @@
+from hashlib import md5
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date_safe
+from rest_framework.response import Response
+
+VALIDATOR_HEADERS = ('ETag', 'Last-Modified')
+
+
+def queryset_validators(queryset, request, extra_dates=()):
+    """
+    ETag и Last-Modified для набора строк ответа одним запросом
+    MAX(updated_at), COUNT(*) по индексу, без загрузки строк.
+    Количество учитывает удаления, которые не меняют последнюю дату;
+    extra_dates - даты изменения родительских объектов из ответа.
+    """
+    state = queryset.order_by().aggregate(
+        last=Max('updated_at'), count=Count('pk')
+    )
+    dates = [date for date in (state['last'], *extra_dates)
+             if date is not None]
+    last_modified = int(max(dates).timestamp()) if dates else None
+    key = '|'.join((
+        request.get_full_path(), str(state['count']),
+        *(date.isoformat() for date in dates),
+    ))
+    # Слабый тег: JSON и MessagePack - одно и то же содержимое.
+    etag = f'W/"{md5(key.encode("utf-8")).hexdigest()}"'
+    return etag, last_modified
+
+
+def set_validators(response, etag, last_modified):
+    response['ETag'] = etag
+    if last_modified is not None:
+        response['Last-Modified'] = http_date(last_modified)
+    return response
+
+
+def not_modified(request, etag, last_modified):
+    """Ответ 304, если у клиента актуальная версия, иначе None."""
+    response = get_conditional_response(
+        request, etag=etag, last_modified=last_modified
+    )
+    if response is None:
+        return None
+    return set_validators(response, etag, last_modified)
+
+
+def validator_headers(response):
+    return {
+        name: response[name] for name in VALIDATOR_HEADERS
+        if response.has_header(name)
+    }
+
+
+def cached_response(request, data, headers):
+    """Ответ из кеша: 304 по сохранённым валидаторам или данные."""
+    response = get_conditional_response(
+        request,
+        etag=headers.get('ETag'),
+        last_modified=parse_http_date_safe(headers.get('Last-Modified')),
+    )
+    if response is None:
+        response = Response(data)
+    for name, value in headers.items():
+        response[name] = value
+    return response
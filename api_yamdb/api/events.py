@@ -0,0 +1,101 @@
+import asyncio
+import threading
+from collections import defaultdict
+from itertools import count
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+# Событие для клиента, который не успевал читать: часть событий
+# потеряна, список нужно перечитать через REST.
+OVERFLOW = 'overflow'
+REVIEW_EVENT = 'review'
+RATING_EVENT = 'rating'
+
+
+def title_topic(title_id):
+    return f'title:{title_id}'
+
+
+class Subscription:
+    """Очередь событий одного клиента с ограниченным буфером."""
+
+    def __init__(self, broker, topic, buffer_size):
+        self.broker = broker
+        self.topic = topic
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize=buffer_size)
+
+    def deliver(self, event):
+        """Выполняется в цикле событий подписчика."""
+        if self.queue.full():
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            event = (event[0], OVERFLOW, None)
+        self.queue.put_nowait(event)
+
+    async def get(self):
+        return await self.queue.get()
+
+    def close(self):
+        self.broker.unsubscribe(self)
+
+
+class InMemoryBroker:
+    """
+    Брокер событий в памяти процесса: один издатель, много подписчиков.
+    Публиковать можно из любого потока: событие передаётся в цикл
+    событий подписчика через call_soon_threadsafe. Медленный клиент
+    не задерживает остальных - при переполнении его буфер сбрасывается.
+    Подписчики и издатели должны работать в одном процессе.
+    """
+
+    def __init__(self, buffer_size=None):
+        self.buffer_size = buffer_size or settings.API_EVENTS_BUFFER_SIZE
+        self.lock = threading.Lock()
+        self.topics = defaultdict(set)
+        self.ids = count(1)
+
+    def subscribe(self, topic):
+        """Подписка из кода, работающего в цикле событий."""
+        subscription = Subscription(self, topic, self.buffer_size)
+        with self.lock:
+            self.topics[topic].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self.lock:
+            subscribers = self.topics.get(subscription.topic)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self.topics[subscription.topic]
+
+    def has_subscribers(self, topic):
+        return bool(self.topics.get(topic))
+
+    def publish(self, topic, event_type, data):
+        with self.lock:
+            subscribers = list(self.topics.get(topic, ()))
+            event = (next(self.ids), event_type, data)
+        for subscription in subscribers:
+            try:
+                subscription.loop.call_soon_threadsafe(
+                    subscription.deliver, event
+                )
+            except RuntimeError:
+                # Цикл событий подписчика уже закрыт.
+                self.unsubscribe(subscription)
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    """Брокер процесса, класс задаётся настройкой API_EVENTS_BROKER."""
+    global _broker
+    with _broker_lock:
+        if _broker is None:
+            _broker = import_string(settings.API_EVENTS_BROKER)()
+        return _broker
@@ -1,6 +1,6 @@
 from django_filters.rest_framework import CharFilter, FilterSet, NumberFilter
 
-from reviews.models import Title
+from reviews.models import Category, Genre, Title
 
 
 class TitleFilter(FilterSet):
@@ -21,3 +21,12 @@ class TitleFilter(FilterSet):
     class Meta:
         model = Title
         fields = ('category', 'genre', 'name', 'year',)
+
+
+# Поля, от которых зависит состав отфильтрованного TitleFilter списка
+# произведений (жанры произведения меняются через m2m_changed).
+TITLE_FILTER_FIELDS = {
+    Title: ('name', 'year', 'category_id'),
+    Category: ('slug',),
+    Genre: ('slug',),
+}
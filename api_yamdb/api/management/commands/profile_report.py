@@ -0,0 +1,57 @@
+import json
+import pstats
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management import BaseCommand, CommandError
+
+SORT_KEYS = ('cumulative', 'tottime', 'ncalls')
+
+
+class Command(BaseCommand):
+    help = ('Сводный отчёт по профилям видов API:'
+            'python manage.py profile_report --view TitleViewSet.list')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--path', default=str(settings.API_PROFILING_DIR),
+            help='Каталог с профилями.',
+        )
+        parser.add_argument(
+            '--view', default=None,
+            help='Только профили указанного вида, например TitleViewSet.list.',
+        )
+        parser.add_argument(
+            '--top', type=int, default=30,
+            help='Количество функций в отчёте.',
+        )
+        parser.add_argument(
+            '--sort', choices=SORT_KEYS, default='cumulative',
+            help='Порядок сортировки функций.',
+        )
+
+    def handle(self, *args, **options):
+        profiles = []
+        for path in sorted(Path(options['path']).glob('*.prof')):
+            meta_path = path.with_suffix('.json')
+            meta = {}
+            if meta_path.exists():
+                meta = json.loads(meta_path.read_text(encoding='utf-8'))
+            if options['view'] and meta.get('view') != options['view']:
+                continue
+            profiles.append((path, meta))
+        if not profiles:
+            raise CommandError('Профили не найдены.')
+
+        durations = sorted(meta.get('duration_ms', 0) for _, meta in profiles)
+        views = sorted({meta.get('view', '?') for _, meta in profiles})
+        self.stdout.write(
+            f'Профилей: {len(profiles)}, виды: {", ".join(views)}, '
+            f'медиана {durations[len(durations) // 2]:.2f} мс, '
+            f'максимум {durations[-1]:.2f} мс'
+        )
+        stats = pstats.Stats(str(profiles[0][0]), stream=self.stdout)
+        for path, _ in profiles[1:]:
+            stats.add(str(path))
+        stats.strip_dirs().sort_stats(options['sort'])
+        stats.print_stats(options['top'])
@@ -1,4 +1,12 @@
+from django.conf import settings
 from rest_framework import mixins, viewsets
+from rest_framework.status import HTTP_200_OK
+
+from .caching import (ANY_CHANGE, object_version_name, response_cache,
+                      response_cache_key, response_version, response_versions)
+from .conditional import (cached_response, not_modified, queryset_validators,
+                          set_validators, validator_headers)
+from .sparse import omitted_fields, trim_queryset
 
 
 class CreateReadDeleteViewSet(mixins.ListModelMixin,
@@ -7,3 +15,156 @@ class CreateReadDeleteViewSet(mixins.ListModelMixin,
                               viewsets.GenericViewSet):
     """Создание кастомного вьюсета для жанров и категорий """
     pass
+
+
+class SparseFieldsMixin:
+    """
+    Урезает запрос под поля, выбранные через ?fields= и ?omit=:
+    исключённые колонки откладываются, ненужные связи не загружаются.
+    """
+    sparse_keep_fields = ('id',)
+
+    def sparse_queryset(self, queryset):
+        fields = self.get_serializer_class()().fields
+        omitted = omitted_fields(self.request, fields)
+        if not omitted:
+            return queryset
+        return trim_queryset(
+            queryset,
+            [fields[name] for name in omitted],
+            self.sparse_keep_fields,
+        )
+
+    def filter_queryset(self, queryset):
+        return self.sparse_queryset(super().filter_queryset(queryset))
+
+
+class CachedListMixin:
+    """
+    Кеширует данные ответа list по полному адресу запроса.
+    Кеш сбрасывается сигналами при изменении модели (api/signals.py).
+    """
+
+    def list(self, request, *args, **kwargs):
+        cache = response_cache()
+        key = response_cache_key(self.queryset.model._meta.label_lower,
+                                 request)
+        entry = cache.get(key)
+        if entry is not None:
+            return cached_response(request, entry['data'], entry['headers'])
+        response = super().list(request, *args, **kwargs)
+        if response.status_code == HTTP_200_OK:
+            cache.set(
+                key,
+                {'data': response.data,
+                 'headers': validator_headers(response)},
+                settings.API_RESPONSE_CACHE_TIMEOUT,
+            )
+        return response
+
+
+class VersionedResponseCacheMixin:
+    """
+    Кеш ответов list и retrieve с отслеживанием зависимостей.
+    Ключ списка содержит версию модели, которая меняется при изменении
+    состава и полей для фильтров. В записи хранятся версии объектов,
+    из которых собран ответ: запись действительна, пока ни одна из них
+    не изменилась. Версии читаются после запроса к базе, поэтому ответ
+    не кешируется, если за это время было любое изменение: иначе старые
+    данные сохранились бы под новыми версиями.
+    """
+
+    def get_response_dependencies(self, obj):
+        return [object_version_name(type(obj), obj.pk)]
+
+    def paginate_queryset(self, queryset):
+        page = super().paginate_queryset(queryset)
+        self.response_objects = page
+        return page
+
+    def get_object(self):
+        obj = super().get_object()
+        self.response_objects = [obj]
+        return obj
+
+    def cached_response(self, action, request, *args, **kwargs):
+        label = self.queryset.model._meta.label_lower
+        version = response_version(label) if self.action == 'list' else 0
+        key = response_cache_key(label, request, version)
+        cache = response_cache()
+        entry = cache.get(key)
+        if (entry is not None
+                and response_versions(entry['versions']) == entry['versions']):
+            return cached_response(request, entry['data'], entry['headers'])
+        self.response_objects = None
+        changes = response_version(ANY_CHANGE)
+        response = action(request, *args, **kwargs)
+        if (response.status_code != HTTP_200_OK
+                or self.response_objects is None):
+            return response
+        names = {
+            name for obj in self.response_objects
+            for name in self.get_response_dependencies(obj)
+        }
+        versions = response_versions(names)
+        if response_version(ANY_CHANGE) == changes:
+            cache.set(
+                key,
+                {'versions': versions, 'data': response.data,
+                 'headers': validator_headers(response)},
+                settings.API_RESPONSE_CACHE_TIMEOUT,
+            )
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(
+            super().retrieve, request, *args, **kwargs
+        )
+
+
+class ConditionalListMixin:
+    """
+    ETag и Last-Modified для list. Валидаторы считаются агрегатным
+    запросом по отфильтрованному набору строк (api/conditional.py);
+    при совпадении с If-None-Match или If-Modified-Since страница
+    не загружается и не сериализуется, ответ - 304.
+    """
+
+    def get_validator_dates(self):
+        """Даты изменения родительских объектов, входящих в ответ."""
+        return ()
+
+    def conditional_response(self, action, queryset, request, *args,
+                             **kwargs):
+        etag, last_modified = queryset_validators(
+            queryset, request, self.get_validator_dates()
+        )
+        response = not_modified(request, etag, last_modified)
+        if response is not None:
+            return response
+        response = action(request, *args, **kwargs)
+        if response.status_code == HTTP_200_OK:
+            set_validators(response, etag, last_modified)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(
+            super().list, self.filter_queryset(self.get_queryset()),
+            request, *args, **kwargs
+        )
+
+
+class ConditionalGetMixin(ConditionalListMixin):
+    """ETag и Last-Modified для list и retrieve."""
+
+    def retrieve(self, request, *args, **kwargs):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        queryset = self.filter_queryset(self.get_queryset()).filter(
+            **{self.lookup_field: kwargs[lookup_url_kwarg]}
+        )
+        return self.conditional_response(
+            super().retrieve, queryset, request, *args, **kwargs
+        )
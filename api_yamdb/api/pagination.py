@@ -0,0 +1,252 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from functools import partial
+from hashlib import md5
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.paginator import Paginator as DjangoPaginator
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from django.utils.functional import cached_property
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import (BasePagination, PageNumberPagination,
+                                       _positive_int)
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from reviews.models import Title
+
+from .caching import response_version
+
+
+class KeysetPagination(BasePagination):
+    """
+    Пагинация по ключу (pub_date, id) без COUNT(*) и OFFSET.
+    Стоимость любой страницы равна стоимости первой.
+    """
+
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    invalid_cursor_message = 'Некорректный курсор.'
+
+    def get_page_size(self, request):
+        page_size = settings.REST_FRAMEWORK['PAGE_SIZE']
+        max_page_size = settings.CURSOR_PAGINATION_MAX_PAGE_SIZE
+        try:
+            return _positive_int(
+                request.query_params[self.page_size_query_param],
+                strict=True,
+                cutoff=max_page_size,
+            )
+        except (KeyError, ValueError):
+            return page_size
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+        try:
+            data = json.loads(urlsafe_b64decode(encoded.encode('ascii')))
+            pub_date = parse_datetime(data['p'])
+            pk = int(data['i'])
+            reverse = bool(data.get('r'))
+        except (TypeError, ValueError, KeyError, UnicodeError):
+            raise NotFound(self.invalid_cursor_message)
+        if pub_date is None:
+            raise NotFound(self.invalid_cursor_message)
+        return pub_date, pk, reverse
+
+    def encode_cursor(self, obj, reverse=False):
+        data = {'p': obj.pub_date.isoformat(), 'i': obj.pk}
+        if reverse:
+            data['r'] = 1
+        encoded = urlsafe_b64encode(json.dumps(data).encode('ascii'))
+        return replace_query_param(
+            self.base_url, self.cursor_query_param, encoded.decode('ascii')
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        cursor = self.decode_cursor(request)
+        reverse = cursor is not None and cursor[2]
+
+        if cursor is None:
+            queryset = queryset.order_by('-pub_date', '-id')
+        elif reverse:
+            pub_date, pk, _ = cursor
+            queryset = queryset.filter(
+                Q(pub_date__gt=pub_date) | Q(pub_date=pub_date, id__gt=pk)
+            ).order_by('pub_date', 'id')
+        else:
+            pub_date, pk, _ = cursor
+            queryset = queryset.filter(
+                Q(pub_date__lt=pub_date) | Q(pub_date=pub_date, id__lt=pk)
+            ).order_by('-pub_date', '-id')
+
+        results = list(queryset[:self.page_size + 1])
+        has_more = len(results) > self.page_size
+        self.page = results[:self.page_size]
+        if reverse:
+            self.page.reverse()
+
+        self.next_url = self.previous_url = None
+        if self.page:
+            if has_more or reverse:
+                self.next_url = self.encode_cursor(self.page[-1])
+            if cursor is not None and (has_more or not reverse):
+                self.previous_url = self.encode_cursor(
+                    self.page[0], reverse=True
+                )
+        elif reverse:
+            self.next_url = remove_query_param(
+                self.base_url, self.cursor_query_param
+            )
+        return self.page
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.next_url,
+            'previous': self.previous_url,
+            'results': data,
+        })
+
+
+class OptionalKeysetPagination(PageNumberPagination):
+    """
+    Постраничная пагинация с включаемым режимом курсора:
+    ?pagination=cursor или переданный параметр cursor.
+    """
+
+    mode_query_param = 'pagination'
+    keyset_class = KeysetPagination
+
+    def use_keyset(self, request):
+        return (
+            request.query_params.get(self.mode_query_param) == 'cursor'
+            or self.keyset_class.cursor_query_param in request.query_params
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = None
+        if self.use_keyset(request):
+            self.keyset = self.keyset_class()
+            return self.keyset.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+
+class CachedCountPaginator(DjangoPaginator):
+    """ Paginator, который берёт COUNT(*) из кеша. """
+
+    def __init__(self, *args, cache_key, cache_timeout, **kwargs):
+        self.cache_key = cache_key
+        self.cache_timeout = cache_timeout
+        super().__init__(*args, **kwargs)
+
+    @cached_property
+    def count(self):
+        count = cache.get(self.cache_key)
+        if count is None:
+            count = DjangoPaginator.count.func(self)
+            cache.set(self.cache_key, count, self.cache_timeout)
+        return count
+
+
+class TitlePagination(PageNumberPagination):
+    """
+    Постраничная пагинация произведений.
+    Режим подсчёта задаётся параметром ?count= или настройкой
+    TITLES_PAGINATION_COUNT_MODE:
+     - exact - точное число, кешируемое для каждого набора фильтров;
+     - none - без COUNT(*), в ответе count равен null.
+    """
+
+    count_query_param = 'count'
+    count_modes = ('exact', 'none')
+
+    def get_count_mode(self, request):
+        mode = request.query_params.get(self.count_query_param)
+        if mode in self.count_modes:
+            return mode
+        return settings.TITLES_PAGINATION_COUNT_MODE
+
+    def get_count_cache_key(self, request, view):
+        filterset_class = getattr(view, 'filterset_class', None)
+        names = filterset_class.base_filters if filterset_class else ()
+        filters = sorted(
+            (name, request.query_params.get(name))
+            for name in names if name in request.query_params
+        )
+        # Версия списков произведений меняется после фиксации любого
+        # изменения их состава, а с ней и количество.
+        version = response_version(Title._meta.label_lower)
+        digest = md5(json.dumps(filters).encode('utf-8')).hexdigest()
+        return f'titles-count:{version}:{digest}'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.count_mode = self.get_count_mode(request)
+        if self.count_mode == 'none':
+            return self.paginate_queryset_without_count(queryset, request)
+        self.django_paginator_class = partial(
+            CachedCountPaginator,
+            cache_key=self.get_count_cache_key(request, view),
+            cache_timeout=settings.TITLES_COUNT_CACHE_TIMEOUT,
+        )
+        return super().paginate_queryset(queryset, request, view)
+
+    def paginate_queryset_without_count(self, queryset, request):
+        self.request = request
+        page_size = self.get_page_size(request)
+        try:
+            self.page_number = _positive_int(
+                request.query_params.get(self.page_query_param, 1),
+                strict=True,
+            )
+        except ValueError:
+            raise NotFound(self.invalid_page_message.format(
+                page_number=request.query_params.get(self.page_query_param),
+                message='Неверный номер страницы.',
+            ))
+        offset = (self.page_number - 1) * page_size
+        results = list(queryset[offset:offset + page_size + 1])
+        self.has_next = len(results) > page_size
+        return results[:page_size]
+
+    def get_next_link(self):
+        if self.count_mode != 'none':
+            return super().get_next_link()
+        if not self.has_next:
+            return None
+        return replace_query_param(
+            self.request.build_absolute_uri(),
+            self.page_query_param,
+            self.page_number + 1,
+        )
+
+    def get_previous_link(self):
+        if self.count_mode != 'none':
+            return super().get_previous_link()
+        if self.page_number == 1:
+            return None
+        url = self.request.build_absolute_uri()
+        if self.page_number == 2:
+            return remove_query_param(url, self.page_query_param)
+        return replace_query_param(
+            url, self.page_query_param, self.page_number - 1
+        )
+
+    def get_paginated_response(self, data):
+        if self.count_mode != 'none':
+            return super().get_paginated_response(data)
+        return Response({
+            'count': None,
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
@@ -0,0 +1,37 @@
+from io import BytesIO
+
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser, JSONParser
+
+from .renderers import (MSGPACK_MEDIA_TYPE, FastJSONRenderer,
+                        MessagePackRenderer, msgpack, orjson)
+
+
+class FastJSONParser(JSONParser):
+    """
+    JSONParser на orjson. Тело, которое orjson не разобрал (например,
+    целые больше 64 бит), и тело не в UTF-8 разбираются стандартно.
+    """
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        encoding = (parser_context or {}).get('encoding', 'utf-8')
+        if orjson is None or encoding.lower().replace('-', '') != 'utf8':
+            return super().parse(stream, media_type, parser_context)
+        body = stream.read()
+        try:
+            return orjson.loads(body)
+        except orjson.JSONDecodeError:
+            return super().parse(BytesIO(body), media_type, parser_context)
+
+
+class MessagePackParser(BaseParser):
+    """ Тело запроса в формате MessagePack. """
+    media_type = MSGPACK_MEDIA_TYPE
+    renderer_class = MessagePackRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return msgpack.unpackb(stream.read(), raw=False)
+        except (ValueError, msgpack.UnpackException) as exc:
+            raise ParseError(f'MessagePack parse error - {exc}')
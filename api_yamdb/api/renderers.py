@@ -0,0 +1,80 @@
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson не установлен
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - msgpack не установлен
+    msgpack = None
+
+MSGPACK_MEDIA_TYPE = 'application/msgpack'
+
+# Параметры orjson, при которых результат совпадает с JSONRenderer:
+# даты передаются в кодировщик DRF, ключи-числа приводятся к строкам.
+ORJSON_OPTIONS = (
+    orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+    if orjson is not None else 0
+)
+LINE_SEPARATORS = (
+    (b'\xe2\x80\xa8', b'\\u2028'),
+    (b'\xe2\x80\xa9', b'\\u2029'),
+)
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer на orjson с тем же результатом: Unicode без экранирования,
+    компактные разделители, даты в формате DRF.
+    Без orjson, с отступами или для неподдерживаемых значений
+    используется стандартный JSONRenderer.
+    """
+
+    default = staticmethod(JSONEncoder().default)
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if (orjson is None or self.ensure_ascii or not self.compact
+                or self.get_indent(accepted_media_type,
+                                   renderer_context or {}) is not None):
+            return super().render(
+                data, accepted_media_type, renderer_context
+            )
+        try:
+            ret = orjson.dumps(
+                data, default=self.default, option=ORJSON_OPTIONS
+            )
+        except orjson.JSONEncodeError:
+            # Например, целые больше 64 бит.
+            return super().render(
+                data, accepted_media_type, renderer_context
+            )
+        for separator, escaped in LINE_SEPARATORS:
+            if separator in ret:
+                ret = ret.replace(separator, escaped)
+        return ret
+
+
+class MessagePackRenderer(BaseRenderer):
+    """
+    Ответ в формате MessagePack (Accept: application/msgpack).
+    Структура данных та же, что и в JSON: даты, Decimal и UUID
+    приводятся кодировщиком DRF.
+    """
+    media_type = MSGPACK_MEDIA_TYPE
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+
+    default = staticmethod(JSONEncoder().default)
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return msgpack.packb(
+            data, default=self.default, use_bin_type=True, datetime=False
+        )
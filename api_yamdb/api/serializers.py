@@ -1,16 +1,18 @@
 from django.http import HttpRequest
 from rest_framework.exceptions import ValidationError
-from rest_framework.generics import get_object_or_404
 from rest_framework.serializers import (CharField, CurrentUserDefault,
-                                        EmailField, IntegerField,
+                                        EmailField, IntegerField, ListField,
                                         ModelSerializer, RegexField,
-                                        SlugRelatedField, ValidationError)
+                                        SlugField, SlugRelatedField,
+                                        ValidationError)
 from rest_framework.validators import UniqueValidator
 
 from reviews.models import Category, Comments, Genre, Review, Title, User
 
+from .sparse import SparseFieldsSerializerMixin
 
-class UsersSerializer(ModelSerializer):
+
+class UsersSerializer(SparseFieldsSerializerMixin, ModelSerializer):
     """ Сериализатор для работы со списками пользователей. """
 
     username = RegexField(
@@ -26,6 +28,20 @@ class UsersSerializer(ModelSerializer):
         )
 
 
+class UsersBulkSerializer(UsersSerializer):
+    """
+    Пользователь из пакетной загрузки.
+    Уникальность логина и почты проверяется сразу для всего пакета.
+    """
+
+    username = RegexField(
+        r'^[\w.@+-]+\Z$', max_length=150, required=True
+    )
+
+    class Meta(UsersSerializer.Meta):
+        extra_kwargs = {'email': {'validators': []}}
+
+
 class TokenSerializer(ModelSerializer):
     """ Сериализатор для работы с токенами и кодами подтверждения. """
 
@@ -43,19 +59,19 @@ class TokenSerializer(ModelSerializer):
         )
 
 
-class GenreSerializer(ModelSerializer):
+class GenreSerializer(SparseFieldsSerializerMixin, ModelSerializer):
     """ Сериализатор для работы с жанрами. """
 
     class Meta:
         model = Genre
-        exclude = ['id', ]
+        exclude = ['id', 'updated_at']
         lookup_field = 'slug'
         extra_kwargs = {
             'url': {'lookup_field': 'slug'}
         }
 
 
-class CategorySerializer(ModelSerializer):
+class CategorySerializer(SparseFieldsSerializerMixin, ModelSerializer):
     """ Сериализатор для работы с категориями. """
 
     class Meta:
@@ -67,12 +83,12 @@ class CategorySerializer(ModelSerializer):
         }
 
 
-class TitleSerializer(ModelSerializer):
+class TitleSerializer(SparseFieldsSerializerMixin, ModelSerializer):
     """ Сериализатор для работы с произведениями (только чтение). """
 
     category = CategorySerializer(read_only=True)
     genre = GenreSerializer(many=True, read_only=True)
-    rating = IntegerField(source='reviews__score__avg', read_only=True)
+    rating = IntegerField(read_only=True)
 
     class Meta:
         fields = ('id', 'genre', 'category', 'name', 'year',
@@ -80,7 +96,7 @@ class TitleSerializer(ModelSerializer):
         model = Title
 
 
-class TitleSerializerPost(ModelSerializer):
+class TitleSerializerPost(SparseFieldsSerializerMixin, ModelSerializer):
     """ Сериализатор для работы с произведениями (изменение). """
 
     category = SlugRelatedField(
@@ -92,7 +108,7 @@ class TitleSerializerPost(ModelSerializer):
         slug_field='slug',
         many=True
     )
-    rating = IntegerField(source='reviews__score__avg', read_only=True)
+    rating = IntegerField(read_only=True)
 
     class Meta:
         fields = ('id', 'genre', 'category', 'name', 'year',
@@ -100,6 +116,39 @@ class TitleSerializerPost(ModelSerializer):
         model = Title
 
 
+class TitleBulkSerializer(ModelSerializer):
+    """
+    Произведение из пакетной загрузки.
+    Слаги категорий и жанров проверяются сразу для всего пакета;
+    элемент с id обновляет существующее произведение.
+    """
+
+    id = IntegerField(required=False, min_value=1)
+    category = SlugField(max_length=50, required=False)
+    genre = ListField(
+        child=SlugField(max_length=50), allow_empty=False, required=False
+    )
+
+    class Meta:
+        fields = ('id', 'genre', 'category', 'name', 'year', 'description',)
+        model = Title
+        extra_kwargs = {
+            'name': {'required': False},
+            'year': {'required': False},
+        }
+
+    def validate(self, data):
+        if 'id' not in data:
+            missing = {
+                field: ['Обязательное поле.']
+                for field in ('name', 'year', 'category', 'genre')
+                if field not in data
+            }
+            if missing:
+                raise ValidationError(missing)
+        return data
+
+
 class SignupSerializer(ModelSerializer):
     """ Сериализатор для работы с регистрациями. """
 
@@ -126,7 +175,7 @@ class SignupSerializer(ModelSerializer):
         return data
 
 
-class ReviewSerializer(ModelSerializer):
+class ReviewSerializer(SparseFieldsSerializerMixin, ModelSerializer):
     """ Сериализатор для работы с отзывами. """
 
     title = SlugRelatedField(
@@ -148,10 +197,7 @@ class ReviewSerializer(ModelSerializer):
         fields = ('author', 'title', 'id', 'text', 'pub_date', 'score')
 
     def get_title(self, request: HttpRequest):
-        return get_object_or_404(
-            Title,
-            pk=self.context.get('view').kwargs.get('title_id'),
-        )
+        return self.context.get('view').title
 
     def get_author(self, request: HttpRequest):
         return self.context.get('request').user
@@ -168,7 +214,7 @@ class ReviewSerializer(ModelSerializer):
         return data
 
 
-class CommentSerializer(ModelSerializer):
+class CommentSerializer(SparseFieldsSerializerMixin, ModelSerializer):
     """ Сериализатор для работы с комментариями. """
 
     author = SlugRelatedField(
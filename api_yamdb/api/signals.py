@@ -0,0 +1,177 @@
+from functools import partial
+from time import time
+
+from django.db import transaction
+from django.db.models.signals import (m2m_changed, post_delete, post_save,
+                                      pre_save)
+from django.dispatch import receiver
+
+from reviews.batch import current_batch
+from reviews.models import Category, Genre, Review, Title, User
+
+from .authentication import AUTH_FIELDS, invalidate_user_state
+from .caching import bump_response_version, object_version_name
+from .events import RATING_EVENT, REVIEW_EVENT, get_broker, title_topic
+from .filters import TITLE_FILTER_FIELDS
+from .serializers import ReviewSerializer
+
+
+TITLES = Title._meta.label_lower
+
+
+def bump_after_commit(*names):
+    """
+    Версии меняются после фиксации, когда новые данные уже видны.
+    В пакете записи - один раз на все имена пакета.
+    """
+    batch = current_batch()
+    if batch is None:
+        transaction.on_commit(partial(bump_response_version, *names))
+    else:
+        batch.on_commit(bump_response_version, *names)
+
+
+@receiver(pre_save, sender=Title)
+@receiver(pre_save, sender=Category)
+@receiver(pre_save, sender=Genre)
+def remember_filter_values(sender, instance, **kwargs):
+    """Значения полей для фильтров списка произведений до изменения."""
+    instance._previous_filter_values = None
+    if not instance._state.adding and instance.pk is not None:
+        instance._previous_filter_values = sender.objects.filter(
+            pk=instance.pk
+        ).values_list(*TITLE_FILTER_FIELDS[sender]).first()
+
+
+def changes_title_list(sender, instance, created):
+    """
+    Меняет ли сохранение состав списков произведений: новое произведение
+    или другие значения полей, по которым фильтруется список. Новые
+    категория и жанр ещё не относятся ни к одному произведению.
+    """
+    if created:
+        return sender is Title
+    current = tuple(
+        getattr(instance, field) for field in TITLE_FILTER_FIELDS[sender]
+    )
+    return getattr(instance, '_previous_filter_values', None) != current
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Genre)
+@receiver(post_delete, sender=Genre)
+def invalidate_catalog_responses(sender, instance, signal, created=False,
+                                 **kwargs):
+    """
+    Сбрасывает кешированные списки категорий и жанров, ответы
+    с произведениями этой категории или жанра, а при удалении или смене
+    слага - и списки произведений.
+    """
+    names = [
+        sender._meta.label_lower, object_version_name(sender, instance.pk),
+    ]
+    if signal is post_delete or changes_title_list(
+        sender, instance, created
+    ):
+        names.append(TITLES)
+    bump_after_commit(*names)
+
+
+@receiver(post_save, sender=Title)
+@receiver(post_delete, sender=Title)
+def invalidate_title_responses(sender, instance, signal, created=False,
+                               **kwargs):
+    """
+    Ответы с произведением; списки - только если изменился их состав,
+    остальное учитывается версией самого произведения.
+    """
+    names = [object_version_name(Title, instance.pk)]
+    if signal is post_delete or changes_title_list(
+        sender, instance, created
+    ):
+        names.append(TITLES)
+    bump_after_commit(*names)
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def invalidate_title_genres(sender, instance, action, reverse, pk_set,
+                            **kwargs):
+    if not action.startswith('post_'):
+        return
+    if not reverse:
+        names = [object_version_name(Title, instance.pk)]
+    elif pk_set:
+        names = [object_version_name(Title, pk) for pk in pk_set]
+    else:
+        names = [object_version_name(Genre, instance.pk)]
+    bump_after_commit(TITLES, *names)
+
+
+def rating_title_ids(review):
+    """Произведения, рейтинг которых изменило сохранение отзыва."""
+    title_ids = {review.title_id}
+    previous = getattr(review, '_previous_score', None)
+    if previous is not None:
+        title_ids.add(previous[0])
+    return title_ids
+
+
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def invalidate_rating_responses(sender, instance, **kwargs):
+    """Оценка меняет рейтинг только своего произведения."""
+    bump_after_commit(*(
+        object_version_name(Title, pk) for pk in rating_title_ids(instance)
+    ))
+
+
+def publish_review(review):
+    get_broker().publish(
+        title_topic(review.title_id), REVIEW_EVENT,
+        ReviewSerializer(review).data,
+    )
+
+
+def publish_ratings(title_ids):
+    broker = get_broker()
+    topics = {
+        pk: title_topic(pk) for pk in title_ids
+        if broker.has_subscribers(title_topic(pk))
+    }
+    if not topics:
+        return
+    ratings = Title.objects.filter(pk__in=topics).values_list('pk', 'rating')
+    for pk, rating in ratings:
+        broker.publish(topics[pk], RATING_EVENT, {'id': pk, 'rating': rating})
+
+
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def publish_review_events(sender, instance, created=False, raw=False,
+                          **kwargs):
+    """
+    Новый отзыв и рейтинг - подписчикам потока произведения после
+    фиксации. Без подписчиков ничего не сериализуется и не читается.
+    """
+    title_ids = rating_title_ids(instance)
+    broker = get_broker()
+    if raw or not any(
+        broker.has_subscribers(title_topic(pk)) for pk in title_ids
+    ):
+        return
+    if created:
+        transaction.on_commit(partial(publish_review, instance))
+    transaction.on_commit(partial(publish_ratings, title_ids))
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_user_claims(sender, instance, created=False,
+                           update_fields=None, **kwargs):
+    """Сбрасывает кешированные права при изменении роли пользователя."""
+    if created:
+        return
+    if update_fields is not None and not set(update_fields) & set(AUTH_FIELDS):
+        return
+    invalidate_user_state(instance.pk, int(time()))
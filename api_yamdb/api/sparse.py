@@ -0,0 +1,110 @@
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import SAFE_METHODS
+
+FIELDS_PARAM = 'fields'
+OMIT_PARAM = 'omit'
+
+
+def split_param(request, name):
+    value = request.query_params.get(name)
+    if value is None:
+        return None
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+
+def omitted_fields(request, available):
+    """
+    Поля, исключённые из ответа параметрами ?fields=a,b и ?omit=c.
+    Выбор полей действует только на чтение.
+    """
+    if request is None or request.method not in SAFE_METHODS:
+        return set()
+    fields = split_param(request, FIELDS_PARAM)
+    omit = split_param(request, OMIT_PARAM)
+    if fields is None and omit is None:
+        return set()
+    unknown = set(fields or ()) | set(omit or ())
+    unknown -= set(available)
+    if unknown:
+        raise ValidationError({
+            FIELDS_PARAM: [f'Неизвестные поля: {", ".join(sorted(unknown))}.']
+        })
+    omitted = set(omit or ())
+    if fields is not None:
+        omitted |= set(available) - set(fields)
+    return omitted
+
+
+class SparseFieldsSerializerMixin:
+    """ Сериализатор с выбором полей ответа через ?fields= и ?omit=. """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Вложенные сериализаторы создаются без контекста и не урезаются.
+        omitted = omitted_fields(self.context.get('request'), self.fields)
+        for name in omitted:
+            self.fields.pop(name)
+
+
+def is_related_lookup(lookup, name):
+    path = getattr(lookup, 'prefetch_to', lookup)
+    return path == name or path.startswith(f'{name}__')
+
+
+def select_related_paths(select_related, prefix=''):
+    for name, nested in select_related.items():
+        yield prefix + name
+        yield from select_related_paths(nested, f'{prefix}{name}__')
+
+
+def without_relations(queryset, relations):
+    """Запрос без select_related и prefetch_related для связей relations."""
+    if isinstance(queryset.query.select_related, dict):
+        paths = [
+            path for path in select_related_paths(
+                queryset.query.select_related
+            )
+            if not any(is_related_lookup(path, name) for name in relations)
+        ]
+        queryset = queryset.select_related(None)
+        if paths:
+            queryset = queryset.select_related(*paths)
+    lookups = [
+        lookup for lookup in queryset._prefetch_related_lookups
+        if not any(is_related_lookup(lookup, name) for name in relations)
+    ]
+    return queryset.prefetch_related(None).prefetch_related(*lookups)
+
+
+def trim_queryset(queryset, fields, keep=()):
+    """
+    Запрос без колонок и связей, которые нужны только исключённым полям
+    сериализатора. Поля из keep загружаются всегда (например, ключ
+    пагинации).
+    """
+    opts = queryset.model._meta
+    # Связанный менеджер (title.reviews) сам заполняет внешний ключ
+    # у каждой строки, такой ключ откладывать нельзя.
+    known = {field.name for field in queryset._known_related_objects}
+    deferred = []
+    relations = []
+    for field in fields:
+        name = field.source.split('.')[0]
+        if name in keep:
+            continue
+        try:
+            model_field = opts.get_field(name)
+        except FieldDoesNotExist:
+            continue
+        if model_field.is_relation:
+            relations.append(name)
+        if (model_field.concrete and not model_field.many_to_many
+                and name not in known):
+            deferred.append(name)
+
+    if relations:
+        queryset = without_relations(queryset, relations)
+    if deferred:
+        queryset = queryset.defer(*deferred)
+    return queryset
@@ -0,0 +1,119 @@
+import asyncio
+import re
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+
+from reviews.models import Title
+
+from .events import get_broker, title_topic
+from .renderers import FastJSONRenderer
+
+STREAM_PATH = re.compile(
+    r'^/api/v1/titles/(?P<title_id>[0-9]+)/reviews/stream/$'
+)
+# Через сколько миллисекунд браузер переподключается после обрыва.
+RETRY_MS = 3000
+HEARTBEAT = b': ping\n\n'
+
+
+def encode_event(event):
+    event_id, event_type, data = event
+    return b''.join((
+        f'id: {event_id}\nevent: {event_type}\ndata: '.encode('utf-8'),
+        FastJSONRenderer().render(data),
+        b'\n\n',
+    ))
+
+
+async def send_body(send, body, more_body=True):
+    await send({
+        'type': 'http.response.body', 'body': body, 'more_body': more_body,
+    })
+
+
+async def send_not_found(send):
+    await send({
+        'type': 'http.response.start',
+        'status': 404,
+        'headers': [(b'content-type', b'application/json')],
+    })
+    await send_body(
+        send, FastJSONRenderer().render({'detail': 'Страница не найдена.'}),
+        more_body=False,
+    )
+
+
+async def wait_disconnect(receive):
+    while (await receive())['type'] != 'http.disconnect':
+        pass
+
+
+async def next_message(subscription, disconnect):
+    """
+    Следующее событие, пустое сообщение по истечении интервала
+    или None, если клиент отключился.
+    """
+    event = asyncio.ensure_future(subscription.get())
+    done, _ = await asyncio.wait(
+        {event, disconnect},
+        timeout=settings.API_EVENTS_HEARTBEAT,
+        return_when=asyncio.FIRST_COMPLETED,
+    )
+    if event in done:
+        return encode_event(event.result())
+    event.cancel()
+    return None if disconnect in done else HEARTBEAT
+
+
+async def stream_reviews(receive, send, title_id):
+    """
+    Поток Server-Sent Events произведения: новые отзывы (review)
+    и изменения рейтинга (rating). Событие overflow означает, что
+    клиент не успевал читать и часть событий пропущена.
+    """
+    exists = await sync_to_async(
+        Title.objects.filter(pk=title_id).exists
+    )()
+    if not exists:
+        await send_not_found(send)
+        return
+    subscription = get_broker().subscribe(title_topic(title_id))
+    disconnect = asyncio.ensure_future(wait_disconnect(receive))
+    try:
+        await send({
+            'type': 'http.response.start',
+            'status': 200,
+            'headers': [
+                (b'content-type', b'text/event-stream; charset=utf-8'),
+                (b'cache-control', b'no-cache'),
+                (b'x-accel-buffering', b'no'),
+            ],
+        })
+        await send_body(send, f'retry: {RETRY_MS}\n\n'.encode('ascii'))
+        while True:
+            message = await next_message(subscription, disconnect)
+            if message is None:
+                return
+            await send_body(send, message)
+    finally:
+        subscription.close()
+        disconnect.cancel()
+
+
+def with_event_streams(application):
+    """
+    ASGI-приложение с потоками событий перед приложением Django.
+    Поток держит соединение открытым, поэтому обслуживается напрямую
+    в цикле событий, без потока синхронного вида.
+    """
+
+    async def app(scope, receive, send):
+        if scope['type'] == 'http' and scope['method'] == 'GET':
+            match = STREAM_PATH.match(scope['path'])
+            if match is not None:
+                await stream_reviews(receive, send, int(match['title_id']))
+                return
+        await application(scope, receive, send)
+
+    return app
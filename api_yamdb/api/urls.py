@@ -1,8 +1,9 @@
 from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
-from api.views import (AuthSignup, AuthToken, CategoryViewSet, CommentViewSet,
-                       GenreViewSet, ReviewViewSet, TitleViewSet, UsersViewSet)
+from api.views import (AuthSignup, AuthToken, CategoryViewSet,
+                       ChangeFeedView, CommentViewSet, GenreViewSet,
+                       ReviewViewSet, TitleViewSet, UsersViewSet)
 
 router_v1 = DefaultRouter()
 
@@ -27,4 +28,5 @@ urlpatterns = [
     path('v1/', include(router_v1.urls)),
     path('v1/auth/signup/', AuthSignup.as_view(), name='signup'),
     path('v1/auth/token/', AuthToken.as_view(), name='token'),
+    path('v1/changes/', ChangeFeedView.as_view(), name='changes'),
 ]
@@ -1,8 +1,9 @@
 import uuid
 
-from django.core.mail import send_mail
-from django.db.models import Avg
+from django.db import transaction
+from django.db.models import Prefetch
 from django.shortcuts import get_object_or_404
+from django.utils.functional import cached_property
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.decorators import action
 from rest_framework.filters import SearchFilter
@@ -11,12 +12,21 @@ from rest_framework.response import Response
 from rest_framework.status import HTTP_200_OK, HTTP_400_BAD_REQUEST
 from rest_framework.views import APIView
 from rest_framework.viewsets import ModelViewSet
-from rest_framework_simplejwt.tokens import RefreshToken
 
 from reviews.models import Category, Genre, Review, Title, User
+from reviews.outbox import enqueue_email
 
+from .authentication import ClaimsAccessToken
+from .bulk import bulk_status, get_titles, provision_users, upsert_titles
+from .caching import object_version_name
+from .changes import (CURSOR_PARAM, ENTITY_PARAM, LIMIT_PARAM, check_cursor,
+                      head_cursor, parse_cursor, parse_entities, parse_limit,
+                      read_changes)
 from .filters import TitleFilter
-from .mixins import CreateReadDeleteViewSet
+from .mixins import (CachedListMixin, ConditionalGetMixin,
+                     ConditionalListMixin, CreateReadDeleteViewSet,
+                     SparseFieldsMixin, VersionedResponseCacheMixin)
+from .pagination import OptionalKeysetPagination, TitlePagination
 from .permissions import (IsAdminOrReadOnly, IsAdminOrSuperUser,
                           IsAuthorOrReadOnly)
 from .serializers import (CategorySerializer, CommentSerializer,
@@ -25,7 +35,7 @@ from .serializers import (CategorySerializer, CommentSerializer,
                           TokenSerializer, UsersSerializer)
 
 
-class UsersViewSet(ModelViewSet):
+class UsersViewSet(SparseFieldsMixin, ConditionalGetMixin, ModelViewSet):
     """
     Получение писка пользователей.
     Права доступа:
@@ -40,6 +50,15 @@ class UsersViewSet(ModelViewSet):
 
     http_method_names = ('get', 'post', 'head', 'patch', 'delete',)
 
+    @action(methods=('POST',), url_path='bulk', detail=False)
+    def bulk(self, request):
+        """
+        Пакетное создание пользователей: результат для каждого элемента.
+        Если не создан ни один пользователь - ответ 400.
+        """
+        results = provision_users(request.data)
+        return Response({'results': results}, status=bulk_status(results))
+
     @action(
         methods=('GET', 'PATCH',),
         url_path='me',
@@ -47,23 +66,26 @@ class UsersViewSet(ModelViewSet):
         permission_classes=(IsAuthenticated,),
     )
     def profile(self, request):
+        # request.user собран из токена, полный профиль берётся из базы.
+        user = get_object_or_404(User, pk=request.user.pk)
         if request.method == 'GET':
             serializer = UsersSerializer(
-                request.user
+                user
             )
             return Response(serializer.data)
 
         serializer = UsersSerializer(
-            request.user,
+            user,
             data=request.data,
             partial=True,
         )
         serializer.is_valid(raise_exception=True)
-        serializer.save(role=request.user.role)
+        serializer.save(role=user.role)
         return Response(serializer.data)
 
 
-class CategoryViewSet(CreateReadDeleteViewSet):
+class CategoryViewSet(SparseFieldsMixin, CachedListMixin,
+                      ConditionalListMixin, CreateReadDeleteViewSet):
     """
     Получить список всех категорий.
     Права доступа:
@@ -78,7 +100,8 @@ class CategoryViewSet(CreateReadDeleteViewSet):
     lookup_field = 'slug'
 
 
-class GenreViewSet(CreateReadDeleteViewSet):
+class GenreViewSet(SparseFieldsMixin, CachedListMixin,
+                   ConditionalListMixin, CreateReadDeleteViewSet):
     """
     Получить список всех жанров.
     Права доступа:
@@ -93,27 +116,66 @@ class GenreViewSet(CreateReadDeleteViewSet):
     lookup_field = 'slug'
 
 
-class TitleViewSet(ModelViewSet):
+class TitleViewSet(SparseFieldsMixin, VersionedResponseCacheMixin,
+                   ConditionalGetMixin, ModelViewSet):
     """
     Получить список всех произведений.
     Права доступа: Доступно без токена.
     """
     permission_classes = (IsAdminOrReadOnly,)
-    queryset = Title.objects.all().annotate(
-        Avg('reviews__score')
-    ).order_by('id')
+    queryset = Title.objects.select_related(
+        'category'
+    ).prefetch_related('genre').order_by('id')
 
     serializer_class = TitleSerializerPost
     filter_backends = (DjangoFilterBackend,)
     filterset_class = TitleFilter
+    pagination_class = TitlePagination
 
     def get_serializer_class(self):
-        if self.action in ('list', 'retrieve',):
+        if self.action in ('list', 'retrieve', 'multi_get',):
             return TitleSerializer
         return TitleSerializerPost
 
+    def get_response_dependencies(self, title):
+        # Без загрузки отложенных полей: категория и жанры, исключённые
+        # из ответа, не являются его зависимостями.
+        names = [object_version_name(Title, title.pk)]
+        if ('category_id' not in title.get_deferred_fields()
+                and title.category_id is not None):
+            names.append(object_version_name(Category, title.category_id))
+        prefetched = getattr(title, '_prefetched_objects_cache', {})
+        names.extend(
+            object_version_name(Genre, genre.pk)
+            for genre in prefetched.get('genre', ())
+        )
+        return names
+
+    @action(methods=('POST',), url_path='bulk', detail=False)
+    def bulk(self, request):
+        """
+        Пакетное создание (без id) и обновление (с id) произведений.
+        Результат возвращается для каждого элемента.
+        """
+        results = upsert_titles(request.data)
+        return Response({'results': results}, status=bulk_status(results))
+
+    @bulk.mapping.get
+    def multi_get(self, request):
+        """
+        Несколько произведений одним запросом: ?ids=1,2,3.
+        Порядок ответа совпадает с порядком id, ненайденные id
+        перечисляются в missing.
+        """
+        titles, missing = get_titles(
+            self.sparse_queryset(self.get_queryset()),
+            request.query_params.get('ids', ''),
+        )
+        serializer = self.get_serializer(titles, many=True)
+        return Response({'results': serializer.data, 'missing': missing})
+
 
-class ReviewViewSet(ModelViewSet):
+class ReviewViewSet(SparseFieldsMixin, ConditionalGetMixin, ModelViewSet):
     """
     Получить список всех отзывов.
     Права доступа:
@@ -122,19 +184,35 @@ class ReviewViewSet(ModelViewSet):
     """
     serializer_class = ReviewSerializer
     permission_classes = (IsAuthorOrReadOnly,)
+    pagination_class = OptionalKeysetPagination
+    # Ключ пагинации по курсору.
+    sparse_keep_fields = ('id', 'pub_date')
+
+    @cached_property
+    def title(self):
+        # Название выводится в созданном отзыве.
+        return get_object_or_404(
+            Title.objects.only('id', 'name', 'updated_at'),
+            pk=self.kwargs.get('title_id'),
+        )
+
+    def get_validator_dates(self):
+        # Название произведения входит в каждый отзыв.
+        return (self.title.updated_at,)
 
     def get_queryset(self):
-        title = get_object_or_404(Title, pk=self.kwargs.get('title_id'))
-        return title.reviews.all()
+        # updated_at нужен при изменении: save() записывает только
+        # загруженные поля, и отложенный auto_now не сохранился бы.
+        return self.title.reviews.select_related('title', 'author').only(
+            'id', 'text', 'pub_date', 'score', 'updated_at',
+            'title', 'title__name', 'author', 'author__username',
+        )
 
     def perform_create(self, serializer):
-        serializer.save(
-            author=self.request.user,
-            title=get_object_or_404(Title, id=self.kwargs.get('title_id'))
-        )
+        serializer.save(author=self.request.user, title=self.title)
 
 
-class CommentViewSet(ModelViewSet):
+class CommentViewSet(SparseFieldsMixin, ConditionalGetMixin, ModelViewSet):
     """
     Получить список всех комментариев.
     Права доступа:
@@ -143,10 +221,30 @@ class CommentViewSet(ModelViewSet):
     """
     serializer_class = CommentSerializer
     permission_classes = (IsAuthorOrReadOnly,)
+    pagination_class = OptionalKeysetPagination
+    # Ключ пагинации по курсору.
+    sparse_keep_fields = ('id', 'pub_date')
+
+    @cached_property
+    def review(self):
+        return get_object_or_404(
+            Review.objects.only('id', 'updated_at'),
+            pk=self.kwargs.get('review_id'),
+        )
+
+    def get_validator_dates(self):
+        # Текст отзыва входит в каждый комментарий.
+        return (self.review.updated_at,)
 
     def get_queryset(self):
-        review = get_object_or_404(Review, pk=self.kwargs.get('review_id'))
-        return review.comments.select_related('review')
+        # Текст отзыва загружается один раз на страницу, а не в каждой
+        # строке комментария. updated_at - как у отзывов.
+        return self.review.comments.select_related('author').prefetch_related(
+            Prefetch('review', queryset=Review.objects.only('id', 'text'))
+        ).only(
+            'id', 'text', 'pub_date', 'updated_at', 'review', 'author',
+            'author__username',
+        )
 
     def perform_create(self, serializer):
         serializer.save(
@@ -169,21 +267,21 @@ class AuthSignup(APIView):
     def post(request):
         serializer = SignupSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        user, created = User.objects.get_or_create(
-            username=serializer.validated_data['username'],
-            email=serializer.validated_data['email'],
-        )
-        user.confirmation_code = uuid.uuid4()
-        user.save
-
-        send_mail(
-            subject='Код подтверждения для проекта YaMDb',
-            message=f'Уважаемый, {str(user.username)}! '
-            f'Ваш код подтверждения: {user.confirmation_code}',
-            from_email=None,
-            recipient_list=[user.email],
-            fail_silently=False,
-        )
+        # Письмо попадает в очередь в той же транзакции, что и код:
+        # ответ не ждёт почтовый сервер, а письмо не теряется.
+        with transaction.atomic():
+            user, created = User.objects.get_or_create(
+                username=serializer.validated_data['username'],
+                email=serializer.validated_data['email'],
+            )
+            user.confirmation_code = uuid.uuid4()
+            user.save(update_fields=['confirmation_code'])
+            enqueue_email(
+                recipient=user.email,
+                subject='Код подтверждения для проекта YaMDb',
+                body=f'Уважаемый, {str(user.username)}! '
+                f'Ваш код подтверждения: {user.confirmation_code}',
+            )
         return Response(serializer.data, status=HTTP_200_OK)
 
 
@@ -201,6 +299,32 @@ class AuthToken(APIView):
                 {'confirmation_code': 'Неверный код подтверждения'},
                 status=HTTP_400_BAD_REQUEST
             )
-        token = RefreshToken.for_user(user).access_token
+        token = ClaimsAccessToken.for_user(user)
         return Response({'token': str(token)},
                         status=HTTP_200_OK)
+
+
+class ChangeFeedView(APIView):
+    """
+    Лента изменений произведений, отзывов и комментариев.
+    Без cursor возвращается текущая позиция журнала: после полной
+    синхронизации изменения запрашиваются с неё, ?cursor=<позиция>.
+    Необязательные параметры: entity=title,review,comment и limit.
+    Устаревший курсор - ответ 410, нужна полная синхронизация.
+    Права доступа: Доступно без токена.
+    """
+
+    @staticmethod
+    def get(request):
+        params = request.query_params
+        if CURSOR_PARAM not in params:
+            return Response(
+                {'cursor': head_cursor(), 'has_more': False, 'results': []}
+            )
+        cursor = parse_cursor(params[CURSOR_PARAM])
+        check_cursor(cursor)
+        return Response(read_changes(
+            cursor,
+            entities=parse_entities(params.get(ENTITY_PARAM)),
+            limit=parse_limit(params.get(LIMIT_PARAM)),
+        ))
@@ -4,4 +4,9 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_yamdb.settings')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+# Модули API импортируются после настройки Django.
+from api.sse import with_event_streams  # noqa: E402
+
+application = with_event_streams(django_application)
@@ -0,0 +1,177 @@
+import cProfile
+import json
+import logging
+import random
+import time
+from contextlib import ExitStack
+from pathlib import Path
+from time import perf_counter
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+logger = logging.getLogger('api_yamdb.timing')
+
+
+class QueryTimer:
+    """ Обёртка выполнения SQL: считает запросы и время в базе. """
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += perf_counter() - started
+            self.count += 1
+
+
+def view_label(view_func, method):
+    """Имя вида для логов: TitleViewSet.list, AuthSignup.post."""
+    view_class = getattr(view_func, 'cls', None)
+    if view_class is None:
+        return getattr(view_func, '__name__', 'unknown')
+    actions = getattr(view_func, 'actions', None) or {}
+    return f'{view_class.__name__}.{actions.get(method, method)}'
+
+
+class ServerTimingMiddleware:
+    """
+    Замер запросов к API: количество SQL-запросов, время в базе,
+    время вида и отрисовки ответа.
+    Результат - заголовок Server-Timing и строка в логе api_yamdb.timing.
+    Включается настройкой API_TIMING_ENABLED.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'API_TIMING_ENABLED', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.path_prefix = getattr(
+            settings, 'API_TIMING_PATH_PREFIX', '/api/'
+        )
+
+    def __call__(self, request):
+        if not request.path.startswith(self.path_prefix):
+            return self.get_response(request)
+
+        timer = QueryTimer()
+        request._timing = {
+            'label': None, 'view_started': None, 'view': None, 'render': 0.0,
+        }
+        started = perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(timer))
+            response = self.get_response(request)
+        total = perf_counter() - started
+
+        timing = request._timing
+        if timing['view'] is None:
+            # Ответ без отложенной отрисовки: всё время после process_view.
+            view_started = timing['view_started'] or started
+            timing['view'] = perf_counter() - view_started
+        app = max(timing['view'] - timer.duration, 0.0)
+        response['Server-Timing'] = ', '.join((
+            f'db;dur={timer.duration * 1000:.2f};'
+            f'desc="{timer.count} queries"',
+            f'app;dur={app * 1000:.2f}',
+            f'render;dur={timing["render"] * 1000:.2f}',
+            f'total;dur={total * 1000:.2f}',
+        ))
+        logger.info(
+            'view=%s method=%s path=%s status=%s queries=%d db_ms=%.2f '
+            'app_ms=%.2f render_ms=%.2f total_ms=%.2f',
+            timing['label'], request.method, request.path,
+            response.status_code, timer.count, timer.duration * 1000,
+            app * 1000, timing['render'] * 1000, total * 1000,
+        )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        timing = getattr(request, '_timing', None)
+        if timing is None:
+            return None
+        timing['label'] = view_label(view_func, request.method.lower())
+        timing['view_started'] = perf_counter()
+        return None
+
+    def process_template_response(self, request, response):
+        timing = getattr(request, '_timing', None)
+        if timing is None:
+            return response
+        started = perf_counter()
+        if timing['view_started'] is not None:
+            timing['view'] = started - timing['view_started']
+
+        def finish_render(rendered):
+            timing['render'] = perf_counter() - started
+
+        response.add_post_render_callback(finish_render)
+        return response
+
+
+class ProfilingMiddleware:
+    """
+    Выборочное профилирование видов через cProfile.
+    Профилируется доля API_PROFILING_RATE запросов к видам из
+    API_PROFILING_VIEWS (например, TitleViewSet.list или * для всех).
+    Профили с путём и параметрами запроса сохраняются в API_PROFILING_DIR,
+    хранятся последние API_PROFILING_MAX_FILES файлов.
+    """
+
+    def __init__(self, get_response):
+        self.views = set(getattr(settings, 'API_PROFILING_VIEWS', ()))
+        if not self.views:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.rate = settings.API_PROFILING_RATE
+        self.directory = Path(settings.API_PROFILING_DIR)
+        self.max_files = settings.API_PROFILING_MAX_FILES
+
+    def __call__(self, request):
+        request._profiler = None
+        response = self.get_response(request)
+        profiler = request._profiler
+        if profiler is not None:
+            profiler.disable()
+            self.save(request, profiler, perf_counter() - request._profiled)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        label = view_label(view_func, request.method.lower())
+        if '*' not in self.views and label not in self.views:
+            return None
+        if random.random() >= self.rate:
+            return None
+        request._profile_label = label
+        request._profiled = perf_counter()
+        request._profiler = cProfile.Profile()
+        request._profiler.enable()
+        return None
+
+    def save(self, request, profiler, duration):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        name = f'{time.time_ns()}-{request._profile_label}'
+        profiler.dump_stats(self.directory / f'{name}.prof')
+        meta = {
+            'view': request._profile_label,
+            'method': request.method,
+            'path': request.path,
+            'query': request.GET.dict(),
+            'duration_ms': round(duration * 1000, 3),
+        }
+        (self.directory / f'{name}.json').write_text(
+            json.dumps(meta, ensure_ascii=False), encoding='utf-8'
+        )
+        self.rotate()
+
+    def rotate(self):
+        profiles = sorted(self.directory.glob('*.prof'))
+        for path in profiles[:max(len(profiles) - self.max_files, 0)]:
+            path.unlink(missing_ok=True)
+            path.with_suffix('.json').unlink(missing_ok=True)
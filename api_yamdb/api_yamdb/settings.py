@@ -1,4 +1,5 @@
 from datetime import timedelta
+from importlib.util import find_spec
 from pathlib import Path
 
 
@@ -26,6 +27,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'api_yamdb.middleware.ServerTimingMiddleware',
+    'api_yamdb.middleware.ProfilingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -98,9 +101,29 @@ STATICFILES_DIRS = ((BASE_DIR / 'static/'),)
 
 AUTH_USER_MODEL = 'reviews.User'
 
+# MessagePack (Accept: application/msgpack) доступен, если установлен msgpack.
+MSGPACK_ENABLED = find_spec('msgpack') is not None
+MSGPACK_RENDERER_CLASSES = (
+    ('api.renderers.MessagePackRenderer',) if MSGPACK_ENABLED else ()
+)
+MSGPACK_PARSER_CLASSES = (
+    ('api.parsers.MessagePackParser',) if MSGPACK_ENABLED else ()
+)
+
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'api.authentication.CachedClaimsJWTAuthentication',
+    ),
+    'DEFAULT_RENDERER_CLASSES': (
+        'api.renderers.FastJSONRenderer',
+        *MSGPACK_RENDERER_CLASSES,
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'api.parsers.FastJSONParser',
+        *MSGPACK_PARSER_CLASSES,
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
     ),
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 5,
@@ -112,6 +135,85 @@ REST_FRAMEWORK = {
     ],
 }
 
+CURSOR_PAGINATION_MAX_PAGE_SIZE = 100
+
+# Наибольшее количество объектов в одном пакетном запросе.
+API_BULK_MAX_SIZE = 1000
+
+# Наибольшее количество id в запросе GET /api/v1/titles/bulk/?ids=.
+TITLES_MULTI_GET_MAX_IDS = 100
+
+# Лента изменений /api/v1/changes/: размер пачки по умолчанию и наибольший.
+CHANGE_FEED_PAGE_SIZE = 100
+CHANGE_FEED_MAX_PAGE_SIZE = 1000
+# Записи моложе задержки (секунды) не отдаются. Журнал пишется в
+# транзакции изменения одним INSERT перед фиксацией (reviews/changelog.py):
+# задержка должна быть больше времени от этой записи до фиксации
+# и расхождения часов серверов приложения.
+CHANGE_FEED_SETTLE_DELAY = 1
+# Срок хранения журнала изменений: python manage.py prune_changes.
+CHANGE_LOG_RETENTION_DAYS = 7
+
+TITLES_PAGINATION_COUNT_MODE = 'exact'
+
+TITLES_COUNT_CACHE_TIMEOUT = 30
+
+# Заголовок Server-Timing и логи api_yamdb.timing для запросов к API.
+API_TIMING_ENABLED = False
+
+API_TIMING_PATH_PREFIX = '/api/'
+
+# Выборочное профилирование видов, например ('TitleViewSet.list',).
+# Отчёт по собранным профилям: python manage.py profile_report
+API_PROFILING_VIEWS = ()
+
+API_PROFILING_RATE = 0.01
+
+API_PROFILING_DIR = BASE_DIR / 'profiles'
+
+API_PROFILING_MAX_FILES = 200
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'api_yamdb.timing': {
+            'handlers': ['console'],
+            'level': 'INFO',
+            'propagate': False,
+        },
+    },
+}
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'responses': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'api-responses',
+    },
+}
+
+# Кеш ответов API (алиас из CACHES) и время жизни ответа, секунды.
+API_RESPONSE_CACHE = 'responses'
+API_RESPONSE_CACHE_TIMEOUT = 300
+
+# Поток событий /api/v1/titles/<id>/reviews/stream/ (только под ASGI):
+# брокер, размер буфера клиента и интервал пустых сообщений, секунды.
+API_EVENTS_BROKER = 'api.events.InMemoryBroker'
+API_EVENTS_BUFFER_SIZE = 100
+API_EVENTS_HEARTBEAT = 15
+
+# Сколько секунд после выдачи права берутся из JWT без запроса к базе
+# и сколько хранятся в кеше: столько может действовать отозванная роль.
+JWT_USER_CACHE_TIMEOUT = 60
+
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(days=1),
     'AUTH_HEADER_TYPES': ('Bearer',),
@@ -122,3 +224,12 @@ DEFAULT_FROM_EMAIL = 'admin@apiyamdb.com'
 EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 
 EMAIL_FILE_PATH = BASE_DIR / 'sent_emails'
+
+# Очередь исходящих писем: письма отправляет команда send_outbox.
+# При EMAIL_OUTBOX_EAGER письма отправляются сразу после фиксации транзакции.
+EMAIL_OUTBOX_EAGER = False
+EMAIL_OUTBOX_BATCH_SIZE = 100
+EMAIL_OUTBOX_MAX_ATTEMPTS = 5
+# Задержка перед повторной отправкой, секунды: удваивается с каждой попыткой.
+EMAIL_OUTBOX_RETRY_DELAY = 60
+EMAIL_OUTBOX_MAX_DELAY = 3600
@@ -0,0 +1,91 @@
+import threading
+from contextlib import contextmanager
+from functools import partial
+from operator import add
+
+from django.db import transaction
+
+_state = threading.local()
+
+
+class WriteBatch:
+    """
+    Работа, которую сигналы откладывают до конца save() или delete():
+    каскадное удаление произведения или пользователя вызывает сигналы
+    каждого отзыва, а рейтинг, журнал и версии кеша достаточно обновить
+    один раз на объект.
+    """
+
+    def __init__(self):
+        # (модель, pk) объектов, удаляемых в этом пакете.
+        self.deleted = set()
+        self.totals = {}
+        self.collected = {}
+        self.deferred = {}
+
+    def accumulate(self, func, key, *deltas):
+        """При записи пакета вызывается func(key, *суммы) на каждый ключ."""
+        totals = self.totals.setdefault(func, {})
+        current = totals.get(key)
+        totals[key] = (
+            deltas if current is None else tuple(map(add, current, deltas))
+        )
+
+    def collect(self, func, items):
+        """При записи пакета func вызывается один раз со всеми items."""
+        if items:
+            self.collected.setdefault(func, []).extend(items)
+
+    def on_commit(self, func, *args):
+        """
+        После фиксации func вызывается один раз с аргументами всех
+        вызовов пакета, повторы отбрасываются.
+        """
+        self.deferred.setdefault(func, {}).update(dict.fromkeys(args))
+
+    def flush(self):
+        # Суммы применяются первыми: они тоже пишут в журнал.
+        for func, totals in self.totals.items():
+            for key, deltas in totals.items():
+                func(key, *deltas)
+        for func, items in self.collected.items():
+            func(items)
+        for func, args in self.deferred.items():
+            transaction.on_commit(partial(func, *args))
+
+
+def current_batch():
+    return getattr(_state, 'batch', None)
+
+
+@contextmanager
+def write_batch():
+    """
+    Открывает пакет записи в транзакции; вложенные вызовы используют
+    внешний пакет. Отложенная работа выполняется в конце внешнего
+    блока в той же транзакции, поэтому внутри блока рейтинги ещё
+    не пересчитаны. Исключение внутри блока отменяет пакет целиком.
+    """
+    batch = current_batch()
+    if batch is not None:
+        yield batch
+        return
+    batch = _state.batch = WriteBatch()
+    try:
+        with transaction.atomic():
+            yield batch
+            batch.flush()
+    finally:
+        _state.batch = None
+
+
+class WriteBatchMixin:
+    """save() и delete() модели выполняются одним пакетом записи."""
+
+    def save(self, *args, **kwargs):
+        with write_batch():
+            super().save(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        with write_batch():
+            return super().delete(*args, **kwargs)
@@ -0,0 +1,104 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from .batch import current_batch
+from .constants import (CHANGE_PRUNED, CHANGE_UPDATED, ENTITY_COMMENT,
+                        ENTITY_REVIEW, ENTITY_TITLE)
+from .models import ChangeLog, Comments, Review, Title
+
+ENTITIES = {
+    Title: ENTITY_TITLE,
+    Review: ENTITY_REVIEW,
+    Comments: ENTITY_COMMENT,
+}
+# Родительский объект нужен клиенту, чтобы применить удаление.
+PARENT_FIELDS = {
+    Review: 'title_id',
+    Comments: 'review_id',
+}
+
+
+def log_entry(model, pk, parent_id, action):
+    return ChangeLog(
+        entity=ENTITIES[model], object_id=pk, parent_id=parent_id,
+        action=action,
+    )
+
+
+def write_entries(entries):
+    """
+    Записи пишутся в транзакции изменения: откат изменения откатывает
+    и их. В пакете записи (save() и delete() моделей) записи собираются
+    и вставляются одним INSERT в конце пакета, непосредственно перед
+    фиксацией, поэтому id журнала становятся видны почти сразу после
+    выдачи. Оставшийся разрыв закрывает CHANGE_FEED_SETTLE_DELAY.
+    """
+    batch = current_batch()
+    if batch is not None:
+        batch.collect(ChangeLog.objects.bulk_create, entries)
+    elif entries:
+        ChangeLog.objects.bulk_create(entries)
+
+
+def record_change(model, pk, action, parent_id=None):
+    write_entries([log_entry(model, pk, parent_id, action)])
+
+
+def record_instance(instance, action):
+    parent_field = PARENT_FIELDS.get(type(instance))
+    record_change(
+        type(instance), instance.pk, action,
+        getattr(instance, parent_field) if parent_field else None,
+    )
+
+
+def record_instances(instances, action):
+    """Записывает изменения объектов одним INSERT."""
+    entries = []
+    for instance in instances:
+        model = type(instance)
+        parent_field = PARENT_FIELDS.get(model)
+        parent_id = getattr(instance, parent_field) if parent_field else None
+        entries.append(log_entry(model, instance.pk, parent_id, action))
+    write_entries(entries)
+
+
+def record_changes(queryset, action=CHANGE_UPDATED):
+    """
+    Записывает изменения строк, обновлённых через update():
+    один SELECT id и один INSERT. Строки читаются сразу, до того как
+    транзакция их изменит или удалит.
+    """
+    model = queryset.model
+    parent_field = PARENT_FIELDS.get(model)
+    if parent_field is None:
+        rows = ((pk, None) for pk in queryset.values_list('pk', flat=True))
+    else:
+        rows = queryset.values_list('pk', parent_field)
+    write_entries([
+        log_entry(model, pk, parent_id, action) for pk, parent_id in rows
+    ])
+
+
+def prune_changes(days=None):
+    """
+    Удаляет записи старше CHANGE_LOG_RETENTION_DAYS дней.
+    Последняя из них становится границей очистки (pruned): курсоры
+    до неё устарели, курсоры после неё продолжают работать.
+    Возвращает количество удалённых записей.
+    """
+    if days is None:
+        days = settings.CHANGE_LOG_RETENTION_DAYS
+    boundary = ChangeLog.objects.filter(
+        changed_at__lt=timezone.now() - timedelta(days=days)
+    ).aggregate(last=Max('id'))['last']
+    if boundary is None:
+        return 0
+    with transaction.atomic():
+        deleted, _ = ChangeLog.objects.filter(id__lt=boundary).delete()
+        ChangeLog.objects.filter(pk=boundary).update(action=CHANGE_PRUNED)
+    return deleted
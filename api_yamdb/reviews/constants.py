@@ -15,3 +15,27 @@ CATEGORY_CHOICES = [
 ]
 
 OUTPUT_TEXT_LIMIT = 30
+
+# Журнал изменений: типы объектов и действия.
+ENTITY_TITLE = 'title'
+ENTITY_REVIEW = 'review'
+ENTITY_COMMENT = 'comment'
+
+ENTITY_CHOICES = [
+    (ENTITY_TITLE, 'произведение'),
+    (ENTITY_REVIEW, 'отзыв'),
+    (ENTITY_COMMENT, 'комментарий'),
+]
+
+CHANGE_CREATED = 'created'
+CHANGE_UPDATED = 'updated'
+CHANGE_DELETED = 'deleted'
+# Граница очистки журнала: записи до неё удалены.
+CHANGE_PRUNED = 'pruned'
+
+CHANGE_ACTION_CHOICES = [
+    (CHANGE_CREATED, 'создан'),
+    (CHANGE_UPDATED, 'изменён'),
+    (CHANGE_DELETED, 'удалён'),
+    (CHANGE_PRUNED, 'граница очистки'),
+]
@@ -0,0 +1,77 @@
+from contextlib import contextmanager
+
+from django.core.management.color import no_style
+from django.db import connection, transaction
+
+from .models import Title
+
+# Пакетная запись для команд загрузки и генерации данных.
+BATCH_SIZE = 1000
+
+TitleGenre = Title.genre.through
+
+
+def reset_sequences(models):
+    """Сдвигает счётчики id после вставки строк с явными id."""
+    statements = connection.ops.sequence_reset_sql(no_style(), models)
+    if statements:
+        with connection.cursor() as cursor:
+            for sql in statements:
+                cursor.execute(sql)
+
+
+def load_ids(foreign_keys):
+    """Множества существующих id для проверки внешних ключей в памяти."""
+    return {
+        field: set(model.objects.values_list('id', flat=True))
+        for field, model in foreign_keys.items()
+    }
+
+
+def has_valid_keys(values, known_ids):
+    for field, ids in known_ids.items():
+        value = values[field]
+        if value is not None and value not in ids:
+            return False
+    return True
+
+
+@contextmanager
+def keep_pub_date(model):
+    """Сохраняет pub_date из файла вместо auto_now_add."""
+    fields = [
+        field for field in model._meta.fields
+        if getattr(field, 'auto_now_add', False)
+    ]
+    for field in fields:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field in fields:
+            field.auto_now_add = True
+
+
+def write_batches(model, batches, foreign_keys, batch_size=BATCH_SIZE):
+    """
+    Запись разобранных строк пакетами bulk_create в одной транзакции.
+    Возвращает количество вставленных и пропущенных строк: некорректных,
+    с неизвестными внешними ключами и уже существующих. bulk_create
+    с ignore_conflicts не сообщает, сколько строк вставлено, поэтому
+    вставленные считаются по COUNT(*) до и после записи.
+    """
+    known_ids = load_ids(foreign_keys)
+    processed = 0
+    with transaction.atomic(), keep_pub_date(model):
+        before = model.objects.count()
+        for batch in batches:
+            objs = [
+                model(**values) for values in batch
+                if values is not None and has_valid_keys(values, known_ids)
+            ]
+            model.objects.bulk_create(
+                objs, batch_size=batch_size, ignore_conflicts=True
+            )
+            processed += len(batch)
+        loaded = model.objects.count() - before
+    return loaded, processed - loaded
@@ -0,0 +1,149 @@
+import csv
+import gzip
+import io
+import json
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from time import perf_counter
+
+from django.core.management import BaseCommand
+
+from api_yamdb.settings import BASE_DIR
+from reviews.models import (Category, Comments, Genre, Review,
+                            Title, User)
+
+EXPORT_DIR = BASE_DIR / 'export'
+CHUNK_SIZE = 2000
+FORMATS = ('csv', 'ndjson')
+
+# Имя файла, модель и колонки: колонка файла -> поле модели.
+# Колонки совпадают с заголовками файлов, которые читает test_data_db.
+EXPORT_FILES = (
+    ('users', User, {
+        'id': 'id', 'username': 'username', 'email': 'email',
+        'role': 'role', 'bio': 'bio', 'first_name': 'first_name',
+        'last_name': 'last_name',
+    }),
+    ('category', Category, {'id': 'id', 'name': 'name', 'slug': 'slug'}),
+    ('genre', Genre, {'id': 'id', 'name': 'name', 'slug': 'slug'}),
+    ('titles', Title, {
+        'id': 'id', 'name': 'name', 'year': 'year',
+        'category': 'category_id', 'description': 'description',
+    }),
+    ('genre_title', Title.genre.through, {
+        'id': 'id', 'title_id': 'title_id', 'genre_id': 'genre_id',
+    }),
+    ('review', Review, {
+        'id': 'id', 'title_id': 'title_id', 'text': 'text',
+        'author': 'author_id', 'score': 'score', 'pub_date': 'pub_date',
+    }),
+    ('comments', Comments, {
+        'id': 'id', 'review_id': 'review_id', 'text': 'text',
+        'author': 'author_id', 'pub_date': 'pub_date',
+    }),
+)
+
+
+def format_datetime(value):
+    """Дата в UTC в формате исходных файлов: 2019-09-24T21:08:21.567Z."""
+    value = value.astimezone(timezone.utc)
+    timespec = 'milliseconds' if value.microsecond % 1000 == 0 else 'auto'
+    return value.replace(tzinfo=None).isoformat(timespec=timespec) + 'Z'
+
+
+def to_csv(value):
+    if value is None:
+        return ''
+    if isinstance(value, datetime):
+        return format_datetime(value)
+    return value
+
+
+def to_json(value):
+    if isinstance(value, datetime):
+        return format_datetime(value)
+    return value
+
+
+@contextmanager
+def open_output(path, compress):
+    """Текстовый поток для записи; gzip без даты для воспроизводимости."""
+    with open(path, 'wb') as raw:
+        if compress:
+            raw = gzip.GzipFile(filename='', mode='wb', fileobj=raw, mtime=0)
+        with io.TextIOWrapper(raw, encoding='utf-8', newline='') as output:
+            yield output
+
+
+def export_model(model, columns, output, file_format,
+                 chunk_size=CHUNK_SIZE):
+    """Потоковая выгрузка таблицы; память не зависит от размера таблицы."""
+    rows = model.objects.order_by('id').values_list(
+        *columns.values()
+    ).iterator(chunk_size=chunk_size)
+    exported = 0
+    if file_format == 'csv':
+        writer = csv.writer(output, lineterminator='\n')
+        writer.writerow(columns)
+        for row in rows:
+            writer.writerow([to_csv(value) for value in row])
+            exported += 1
+    else:
+        for row in rows:
+            output.write(json.dumps(
+                dict(zip(columns, map(to_json, row))), ensure_ascii=False
+            ))
+            output.write('\n')
+            exported += 1
+    return exported
+
+
+def export_data(export_dir=EXPORT_DIR, file_format='csv', compress=False,
+                chunk_size=CHUNK_SIZE, stdout=None):
+    export_dir.mkdir(parents=True, exist_ok=True)
+    for name, model, columns in EXPORT_FILES:
+        filename = f'{name}.{file_format}' + ('.gz' if compress else '')
+        started = perf_counter()
+        with open_output(export_dir / filename, compress) as output:
+            exported = export_model(
+                model, columns, output, file_format, chunk_size
+            )
+        elapsed = perf_counter() - started
+        if stdout is not None:
+            stdout.write(
+                f'{filename}: {exported} строк, {elapsed:.2f} с, '
+                f'{exported / max(elapsed, 1e-9):.0f} строк/с'
+            )
+
+
+class Command(BaseCommand):
+    help = ('Выгрузка данных в csv- или ndjson-файлы:'
+            'python manage.py export_data')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--path', default=str(EXPORT_DIR),
+            help='Каталог для выгружаемых файлов.',
+        )
+        parser.add_argument(
+            '--format', choices=FORMATS, default='csv',
+            help='Формат файлов.',
+        )
+        parser.add_argument(
+            '--gzip', action='store_true',
+            help='Сжимать файлы gzip.',
+        )
+        parser.add_argument(
+            '--chunk-size', type=int, default=CHUNK_SIZE,
+            help='Количество строк, читаемых из базы за один раз.',
+        )
+
+    def handle(self, *args, **options):
+        export_data(
+            export_dir=Path(options['path']),
+            file_format=options['format'],
+            compress=options['gzip'],
+            chunk_size=options['chunk_size'],
+            stdout=self.stdout,
+        )
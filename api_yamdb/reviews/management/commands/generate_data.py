@@ -0,0 +1,239 @@
+import random
+from datetime import datetime, timedelta, timezone
+from itertools import islice
+from time import perf_counter
+
+from django.core.management import BaseCommand
+from django.db.models import Max
+
+from reviews.constants import ADMIN, MODERATOR, USER
+from reviews.db import BATCH_SIZE, TitleGenre, reset_sequences, write_batches
+from reviews.models import (Category, Comments, Genre, Review,
+                            Title, User)
+
+# Наборы данных для замеров: около 10 тысяч, 1 и 10 миллионов отзывов.
+PRESETS = {
+    'small': {
+        'users': 1_000, 'categories': 5, 'genres': 30, 'titles': 1_000,
+        'reviews': 10_000, 'comments': 20_000,
+    },
+    'medium': {
+        'users': 50_000, 'categories': 10, 'genres': 100, 'titles': 20_000,
+        'reviews': 1_000_000, 'comments': 2_000_000,
+    },
+    'large': {
+        'users': 200_000, 'categories': 20, 'genres': 200,
+        'titles': 100_000, 'reviews': 10_000_000, 'comments': 20_000_000,
+    },
+}
+# Показатель распределения Парето: чем меньше, тем длиннее «хвост»
+# популярных произведений и обсуждаемых отзывов.
+PARETO_ALPHA = 1.5
+WORDS = (
+    'фильм', 'книга', 'сюжет', 'актёры', 'режиссёр', 'финал', 'диалоги',
+    'музыка', 'герой', 'сценарий', 'отлично', 'скучно', 'неожиданно',
+    'рекомендую', 'пересмотрю', 'затянуто', 'атмосфера', 'стоит', 'увидеть',
+    'персонажи', 'история', 'впечатление', 'оператор', 'звук', 'прочитать',
+)
+START_DATE = datetime(2015, 1, 1, tzinfo=timezone.utc)
+DATE_RANGE_SECONDS = 8 * 365 * 24 * 60 * 60
+
+
+def batched(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def power_law_count(rnd, mean, limit):
+    """
+    Случайное количество с распределением Парето и заданным средним.
+    Вероятностное округление сохраняет среднее для малых значений.
+    """
+    value = mean * (PARETO_ALPHA - 1) * (rnd.paretovariate(PARETO_ALPHA) - 1)
+    return min(limit, int(value + rnd.random()))
+
+
+def random_text(rnd, min_words=5, max_words=40):
+    words = rnd.choices(WORDS, k=rnd.randint(min_words, max_words))
+    return ' '.join(words).capitalize() + '.'
+
+
+def random_date(rnd):
+    return START_DATE + timedelta(seconds=rnd.randrange(DATE_RANGE_SECONDS))
+
+
+def next_id(model):
+    return (model.objects.aggregate(Max('id'))['id__max'] or 0) + 1
+
+
+def generate_users(rnd, first_id, count):
+    roles = (USER,) * 18 + (MODERATOR, ADMIN)
+    for pk in range(first_id, first_id + count):
+        yield {
+            'id': pk,
+            'username': f'user{pk}',
+            'email': f'user{pk}@yamdb.fake',
+            'role': rnd.choice(roles),
+            'bio': random_text(rnd, 0, 10),
+        }
+
+
+def generate_categories(rnd, first_id, count):
+    for pk in range(first_id, first_id + count):
+        yield {'id': pk, 'name': f'Категория {pk}', 'slug': f'category-{pk}'}
+
+
+def generate_genres(rnd, first_id, count):
+    for pk in range(first_id, first_id + count):
+        yield {'id': pk, 'name': f'Жанр {pk}', 'slug': f'genre-{pk}'}
+
+
+def generate_titles(rnd, first_id, count, category_ids):
+    for pk in range(first_id, first_id + count):
+        yield {
+            'id': pk,
+            'name': f'Произведение {pk}',
+            'year': rnd.randint(1900, 2023),
+            'description': random_text(rnd),
+            'category_id': rnd.choice(category_ids),
+        }
+
+
+def generate_title_genres(rnd, first_id, title_ids, genre_ids):
+    pk = first_id
+    for title_id in title_ids:
+        for genre_id in rnd.sample(genre_ids, min(len(genre_ids),
+                                                  rnd.randint(1, 3))):
+            yield {'id': pk, 'title_id': title_id, 'genre_id': genre_id}
+            pk += 1
+
+
+def generate_reviews(rnd, first_id, title_ids, user_ids, mean):
+    pk = first_id
+    for title_id in title_ids:
+        count = power_law_count(rnd, mean, len(user_ids))
+        # Один автор оставляет не больше одного отзыва на произведение.
+        for author_id in rnd.sample(user_ids, count):
+            yield {
+                'id': pk,
+                'title_id': title_id,
+                'author_id': author_id,
+                'text': random_text(rnd),
+                'score': min(10, max(1, round(rnd.gauss(7, 2)))),
+                'pub_date': random_date(rnd),
+            }
+            pk += 1
+
+
+def generate_comments(rnd, first_id, review_ids, user_ids, mean):
+    pk = first_id
+    for review_id in review_ids:
+        for _ in range(power_law_count(rnd, mean, int(10 * mean) + 100)):
+            yield {
+                'id': pk,
+                'review_id': review_id,
+                'author_id': rnd.choice(user_ids),
+                'text': random_text(rnd, 1, 20),
+                'pub_date': random_date(rnd),
+            }
+            pk += 1
+
+
+def generate_data(users, categories, genres, titles, reviews, comments,
+                  seed=0, batch_size=BATCH_SIZE, stdout=None):
+    """
+    Генерация каталога заданного размера через bulk_create.
+    Количество отзывов и комментариев выдерживается в среднем.
+    """
+    rnd = random.Random(seed)
+
+    def write(name, model, rows):
+        started = perf_counter()
+        loaded, _ = write_batches(
+            model, batched(rows, batch_size), {}, batch_size
+        )
+        elapsed = perf_counter() - started
+        if stdout is not None:
+            stdout.write(
+                f'{name}: {loaded} строк, {elapsed:.2f} с, '
+                f'{loaded / max(elapsed, 1e-9):.0f} строк/с'
+            )
+        return loaded
+
+    first = next_id(User)
+    write('users', User, generate_users(rnd, first, users))
+    user_ids = list(range(first, first + users))
+
+    first = next_id(Category)
+    write('category', Category, generate_categories(rnd, first, categories))
+    category_ids = list(range(first, first + categories))
+
+    first = next_id(Genre)
+    write('genre', Genre, generate_genres(rnd, first, genres))
+    genre_ids = list(range(first, first + genres))
+
+    first = next_id(Title)
+    write('titles', Title,
+          generate_titles(rnd, first, titles, category_ids))
+    title_ids = range(first, first + titles)
+
+    write('genre_title', TitleGenre, generate_title_genres(
+        rnd, next_id(TitleGenre), title_ids, genre_ids
+    ))
+
+    first = next_id(Review)
+    created = write('review', Review, generate_reviews(
+        rnd, first, title_ids, user_ids, reviews / max(titles, 1)
+    ))
+    review_ids = range(first, first + created)
+
+    write('comments', Comments, generate_comments(
+        rnd, next_id(Comments), review_ids, user_ids,
+        comments / max(created, 1)
+    ))
+    reset_sequences(
+        [User, Category, Genre, Title, TitleGenre, Review, Comments]
+    )
+    Title.rebuild_ratings(
+        Title.objects.filter(pk__range=(title_ids.start, title_ids.stop - 1))
+    )
+
+
+class Command(BaseCommand):
+    help = ('Генерация тестового каталога для замеров производительности:'
+            'python manage.py generate_data --preset small')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--preset', choices=PRESETS, default='small',
+            help='Размер набора данных (10 тыс., 1 млн или 10 млн отзывов).',
+        )
+        for name in PRESETS['small']:
+            parser.add_argument(
+                f'--{name}', type=int, default=None,
+                help='Переопределяет значение из набора --preset.',
+            )
+        parser.add_argument(
+            '--seed', type=int, default=0,
+            help='Начальное значение генератора для воспроизводимости.',
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=BATCH_SIZE,
+            help='Количество строк в одном пакете bulk_create.',
+        )
+
+    def handle(self, *args, **options):
+        sizes = dict(PRESETS[options['preset']])
+        for name in sizes:
+            if options[name] is not None:
+                sizes[name] = options[name]
+        generate_data(
+            **sizes,
+            seed=options['seed'],
+            batch_size=options['batch_size'],
+            stdout=self.stdout,
+        )
@@ -0,0 +1,21 @@
+from django.core.management import BaseCommand
+
+from reviews.changelog import prune_changes
+
+
+class Command(BaseCommand):
+    help = ('Удаление старых записей журнала изменений:'
+            'python manage.py prune_changes')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days', type=int, default=None,
+            help=('Срок хранения записей в днях '
+                  '(по умолчанию CHANGE_LOG_RETENTION_DAYS).'),
+        )
+
+    def handle(self, *args, **options):
+        deleted = prune_changes(options['days'])
+        self.stdout.write(
+            self.style.SUCCESS(f'Удалено записей журнала: {deleted}')
+        )
@@ -0,0 +1,14 @@
+from django.core.management import BaseCommand
+
+from reviews.models import Title
+
+
+class Command(BaseCommand):
+    help = ('Пересчёт рейтингов произведений по отзывам:'
+            'python manage.py rebuild_ratings')
+
+    def handle(self, *args, **kwargs):
+        updated = Title.rebuild_ratings()
+        self.stdout.write(
+            self.style.SUCCESS(f'Пересчитано произведений: {updated}')
+        )
@@ -0,0 +1,46 @@
+from time import sleep
+
+from django.conf import settings
+from django.core.mail import get_connection
+from django.core.management import BaseCommand
+
+from reviews.outbox import deliver_pending
+
+
+class Command(BaseCommand):
+    help = ('Отправка писем из очереди исходящих писем:'
+            'python manage.py send_outbox')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int,
+            default=settings.EMAIL_OUTBOX_BATCH_SIZE,
+            help='Количество писем, отправляемых за одно соединение.',
+        )
+        parser.add_argument(
+            '--loop', action='store_true',
+            help='Не завершаться, а проверять очередь каждые --interval с.',
+        )
+        parser.add_argument(
+            '--interval', type=float, default=5.0,
+            help='Пауза между проверками пустой очереди, секунды.',
+        )
+
+    def handle(self, *args, **options):
+        # Одно соединение с почтовым сервером на всю пачку писем.
+        mail_connection = get_connection()
+        total_sent = total_failed = 0
+        while True:
+            sent, failed = deliver_pending(
+                options['batch_size'], mail_connection=mail_connection
+            )
+            total_sent += sent
+            total_failed += failed
+            if sent or failed:
+                continue
+            if not options['loop']:
+                break
+            sleep(options['interval'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Отправлено писем: {total_sent}, ошибок: {total_failed}'
+        ))
@@ -1,119 +1,251 @@
 import csv
-import sqlite3
-
+import gzip
+import json
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from time import perf_counter
+
+import django
 from django.core.management import BaseCommand
+from django.db import connections
+from django.utils.dateparse import parse_datetime
 
 from api_yamdb.settings import BASE_DIR
+from reviews.db import BATCH_SIZE, TitleGenre, reset_sequences, write_batches
 from reviews.models import (Category, Comments, Genre, Review,
                             Title, User)
 
-
-def import_csv():
-
-    with open(
-            f'{BASE_DIR}/static/data/users.csv', encoding='utf-8'
-    ) as csv_file:
-        file_reader = csv.DictReader(csv_file, delimiter=',')
-        for row in file_reader:
-            User.objects.update_or_create(
-                id=row["id"],
-                username=row["username"],
-                email=row["email"],
-                role=row["role"],
-                bio=row["bio"],
-                first_name=row["first_name"],
-                last_name=row["last_name"]
-            )
-
-    with open(
-            f'{BASE_DIR}/static/data/category.csv', encoding='utf-8'
-    ) as csv_file:
-        file_reader = csv.DictReader(csv_file, delimiter=',')
-        for row in file_reader:
-            Category.objects.update_or_create(
-                id=row["id"],
-                name=row["name"],
-                slug=row["slug"],
-            )
-
-    with open(
-        f'{BASE_DIR}/static/data/genre.csv', encoding='utf-8'
-    ) as csv_file:
-        file_reader = csv.DictReader(csv_file, delimiter=',')
-        for row in file_reader:
-            Genre.objects.update_or_create(
-                id=row["id"],
-                name=row["name"],
-                slug=row["slug"],
-            )
-
-    with open(
-        f'{BASE_DIR}/static/data/titles.csv', encoding='utf-8'
-    ) as csv_file:
-        file_reader = csv.DictReader(csv_file, delimiter=',')
-        for row in file_reader:
-            Title.objects.update_or_create(
-                id=row['id'],
-                name=row['name'],
-                year=row['year'],
-                category_id=row['category']
-            )
-
-    with open(
-        f'{BASE_DIR}/static/data/review.csv', encoding='utf-8'
-    ) as csv_file:
-        file_reader = csv.DictReader(csv_file, delimiter=',')
-        for row in file_reader:
-            author = User.objects.get(id=row["author"])
-            Review.objects.update_or_create(
-                id=row['id'],
-                title_id=row['title_id'],
-                text=row['text'],
-                author_id=author.id,
-                score=row['score'],
-                pub_date=row['pub_date']
-            )
-
-    with open(
-        f'{BASE_DIR}/static/data/comments.csv', encoding='utf-8'
-    ) as csv_file:
-        file_reader = csv.DictReader(csv_file, delimiter=',')
-        for row in file_reader:
-            author = User.objects.get(id=row["author"])
-            Comments.objects.update_or_create(
-                id=row['id'],
-                review_id=row['review_id'],
-                text=row['text'],
-                author_id=author.id,
-                pub_date=row['pub_date']
-            )
-
-    # Отдельное заполнение таблицы reviews_title_genre
-    # (при отсутствии соответствующей модели в models.py):
-    db_path = 'db.sqlite3'
-    db_connector = sqlite3.connect(db_path)
-    db_cursor = db_connector.cursor()
-
-    with open(f'{BASE_DIR}/static/data/genre_title.csv',
-              'r', encoding='utf-8') as csv_file:
-        file_reader = csv.DictReader(csv_file, delimiter=',')
-        file_rows = [(column['id'],
-                      column['title_id'],
-                      column['genre_id']) for column in file_reader]
-
-    db_cursor.executemany(
-        "INSERT INTO reviews_title_genre"
-        "(id, title_id, genre_id)"
-        "VALUES (?, ?, ?);", file_rows)
-    db_connector.commit()
+DATA_DIR = BASE_DIR / 'static' / 'data'
+
+
+def parse_user(row):
+    return {
+        'id': int(row['id']),
+        'username': row['username'],
+        'email': row['email'],
+        'role': row['role'],
+        'bio': row['bio'],
+        'first_name': row['first_name'],
+        'last_name': row['last_name'],
+    }
+
+
+def parse_category(row):
+    return {'id': int(row['id']), 'name': row['name'], 'slug': row['slug']}
+
+
+def parse_genre(row):
+    return {'id': int(row['id']), 'name': row['name'], 'slug': row['slug']}
+
+
+def parse_title(row):
+    return {
+        'id': int(row['id']),
+        'name': row['name'],
+        'year': int(row['year']),
+        'category_id': int(row['category']) if row['category'] else None,
+        'description': row.get('description') or None,
+    }
+
+
+def parse_title_genre(row):
+    return {
+        'id': int(row['id']),
+        'title_id': int(row['title_id']),
+        'genre_id': int(row['genre_id']),
+    }
+
+
+def parse_date(value):
+    pub_date = parse_datetime(value)
+    if pub_date is None:
+        raise ValueError(f'Некорректная дата: {value}')
+    return pub_date
+
+
+def parse_review(row):
+    return {
+        'id': int(row['id']),
+        'title_id': int(row['title_id']),
+        'text': row['text'],
+        'author_id': int(row['author']),
+        'score': int(row['score']),
+        'pub_date': parse_date(row['pub_date']),
+    }
+
+
+def parse_comment(row):
+    return {
+        'id': int(row['id']),
+        'review_id': int(row['review_id']),
+        'text': row['text'],
+        'author_id': int(row['author']),
+        'pub_date': parse_date(row['pub_date']),
+    }
+
+
+# Этапы загрузки: файлы этапа зависят только от предыдущих этапов.
+# Для каждого файла: модель, разбор строки и внешние ключи поле -> модель.
+IMPORT_STAGES = (
+    (
+        ('users.csv', User, parse_user, {}),
+        ('category.csv', Category, parse_category, {}),
+        ('genre.csv', Genre, parse_genre, {}),
+    ),
+    (
+        ('titles.csv', Title, parse_title, {'category_id': Category}),
+    ),
+    (
+        ('genre_title.csv', TitleGenre, parse_title_genre,
+         {'title_id': Title, 'genre_id': Genre}),
+        ('review.csv', Review, parse_review,
+         {'title_id': Title, 'author_id': User}),
+    ),
+    (
+        ('comments.csv', Comments, parse_comment,
+         {'review_id': Review, 'author_id': User}),
+    ),
+)
+
+
+def find_file(data_dir, filename):
+    """
+    Поиск файла в одном из поддерживаемых форматов:
+    users.csv, users.csv.gz, users.ndjson, users.ndjson.gz.
+    """
+    stem = filename.rsplit('.', 1)[0]
+    for name in (filename, f'{stem}.ndjson'):
+        for candidate in (data_dir / name, data_dir / f'{name}.gz'):
+            if candidate.exists():
+                return candidate
+    return data_dir / filename
+
+
+def read_rows(path):
+    opener = gzip.open if path.suffix == '.gz' else open
+    with opener(path, 'rt', encoding='utf-8', newline='') as data_file:
+        if '.ndjson' in path.suffixes:
+            for line in data_file:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            yield from csv.DictReader(data_file, delimiter=',')
+
+
+def read_batches(path, batch_size):
+    """Потоковое чтение файла блоками фиксированного размера."""
+    batch = []
+    for row in read_rows(path):
+        batch.append(row)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def parse_rows(rows, parse):
+    """Разбор и проверка строк; некорректные строки заменяются на None."""
+    parsed = []
+    for row in rows:
+        try:
+            parsed.append(parse(row))
+        except (KeyError, TypeError, ValueError):
+            parsed.append(None)
+    return parsed
+
+
+def parse_in_parallel(executor, batches, parse, window):
+    """
+    Разбор блоков в процессах пула с сохранением порядка.
+    Одновременно в работе не больше window блоков, поэтому в памяти
+    находится не больше window * batch_size строк, а не файл целиком.
+    """
+    pending = deque()
+    for rows in batches:
+        pending.append(executor.submit(parse_rows, rows, parse))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def import_csv(data_dir=DATA_DIR, batch_size=BATCH_SIZE, stdout=None,
+               workers=None):
+    """
+    Загрузка всех файлов по этапам.
+    Файлы читаются потоково блоками по batch_size строк. При workers > 1
+    блоки разбираются параллельно в отдельных процессах, а запись
+    выполняется последовательно в порядке зависимостей.
+    """
+    workers = workers or os.cpu_count() or 1
+    executor = None
+    if workers > 1:
+        # Дочерним процессам не нужны открытые соединения с базой.
+        connections.close_all()
+        executor = ProcessPoolExecutor(
+            max_workers=workers, initializer=django.setup
+        )
+    try:
+        for stage in IMPORT_STAGES:
+            for filename, model, parse, foreign_keys in stage:
+                started = perf_counter()
+                rows = read_batches(find_file(data_dir, filename), batch_size)
+                if executor is None:
+                    batches = (parse_rows(batch, parse) for batch in rows)
+                else:
+                    batches = parse_in_parallel(
+                        executor, rows, parse, window=2 * workers
+                    )
+                loaded, skipped = write_batches(
+                    model, batches, foreign_keys, batch_size
+                )
+                elapsed = perf_counter() - started
+                if stdout is not None:
+                    stdout.write(
+                        f'{filename}: {loaded} строк, пропущено {skipped}, '
+                        f'{elapsed:.2f} с, '
+                        f'{loaded / max(elapsed, 1e-9):.0f} строк/с'
+                    )
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+    reset_sequences([
+        model for stage in IMPORT_STAGES for _, model, _, _ in stage
+    ])
+    # bulk_create не вызывает сигналы, поэтому рейтинги пересчитываются
+    # одним запросом после загрузки отзывов.
+    Title.rebuild_ratings()
 
 
 class Command(BaseCommand):
     help = ('Загрузка данных из csv-файлов:'
             'python manage.py test_data_db')
 
-    def handle(self, *args, **kwargs):
-        import_csv()
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--path', default=str(DATA_DIR),
+            help='Каталог с csv-файлами.',
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=BATCH_SIZE,
+            help='Количество строк в одном пакете bulk_create.',
+        )
+        parser.add_argument(
+            '--workers', type=int, default=None,
+            help=('Количество процессов для разбора файлов '
+                  '(по умолчанию - число ядер, 1 - без процессов).'),
+        )
+
+    def handle(self, *args, **options):
+        import_csv(
+            data_dir=Path(options['path']),
+            batch_size=options['batch_size'],
+            stdout=self.stdout,
+            workers=options['workers'],
+        )
 
 
 if __name__ == '__main__':
@@ -0,0 +1,55 @@
+# Generated by Django 3.2 on 2026-10-17 12:00
+
+from django.db import migrations, models
+from django.db.models import (Case, Count, F, OuterRef, Subquery, Sum, Value,
+                              When)
+from django.db.models.functions import Coalesce
+
+
+def fill_ratings(apps, schema_editor):
+    """Заполнение рейтингов двумя запросами, как в Title.rebuild_ratings."""
+    Title = apps.get_model('reviews', 'Title')
+    Review = apps.get_model('reviews', 'Review')
+    reviews = Review.objects.filter(
+        title=OuterRef('pk')
+    ).order_by().values('title')
+    titles = Title.objects.filter(pk__in=Review.objects.values('title'))
+    titles.update(
+        rating_sum=Coalesce(
+            Subquery(reviews.annotate(total=Sum('score')).values('total')), 0
+        ),
+        rating_count=Coalesce(
+            Subquery(reviews.annotate(total=Count('pk')).values('total')), 0
+        ),
+    )
+    titles.update(rating=Case(
+        When(rating_count=0, then=Value(None)),
+        default=F('rating_sum') / F('rating_count'),
+        output_field=models.PositiveSmallIntegerField(),
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0003_user_confirmation_code'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='title',
+            name='rating',
+            field=models.PositiveSmallIntegerField(blank=True, editable=False, null=True, verbose_name='Рейтинг'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='rating_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Количество оценок'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='rating_sum',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Сумма оценок'),
+        ),
+        migrations.RunPython(fill_ratings, migrations.RunPython.noop),
+    ]
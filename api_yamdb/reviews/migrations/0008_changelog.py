@@ -0,0 +1,29 @@
+# Generated by Django 3.2 on 2026-10-17 20:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0007_updated_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChangeLog',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('entity', models.CharField(choices=[('title', 'произведение'), ('review', 'отзыв'), ('comment', 'комментарий')], max_length=16, verbose_name='Тип объекта')),
+                ('object_id', models.PositiveBigIntegerField(verbose_name='id объекта')),
+                ('parent_id', models.PositiveBigIntegerField(blank=True, null=True, verbose_name='id родительского объекта')),
+                ('action', models.CharField(choices=[('created', 'создан'), ('updated', 'изменён'), ('deleted', 'удалён'), ('pruned', 'граница очистки')], max_length=16, verbose_name='Действие')),
+                ('changed_at', models.DateTimeField(auto_now_add=True, db_index=True, verbose_name='Дата изменения')),
+            ],
+            options={
+                'verbose_name': 'Запись журнала изменений',
+                'verbose_name_plural': 'Журнал изменений',
+                'ordering': ('id',),
+            },
+        ),
+    ]
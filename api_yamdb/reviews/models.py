@@ -1,9 +1,13 @@
 from django.contrib.auth.models import AbstractUser
 from django.core.validators import MaxValueValidator, MinValueValidator
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Case, F, OuterRef, Subquery, Value, When
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 
-from .constants import ADMIN, MODERATOR, OUTPUT_TEXT_LIMIT, ROLE_CHOICES, USER
+from .batch import WriteBatchMixin, write_batch
+from .constants import (ADMIN, CHANGE_ACTION_CHOICES, ENTITY_CHOICES,
+                        MODERATOR, OUTPUT_TEXT_LIMIT, ROLE_CHOICES, USER)
 from .validators import is_username_valid
 
 
@@ -54,6 +58,11 @@ class User(AbstractUser):
         max_length=36,
         blank=True,
     )
+    updated_at = models.DateTimeField(
+        verbose_name='Дата изменения',
+        auto_now=True,
+        db_index=True,
+    )
 
     class Meta:
         verbose_name = 'Пользователь'
@@ -76,8 +85,14 @@ class User(AbstractUser):
         """Строковое представление объекта."""
         return self.username
 
+    def delete(self, *args, **kwargs):
+        # Каскад удаляет отзывы автора: рейтинги пересчитываются одним
+        # пакетом. Сохранение пакета не требует.
+        with write_batch():
+            return super().delete(*args, **kwargs)
+
 
-class Category(models.Model):
+class Category(WriteBatchMixin, models.Model):
     """ Модель категорий. """
 
     name = models.CharField(
@@ -92,6 +107,11 @@ class Category(models.Model):
         unique=True,
         db_index=True,
     )
+    updated_at = models.DateTimeField(
+        verbose_name='Дата изменения',
+        auto_now=True,
+        db_index=True,
+    )
 
     class Meta:
         verbose_name = 'Категория'
@@ -103,7 +123,7 @@ class Category(models.Model):
         return self.name
 
 
-class Genre(models.Model):
+class Genre(WriteBatchMixin, models.Model):
     """ Модель жанров. """
 
     name = models.CharField(
@@ -119,6 +139,11 @@ class Genre(models.Model):
         unique=True,
         db_index=True,
     )
+    updated_at = models.DateTimeField(
+        verbose_name='Дата изменения',
+        auto_now=True,
+        db_index=True,
+    )
 
     class Meta:
         verbose_name = 'Жанр'
@@ -130,7 +155,7 @@ class Genre(models.Model):
         return self.name
 
 
-class Title(models.Model):
+class Title(WriteBatchMixin, models.Model):
     """ Модель произведений."""
 
     name = models.CharField(
@@ -170,6 +195,27 @@ class Title(models.Model):
         verbose_name='Жанр',
         db_index=True,
     )
+    rating_sum = models.PositiveIntegerField(
+        verbose_name='Сумма оценок',
+        default=0,
+        editable=False,
+    )
+    rating_count = models.PositiveIntegerField(
+        verbose_name='Количество оценок',
+        default=0,
+        editable=False,
+    )
+    rating = models.PositiveSmallIntegerField(
+        verbose_name='Рейтинг',
+        blank=True,
+        null=True,
+        editable=False,
+    )
+    updated_at = models.DateTimeField(
+        verbose_name='Дата изменения',
+        auto_now=True,
+        db_index=True,
+    )
 
     class Meta:
         verbose_name = 'Название произведения'
@@ -180,8 +226,56 @@ class Title(models.Model):
         """Строковое представление объекта."""
         return self.name
 
+    @staticmethod
+    def rating_expression():
+        """Рейтинг как целая часть средней оценки (None без отзывов)."""
+        return Case(
+            When(rating_count=0, then=Value(None)),
+            default=F('rating_sum') / F('rating_count'),
+            output_field=models.PositiveSmallIntegerField(),
+        )
+
+    @classmethod
+    def apply_score_delta(cls, title_id, score_delta, count_delta):
+        """Инкрементальное обновление рейтинга произведения."""
+        titles = cls.objects.filter(pk=title_id)
+        with transaction.atomic(savepoint=False):
+            # update() не заполняет auto_now: рейтинг - часть ответа,
+            # поэтому дата изменения произведения обновляется явно.
+            titles.update(
+                rating_sum=F('rating_sum') + score_delta,
+                rating_count=F('rating_count') + count_delta,
+                updated_at=timezone.now(),
+            )
+            titles.update(rating=cls.rating_expression())
+
+    @classmethod
+    def rebuild_ratings(cls, queryset=None):
+        """Полный пересчёт рейтингов по таблице отзывов."""
+        if queryset is None:
+            queryset = cls.objects.all()
+        reviews = Review.objects.filter(
+            title=OuterRef('pk')
+        ).order_by().values('title')
+        with transaction.atomic():
+            updated = queryset.update(
+                rating_sum=Coalesce(
+                    Subquery(reviews.annotate(
+                        total=models.Sum('score')).values('total')),
+                    0,
+                ),
+                rating_count=Coalesce(
+                    Subquery(reviews.annotate(
+                        total=models.Count('pk')).values('total')),
+                    0,
+                ),
+                updated_at=timezone.now(),
+            )
+            queryset.update(rating=cls.rating_expression())
+        return updated
+
 
-class Review(models.Model):
+class Review(WriteBatchMixin, models.Model):
     """ Модель отзывов."""
 
     title = models.ForeignKey(
@@ -213,6 +307,11 @@ class Review(models.Model):
         ],
         error_messages={'validators': 'Оценка должна быть от 1 до 10'}
     )
+    updated_at = models.DateTimeField(
+        verbose_name='Дата изменения',
+        auto_now=True,
+        db_index=True,
+    )
 
     class Meta:
         verbose_name = 'Отзыв'
@@ -224,13 +323,24 @@ class Review(models.Model):
                 name='one-review-on-one-title'
             )
         ]
+        indexes = [
+            models.Index(
+                fields=['title', '-pub_date', '-id'],
+                name='review-title-pub-date-id',
+            ),
+            # Валидаторы ETag списка отзывов читаются только из индекса.
+            models.Index(
+                fields=['title', 'updated_at'],
+                name='review-title-updated-at',
+            ),
+        ]
 
     def __str__(self) -> str:
         """Строковое представление объекта."""
         return self.text[:OUTPUT_TEXT_LIMIT]
 
 
-class Comments(models.Model):
+class Comments(WriteBatchMixin, models.Model):
     """ Модель комментариев."""
 
     review = models.ForeignKey(
@@ -253,12 +363,122 @@ class Comments(models.Model):
         verbose_name='Дата публикации комментария',
         auto_now_add=True,
     )
+    updated_at = models.DateTimeField(
+        verbose_name='Дата изменения',
+        auto_now=True,
+        db_index=True,
+    )
 
     class Meta:
         verbose_name = 'Комментарий'
         verbose_name_plural = 'Комментарии'
         ordering = ('-pub_date',)
+        indexes = [
+            models.Index(
+                fields=['review', '-pub_date', '-id'],
+                name='comment-review-pub-date-id',
+            ),
+            models.Index(
+                fields=['review', 'updated_at'],
+                name='comment-review-updated-at',
+            ),
+        ]
 
     def __str__(self) -> str:
         """Строковое представление объекта."""
         return self.text[:OUTPUT_TEXT_LIMIT]
+
+
+class EmailOutbox(models.Model):
+    """ Исходящие письма, ожидающие отправки фоновым обработчиком. """
+
+    recipient = models.EmailField(
+        verbose_name='Адрес получателя',
+        max_length=254,
+    )
+    subject = models.CharField(
+        verbose_name='Тема письма',
+        max_length=256,
+    )
+    body = models.TextField(
+        verbose_name='Текст письма',
+    )
+    created = models.DateTimeField(
+        verbose_name='Дата создания',
+        auto_now_add=True,
+    )
+    next_attempt_at = models.DateTimeField(
+        verbose_name='Следующая попытка отправки',
+        default=timezone.now,
+        null=True,
+        blank=True,
+    )
+    attempts = models.PositiveSmallIntegerField(
+        verbose_name='Количество попыток',
+        default=0,
+    )
+    sent_at = models.DateTimeField(
+        verbose_name='Дата отправки',
+        null=True,
+        blank=True,
+    )
+    last_error = models.TextField(
+        verbose_name='Последняя ошибка',
+        blank=True,
+    )
+
+    class Meta:
+        verbose_name = 'Исходящее письмо'
+        verbose_name_plural = 'Исходящие письма'
+        ordering = ('id',)
+        indexes = [
+            models.Index(
+                fields=['sent_at', 'next_attempt_at'],
+                name='outbox-pending',
+            )
+        ]
+
+    def __str__(self) -> str:
+        """Строковое представление объекта."""
+        return f'{self.recipient}: {self.subject}'[:OUTPUT_TEXT_LIMIT]
+
+
+class ChangeLog(models.Model):
+    """
+    Журнал изменений произведений, отзывов и комментариев.
+    id записи - курсор ленты изменений, удаления сохраняются
+    как записи deleted.
+    """
+
+    entity = models.CharField(
+        verbose_name='Тип объекта',
+        max_length=16,
+        choices=ENTITY_CHOICES,
+    )
+    object_id = models.PositiveBigIntegerField(
+        verbose_name='id объекта',
+    )
+    parent_id = models.PositiveBigIntegerField(
+        verbose_name='id родительского объекта',
+        null=True,
+        blank=True,
+    )
+    action = models.CharField(
+        verbose_name='Действие',
+        max_length=16,
+        choices=CHANGE_ACTION_CHOICES,
+    )
+    changed_at = models.DateTimeField(
+        verbose_name='Дата изменения',
+        auto_now_add=True,
+        db_index=True,
+    )
+
+    class Meta:
+        verbose_name = 'Запись журнала изменений'
+        verbose_name_plural = 'Журнал изменений'
+        ordering = ('id',)
+
+    def __str__(self) -> str:
+        """Строковое представление объекта."""
+        return f'{self.entity} {self.object_id}: {self.action}'
@@ -0,0 +1,110 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import connection as db_connection
+from django.db import transaction
+from django.utils import timezone
+
+from .models import EmailOutbox
+
+
+def enqueue_email(recipient, subject, body):
+    """
+    Записывает письмо в очередь в текущей транзакции.
+    При EMAIL_OUTBOX_EAGER письмо отправляется сразу после фиксации.
+    """
+    message = EmailOutbox.objects.create(
+        recipient=recipient, subject=subject, body=body
+    )
+    if settings.EMAIL_OUTBOX_EAGER:
+        transaction.on_commit(
+            lambda: deliver_pending(ids=[message.pk])
+        )
+    return message
+
+
+def retry_delay(attempts):
+    """Экспоненциальная задержка перед повторной отправкой."""
+    delay = settings.EMAIL_OUTBOX_RETRY_DELAY * 2 ** (attempts - 1)
+    return timedelta(seconds=min(delay, settings.EMAIL_OUTBOX_MAX_DELAY))
+
+
+def pending_messages(batch_size, ids=None):
+    queryset = EmailOutbox.objects.filter(
+        sent_at__isnull=True,
+        next_attempt_at__lte=timezone.now(),
+    ).order_by('next_attempt_at', 'id')
+    if ids is not None:
+        queryset = queryset.filter(pk__in=ids)
+    if db_connection.features.has_select_for_update_skip_locked:
+        # Несколько обработчиков не берут одни и те же письма.
+        queryset = queryset.select_for_update(skip_locked=True)
+    return list(queryset[:batch_size])
+
+
+def record_failure(message, error):
+    """Откладывает письмо с задержкой или снимает его с очереди."""
+    message.last_error = repr(error)
+    message.next_attempt_at = None
+    if message.attempts < settings.EMAIL_OUTBOX_MAX_ATTEMPTS:
+        message.next_attempt_at = (
+            timezone.now() + retry_delay(message.attempts)
+        )
+
+
+def send_messages(messages, mail_connection):
+    """
+    Отправка писем через одно соединение.
+    Если почтовый сервер недоступен, попытка засчитывается всем письмам.
+    """
+    for message in messages:
+        message.attempts += 1
+    try:
+        mail_connection.open()
+    except Exception as error:
+        for message in messages:
+            record_failure(message, error)
+        return 0, len(messages)
+    sent = failed = 0
+    try:
+        for message in messages:
+            email = EmailMessage(
+                subject=message.subject,
+                body=message.body,
+                to=[message.recipient],
+                connection=mail_connection,
+            )
+            try:
+                email.send(fail_silently=False)
+            except Exception as error:
+                failed += 1
+                record_failure(message, error)
+            else:
+                sent += 1
+                message.sent_at = timezone.now()
+                message.last_error = ''
+    finally:
+        mail_connection.close()
+    return sent, failed
+
+
+def deliver_pending(batch_size=None, ids=None, mail_connection=None):
+    """
+    Отправка одной пачки писем через общее соединение с почтовым сервером.
+    Неудачные письма откладываются с экспоненциальной задержкой,
+    после EMAIL_OUTBOX_MAX_ATTEMPTS попыток больше не отправляются.
+    Возвращает количество отправленных и неудачных писем.
+    """
+    batch_size = batch_size or settings.EMAIL_OUTBOX_BATCH_SIZE
+    mail_connection = mail_connection or get_connection()
+    with transaction.atomic():
+        messages = pending_messages(batch_size, ids)
+        if not messages:
+            return 0, 0
+        sent, failed = send_messages(messages, mail_connection)
+        EmailOutbox.objects.bulk_update(
+            messages,
+            ('attempts', 'sent_at', 'next_attempt_at', 'last_error'),
+        )
+    return sent, failed
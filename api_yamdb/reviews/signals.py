@@ -0,0 +1,162 @@
+from django.db.models.signals import (m2m_changed, post_delete, post_save,
+                                      pre_delete, pre_save)
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .batch import current_batch
+from .changelog import record_change, record_changes, record_instance
+from .constants import CHANGE_CREATED, CHANGE_DELETED, CHANGE_UPDATED
+from .models import Category, Comments, Genre, Review, Title, User
+
+
+def apply_rating(title_id, score_delta, count_delta):
+    Title.apply_score_delta(title_id, score_delta, count_delta)
+    record_change(Title, title_id, CHANGE_UPDATED)
+
+
+def change_rating(title_id, score_delta, count_delta):
+    """
+    В пакете записи изменения складываются и применяются один раз
+    на произведение, рейтинг удаляемого произведения не меняется.
+    Без пакета (update() и delete() QuerySet) - сразу.
+    """
+    batch = current_batch()
+    if batch is None:
+        apply_rating(title_id, score_delta, count_delta)
+    elif (Title, title_id) not in batch.deleted:
+        batch.accumulate(apply_rating, title_id, score_delta, count_delta)
+
+
+@receiver(pre_delete, sender=Title)
+def remember_deleted_title(sender, instance, **kwargs):
+    """
+    Сигналы pre_delete каскада приходят до post_delete его отзывов:
+    отзывы удаляемого произведения не пересчитывают его рейтинг.
+    """
+    batch = current_batch()
+    if batch is not None:
+        batch.deleted.add((Title, instance.pk))
+
+
+@receiver(pre_save, sender=Review)
+def remember_previous_score(sender, instance, **kwargs):
+    """
+    Запоминает оценку и произведение до изменения отзыва.
+    Строка блокируется до конца транзакции Review.save: иначе два
+    параллельных изменения посчитали бы разницу от одной старой оценки.
+    """
+    instance._previous_score = None
+    if not instance._state.adding and instance.pk is not None:
+        instance._previous_score = Review.objects.select_for_update().filter(
+            pk=instance.pk
+        ).values_list('title_id', 'score').first()
+
+
+@receiver(post_save, sender=Review)
+def update_rating_on_save(sender, instance, created, raw=False, **kwargs):
+    """Учитывает новую или изменённую оценку в рейтинге произведения."""
+    if raw:
+        return
+    previous = getattr(instance, '_previous_score', None)
+    if previous is None:
+        change_rating(instance.title_id, instance.score, 1)
+        return
+    previous_title_id, previous_score = previous
+    if previous_title_id != instance.title_id:
+        change_rating(previous_title_id, -previous_score, -1)
+        change_rating(instance.title_id, instance.score, 1)
+    elif previous_score != instance.score:
+        change_rating(
+            instance.title_id, instance.score - previous_score, 0
+        )
+
+
+@receiver(post_delete, sender=Review)
+def update_rating_on_delete(sender, instance, **kwargs):
+    """Исключает удалённую оценку из рейтинга произведения."""
+    change_rating(instance.title_id, -instance.score, -1)
+
+
+# updated_at меняется при любом изменении представления объекта в API.
+# Связанные поля (категория и жанры произведения, логин автора)
+# обновляются через update() и сигналы, а не через save() объекта.
+
+def touch(queryset):
+    """Обновляет дату изменения строк и записывает их в журнал."""
+    queryset.update(updated_at=timezone.now())
+    record_changes(queryset)
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def touch_titles_on_genres(sender, instance, action, reverse, pk_set,
+                           **kwargs):
+    """Состав жанров - часть представления произведения."""
+    if action not in ('post_add', 'post_remove', 'pre_clear'):
+        return
+    if not reverse:
+        touch(Title.objects.filter(pk=instance.pk))
+    elif action == 'pre_clear':
+        touch(Title.objects.filter(genre=instance))
+    elif pk_set:
+        touch(Title.objects.filter(pk__in=pk_set))
+
+
+@receiver(post_save, sender=Category)
+@receiver(pre_delete, sender=Category)
+def touch_category_titles(sender, instance, created=False, raw=False,
+                          **kwargs):
+    """
+    Переименование или удаление категории меняет её произведения.
+    При удалении связь обнуляется через update() без сигналов,
+    поэтому произведения обновляются до удаления.
+    """
+    if not created and not raw:
+        touch(Title.objects.filter(category=instance))
+
+
+@receiver(post_save, sender=Genre)
+@receiver(pre_delete, sender=Genre)
+def touch_genre_titles(sender, instance, created=False, raw=False,
+                       **kwargs):
+    if not created and not raw:
+        touch(Title.objects.filter(genre=instance))
+
+
+@receiver(pre_save, sender=User)
+def remember_previous_username(sender, instance, update_fields=None,
+                               **kwargs):
+    instance._previous_username = None
+    if update_fields is not None and 'username' not in update_fields:
+        return
+    if not instance._state.adding and instance.pk is not None:
+        instance._previous_username = User.objects.filter(
+            pk=instance.pk
+        ).values_list('username', flat=True).first()
+
+
+@receiver(post_save, sender=User)
+def touch_author_texts(sender, instance, created, raw=False, **kwargs):
+    """Логин автора выводится в отзывах и комментариях."""
+    previous = getattr(instance, '_previous_username', None)
+    if created or raw or previous in (None, instance.username):
+        return
+    touch(Review.objects.filter(author=instance))
+    touch(Comments.objects.filter(author=instance))
+
+
+@receiver(post_save, sender=Title)
+@receiver(post_save, sender=Review)
+@receiver(post_save, sender=Comments)
+def log_saved(sender, instance, created, raw=False, **kwargs):
+    if not raw:
+        record_instance(
+            instance, CHANGE_CREATED if created else CHANGE_UPDATED
+        )
+
+
+@receiver(post_delete, sender=Title)
+@receiver(post_delete, sender=Review)
+@receiver(post_delete, sender=Comments)
+def log_deleted(sender, instance, **kwargs):
+    """Удаление остаётся в журнале записью deleted."""
+    record_instance(instance, CHANGE_DELETED)
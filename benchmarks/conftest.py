@@ -0,0 +1,99 @@
+import json
+import os
+from pathlib import Path
+
+import pytest
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+BENCHMARK_DIR = Path(__file__).resolve().parent
+BASELINE_PATH = BENCHMARK_DIR / 'baseline.json'
+RESULTS_PATH = BENCHMARK_DIR / 'results.json'
+
+# Размер набора данных: BENCHMARK_PRESET=small|medium|large или
+# компактный набор по умолчанию для быстрого прогона.
+DEFAULT_SIZES = {
+    'users': 200, 'categories': 5, 'genres': 20, 'titles': 200,
+    'reviews': 2_000, 'comments': 2_000,
+}
+
+
+def dump(data):
+    return json.dumps(data, indent=2, sort_keys=True) + '\n'
+
+
+def dataset_sizes():
+    from reviews.management.commands.generate_data import PRESETS
+
+    preset = os.environ.get('BENCHMARK_PRESET')
+    return dict(PRESETS[preset]) if preset else dict(DEFAULT_SIZES)
+
+
+@pytest.fixture(scope='session')
+def django_db_setup(django_db_setup, django_db_blocker):
+    from reviews.management.commands.generate_data import generate_data
+
+    with django_db_blocker.unblock():
+        generate_data(**dataset_sizes(), seed=0)
+
+
+@pytest.fixture(scope='session')
+def dataset(django_db_setup, django_db_blocker):
+    """Объекты, к которым обращаются замеры: самые «горячие» записи."""
+    from django.db.models import Count
+
+    from reviews.models import Title, User
+
+    with django_db_blocker.unblock():
+        admin, _ = User.objects.get_or_create(
+            username='benchadmin',
+            defaults={'email': 'benchadmin@yamdb.fake', 'role': 'admin'},
+        )
+        User.objects.filter(pk=admin.pk).update(confirmation_code='bench')
+        title = Title.objects.order_by('-rating_count', 'id').first()
+        review = title.reviews.annotate(
+            comments_count=Count('comments')
+        ).order_by('-comments_count', 'id').first()
+        return {
+            'admin': admin,
+            'user': User.objects.exclude(pk=admin.pk).order_by('id').first(),
+            'title': title,
+            'review': review,
+            'comment': review.comments.order_by('id').first(),
+            'category': title.category,
+            'genre': title.genre.order_by('id').first(),
+        }
+
+
+@pytest.fixture
+def admin_client(dataset):
+    client = APIClient()
+    token = AccessToken.for_user(dataset['admin'])
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+    return client
+
+
+@pytest.fixture(autouse=True)
+def locmem_email(settings):
+    settings.EMAIL_BACKEND = 'django.core.mail.backends.locmem.EmailBackend'
+
+
+@pytest.fixture(scope='session')
+def baseline():
+    if BASELINE_PATH.exists():
+        return json.loads(BASELINE_PATH.read_text(encoding='utf-8'))
+    return {}
+
+
+@pytest.fixture(scope='session')
+def benchmark_results():
+    """Результаты замеров; BENCHMARK_UPDATE_BASELINE=1 обновляет базу."""
+    results = {}
+    yield results
+    RESULTS_PATH.write_text(dump(results), encoding='utf-8')
+    if os.environ.get('BENCHMARK_UPDATE_BASELINE') == '1':
+        updated = {}
+        if BASELINE_PATH.exists():
+            updated = json.loads(BASELINE_PATH.read_text(encoding='utf-8'))
+        updated.update(results)
+        BASELINE_PATH.write_text(dump(updated), encoding='utf-8')
@@ -0,0 +1,158 @@
+import gc
+import os
+from functools import partial
+from statistics import median, quantiles
+from time import perf_counter
+
+import pytest
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+ITERATIONS = int(os.environ.get('BENCHMARK_ITERATIONS', 30))
+# Допустимое относительное ухудшение задержки и размера ответа и
+# абсолютный запас по задержке на шум измерений.
+TOLERANCE = float(os.environ.get('BENCHMARK_TOLERANCE', 0.5))
+LATENCY_SLACK_MS = float(os.environ.get('BENCHMARK_LATENCY_SLACK_MS', 5))
+
+TITLE = '/api/v1/titles/{title.id}/'
+REVIEWS = TITLE + 'reviews/'
+COMMENTS = REVIEWS + '{review.id}/comments/'
+
+# Имя замера, метод, адрес, авторизация администратора, данные запроса.
+ENDPOINTS = (
+    ('users.list', 'get', '/api/v1/users/', True, None),
+    ('users.retrieve', 'get', '/api/v1/users/{user.username}/', True, None),
+    ('users.me', 'get', '/api/v1/users/me/', True, None),
+    ('categories.list', 'get', '/api/v1/categories/', False, None),
+    ('categories.search', 'get',
+     '/api/v1/categories/?search={category.name}', False, None),
+    ('genres.list', 'get', '/api/v1/genres/', False, None),
+    ('genres.search', 'get', '/api/v1/genres/?search={genre.name}',
+     False, None),
+    ('titles.list', 'get', '/api/v1/titles/', False, None),
+    ('titles.list.filtered', 'get',
+     '/api/v1/titles/?genre={genre.slug}&category={category.slug}',
+     False, None),
+    ('titles.retrieve', 'get', TITLE, False, None),
+    ('reviews.list', 'get', REVIEWS, False, None),
+    ('reviews.list.last_page', 'get', REVIEWS + '?page=last', False, None),
+    ('reviews.list.cursor', 'get', REVIEWS + '?pagination=cursor&page_size=50',
+     False, None),
+    ('reviews.retrieve', 'get', REVIEWS + '{review.id}/', False, None),
+    ('comments.list', 'get', COMMENTS, False, None),
+    ('comments.retrieve', 'get', COMMENTS + '{comment.id}/', False, None),
+    ('auth.signup', 'post', '/api/v1/auth/signup/', False,
+     {'username': '{admin.username}', 'email': '{admin.email}'}),
+    ('auth.token', 'post', '/api/v1/auth/token/', False,
+     {'username': '{admin.username}', 'confirmation_code': 'bench'}),
+)
+
+
+# Ответы этих адресов хранятся в кеше ответов (api/caching.py): замер
+# с пустым кешем показывает стоимость ответа, а не чтения из кеша.
+COLD_CACHE_ENDPOINTS = ('categories.', 'genres.', 'titles.')
+
+
+# Повторные запросы клиента с актуальным ETag: ответ 304.
+NOT_MODIFIED_ENDPOINTS = tuple(
+    endpoint for endpoint in ENDPOINTS if endpoint[0] in (
+        'users.list', 'titles.list', 'reviews.list', 'comments.list',
+    )
+)
+
+
+def clear_response_cache():
+    caches[settings.API_RESPONSE_CACHE].clear()
+
+
+def measure(client, method, url, data, setup=None, **headers):
+    """
+    Прогон запроса: задержки в мс, число SQL-запросов и размер ответа.
+    setup выполняется перед каждым замеренным запросом вне замера.
+    """
+    send = partial(getattr(client, method), **headers)
+    response = send(url, data=data)
+    assert response.status_code < 400, (
+        f'Замер `{method.upper()} {url}` вернул статус '
+        f'{response.status_code}.'
+    )
+    timings = []
+    # Как в timeit: сборка мусора не попадает в замер.
+    gc.collect()
+    gc.disable()
+    try:
+        for _ in range(ITERATIONS):
+            if setup is not None:
+                setup()
+            with CaptureQueriesContext(connection) as context:
+                started = perf_counter()
+                response = send(url, data=data)
+                timings.append((perf_counter() - started) * 1000)
+    finally:
+        gc.enable()
+    return {
+        'p50_ms': round(median(timings), 3),
+        'p99_ms': round(quantiles(timings, n=100)[98], 3),
+        'queries': len(context.captured_queries),
+        'bytes': len(response.content),
+    }
+
+
+def check_budget(name, result, budget):
+    assert result['queries'] <= budget['queries'], (
+        f'`{name}`: количество SQL-запросов выросло с '
+        f'{budget["queries"]} до {result["queries"]}.'
+    )
+    # Хвост распределения шумнее медианы, поэтому запас для p99 больше.
+    checks = (
+        ('p50_ms', LATENCY_SLACK_MS),
+        ('p99_ms', 4 * LATENCY_SLACK_MS),
+        ('bytes', 0),
+    )
+    for key, slack in checks:
+        limit = budget[key] * (1 + TOLERANCE) + slack
+        assert result[key] <= limit, (
+            f'`{name}`: значение `{key}` {result[key]} превышает '
+            f'допустимое {limit:.3f}.'
+        )
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    'name,method,url,as_admin,data', ENDPOINTS,
+    ids=[endpoint[0] for endpoint in ENDPOINTS],
+)
+def test_endpoint_budget(name, method, url, as_admin, data, dataset,
+                         admin_client, baseline, benchmark_results):
+    client = admin_client if as_admin else APIClient()
+    url = url.format(**dataset)
+    if data is not None:
+        data = {key: value.format(**dataset) for key, value in data.items()}
+    setup = None
+    if name.startswith(COLD_CACHE_ENDPOINTS):
+        setup = clear_response_cache
+    result = measure(client, method, url, data, setup)
+    benchmark_results[name] = result
+    if name in baseline:
+        check_budget(name, result, baseline[name])
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    'name,method,url,as_admin,data', NOT_MODIFIED_ENDPOINTS,
+    ids=[f'{endpoint[0]}.not_modified' for endpoint in NOT_MODIFIED_ENDPOINTS],
+)
+def test_not_modified_budget(name, method, url, as_admin, data, dataset,
+                             admin_client, baseline, benchmark_results):
+    client = admin_client if as_admin else APIClient()
+    url = url.format(**dataset)
+    etag = getattr(client, method)(url, data=data)['ETag']
+    result = measure(client, method, url, data, HTTP_IF_NONE_MATCH=etag)
+    assert result['bytes'] == 0
+    name = f'{name}.not_modified'
+    benchmark_results[name] = result
+    if name in baseline:
+        check_budget(name, result, baseline[name])
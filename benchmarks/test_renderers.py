@@ -0,0 +1,105 @@
+import gc
+import os
+from statistics import median
+from time import perf_counter
+
+import pytest
+from rest_framework.renderers import JSONRenderer
+
+# Количество объектов в отрисовываемой странице.
+PAGE_SIZE = int(os.environ.get('BENCHMARK_RENDER_PAGE_SIZE', 100))
+ITERATIONS = int(os.environ.get('BENCHMARK_ITERATIONS', 30))
+
+
+def titles_payload():
+    from api.serializers import TitleSerializer
+    from reviews.models import Title
+
+    titles = Title.objects.select_related('category').prefetch_related(
+        'genre'
+    ).order_by('id')[:PAGE_SIZE]
+    return TitleSerializer(titles, many=True).data
+
+
+def reviews_payload():
+    from api.serializers import ReviewSerializer
+    from reviews.models import Review
+
+    reviews = Review.objects.select_related(
+        'title', 'author'
+    ).order_by('id')[:PAGE_SIZE]
+    return ReviewSerializer(reviews, many=True).data
+
+
+def comments_payload():
+    from api.serializers import CommentSerializer
+    from reviews.models import Comments
+
+    comments = Comments.objects.select_related(
+        'review', 'author'
+    ).order_by('id')[:PAGE_SIZE]
+    return CommentSerializer(comments, many=True).data
+
+
+def render_ms(renderer, data):
+    timings = []
+    gc.collect()
+    gc.disable()
+    try:
+        for _ in range(ITERATIONS):
+            started = perf_counter()
+            renderer.render(data)
+            timings.append((perf_counter() - started) * 1000)
+    finally:
+        gc.enable()
+    return round(median(timings), 3)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('name,payload', (
+    ('render.titles', titles_payload),
+    ('render.reviews', reviews_payload),
+))
+def test_fast_json_renderer(name, payload, dataset, benchmark_results):
+    from api.renderers import FastJSONRenderer, orjson
+
+    data = payload()
+    stock, fast = JSONRenderer(), FastJSONRenderer()
+    assert fast.render(data) == stock.render(data), (
+        f'`{name}`: FastJSONRenderer выдаёт другие байты.'
+    )
+    result = {
+        'stock_ms': render_ms(stock, data),
+        'fast_ms': render_ms(fast, data),
+        'bytes': len(stock.render(data)),
+    }
+    benchmark_results[name] = result
+    if orjson is not None:
+        assert result['fast_ms'] <= result['stock_ms'], (
+            f'`{name}`: FastJSONRenderer медленнее JSONRenderer.'
+        )
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('name,payload', (
+    ('msgpack.titles', titles_payload),
+    ('msgpack.reviews', reviews_payload),
+    ('msgpack.comments', comments_payload),
+))
+def test_msgpack_renderer(name, payload, dataset, benchmark_results):
+    from api.renderers import FastJSONRenderer, MessagePackRenderer, msgpack
+
+    if msgpack is None:
+        pytest.skip('msgpack не установлен')
+    data = payload()
+    json_renderer, msgpack_renderer = FastJSONRenderer(), MessagePackRenderer()
+    result = {
+        'json_ms': render_ms(json_renderer, data),
+        'json_bytes': len(json_renderer.render(data)),
+        'msgpack_ms': render_ms(msgpack_renderer, data),
+        'msgpack_bytes': len(msgpack_renderer.render(data)),
+    }
+    benchmark_results[name] = result
+    assert result['msgpack_bytes'] < result['json_bytes'], (
+        f'`{name}`: ответ MessagePack не меньше JSON.'
+    )
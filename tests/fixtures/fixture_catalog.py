@@ -0,0 +1,43 @@
+import pytest
+
+
+@pytest.fixture
+def catalog():
+    """Категории и жанры без произведений."""
+    from reviews.models import Category, Genre
+
+    return {
+        'movie': Category.objects.create(name='Фильм', slug='movie'),
+        'book': Category.objects.create(name='Книга', slug='book'),
+        'drama': Genre.objects.create(name='Драма', slug='drama'),
+        'comedy': Genre.objects.create(name='Комедия', slug='comedy'),
+    }
+
+
+@pytest.fixture
+def title(catalog):
+    from reviews.models import Title
+
+    title = Title.objects.create(
+        name='Произведение', year=2000, category=catalog['movie']
+    )
+    title.genre.set([catalog['drama']])
+    return title
+
+
+@pytest.fixture
+def review(title, admin):
+    from reviews.models import Review
+
+    return Review.objects.create(
+        title=title, author=admin, text='Отзыв', score=7
+    )
+
+
+@pytest.fixture
+def comment(review, admin):
+    from reviews.models import Comments
+
+    return Comments.objects.create(
+        review=review, author=admin, text='Комментарий'
+    )
@@ -0,0 +1,7 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def eager_email(settings):
+    """Письма из очереди отправляются сразу, как в тестах регистрации."""
+    settings.EMAIL_OUTBOX_EAGER = True
@@ -0,0 +1,109 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_reviews
+
+
+@pytest.mark.django_db(transaction=True)
+class Test08TitleRating:
+
+    def get_rating(self, client, title_id):
+        response = client.get(f'/api/v1/titles/{title_id}/')
+        assert response.status_code == HTTPStatus.OK
+        return response.json().get('rating')
+
+    def test_01_rating_follows_review_changes(self, client, admin_client,
+                                              admin, user, user_client):
+        reviews, titles = create_reviews(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        title_id = titles[0]['id']
+        assert self.get_rating(client, title_id) == 5, (
+            'Рейтинг произведения должен учитывать новые отзывы.'
+        )
+
+        url = f'/api/v1/titles/{title_id}/reviews/{reviews[1]["id"]}/'
+        response = user_client.patch(url, data={'score': 10})
+        assert response.status_code == HTTPStatus.OK
+        assert self.get_rating(client, title_id) == 7, (
+            'Рейтинг произведения должен учитывать изменение оценки.'
+        )
+
+        response = user_client.delete(url)
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        assert self.get_rating(client, title_id) == 5, (
+            'Рейтинг произведения должен учитывать удаление отзыва.'
+        )
+
+        url = f'/api/v1/titles/{title_id}/reviews/{reviews[0]["id"]}/'
+        admin_client.delete(url)
+        assert self.get_rating(client, title_id) is None, (
+            'Рейтинг произведения без отзывов должен быть `None`.'
+        )
+
+    def test_02_rebuild_ratings_command(self, client, admin_client, admin,
+                                        user, user_client):
+        from reviews.models import Title
+
+        _, titles = create_reviews(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        title_id = titles[0]['id']
+        Title.objects.update(rating_sum=0, rating_count=0, rating=None)
+        call_command('rebuild_ratings')
+        assert self.get_rating(client, title_id) == 5, (
+            'Команда `rebuild_ratings` должна пересчитывать рейтинг '
+            'произведений по отзывам.'
+        )
+
+    def rating_updates(self, delete):
+        with CaptureQueriesContext(connection) as context:
+            delete()
+        return [
+            query['sql'] for query in context.captured_queries
+            if query['sql'].startswith('UPDATE "reviews_title"')
+        ]
+
+    def test_03_cascade_delete_of_title(self, title, django_user_model):
+        from reviews.models import Review
+
+        for number in range(5):
+            author = django_user_model.objects.create_user(
+                username=f'author-{number}', email=f'author-{number}@ya.ru'
+            )
+            Review.objects.create(
+                title=title, author=author, text='Отзыв', score=number + 1
+            )
+        assert self.rating_updates(title.delete) == [], (
+            'Проверьте, что при удалении произведения его рейтинг '
+            'не пересчитывается по каждому отзыву.'
+        )
+
+    def test_04_cascade_delete_of_author(self, client, catalog, admin,
+                                         user):
+        from reviews.models import Review, Title
+
+        titles = [
+            Title.objects.create(name=f'Произведение {number}', year=2000)
+            for number in range(2)
+        ]
+        for title in titles:
+            Review.objects.create(
+                title=title, author=admin, text='Отзыв', score=2
+            )
+            Review.objects.create(
+                title=title, author=user, text='Отзыв', score=8
+            )
+        updates = self.rating_updates(user.delete)
+        assert len(updates) == 2 * len(titles), (
+            'Проверьте, что при удалении автора рейтинг каждого '
+            'произведения пересчитывается один раз.'
+        )
+        for title in titles:
+            assert self.get_rating(client, title.pk) == 2, (
+                'Рейтинг произведения должен учитывать удаление автора.'
+            )
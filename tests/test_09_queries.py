@@ -0,0 +1,123 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+def count_queries(client, url):
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+    assert response.status_code == HTTPStatus.OK
+    return len(context.captured_queries)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test09QueryCount:
+
+    def create_titles(self, count, genres_per_title):
+        from reviews.models import Category, Genre, Title
+
+        label = f'{count}-{genres_per_title}'
+        category = Category.objects.create(
+            name=f'Категория {label}', slug=f'category-{label}'
+        )
+        genres = [
+            Genre.objects.create(
+                name=f'Жанр {label}-{idx}', slug=f'genre-{label}-{idx}'
+            )
+            for idx in range(genres_per_title)
+        ]
+        for idx in range(count):
+            title = Title.objects.create(
+                name=f'Произведение {idx}', year=2000, category=category
+            )
+            title.genre.set(genres)
+
+    def test_01_title_list_query_count(self, client):
+        from reviews.models import Title
+
+        url = '/api/v1/titles/'
+        self.create_titles(1, 1)
+        small_page = count_queries(client, url)
+        Title.objects.all().delete()
+        self.create_titles(5, 3)
+        full_page = count_queries(client, url)
+        assert small_page == full_page, (
+            f'Проверьте, что GET-запрос к `{url}` выполняет фиксированное '
+            'число SQL-запросов независимо от количества произведений на '
+            'странице и их жанров.'
+        )
+
+    def test_02_title_detail_query_count(self, client):
+        from reviews.models import Title
+
+        self.create_titles(1, 1)
+        title = Title.objects.get()
+        single_genre = count_queries(client, f'/api/v1/titles/{title.id}/')
+        Title.objects.all().delete()
+        self.create_titles(1, 5)
+        title = Title.objects.get()
+        many_genres = count_queries(client, f'/api/v1/titles/{title.id}/')
+        assert single_genre == many_genres, (
+            'Проверьте, что GET-запрос к `/api/v1/titles/{title_id}/` '
+            'выполняет фиксированное число SQL-запросов независимо от '
+            'количества жанров произведения.'
+        )
+
+    def test_03_review_and_comment_list_query_count(self, client):
+        from reviews.models import Comments, Review, Title, User
+
+        title = Title.objects.create(name='Произведение', year=2000)
+        authors = [
+            User.objects.create_user(
+                username=f'author{idx}', email=f'author{idx}@yamdb.fake'
+            )
+            for idx in range(5)
+        ]
+        review = Review.objects.create(
+            title=title, author=authors[0], text='Отзыв 0', score=5
+        )
+        Comments.objects.create(review=review, author=authors[0], text='0')
+        reviews_url = f'/api/v1/titles/{title.id}/reviews/'
+        comments_url = f'{reviews_url}{review.id}/comments/'
+        single_review = count_queries(client, reviews_url)
+        single_comment = count_queries(client, comments_url)
+
+        for idx, author in enumerate(authors[1:], 1):
+            Review.objects.create(
+                title=title, author=author, text=f'Отзыв {idx}', score=idx
+            )
+            Comments.objects.create(
+                review=review, author=author, text=str(idx)
+            )
+        assert count_queries(client, reviews_url) == single_review, (
+            f'Проверьте, что GET-запрос к `{reviews_url}` выполняет '
+            'фиксированное число SQL-запросов независимо от количества '
+            'отзывов на странице.'
+        )
+        assert count_queries(client, comments_url) == single_comment, (
+            f'Проверьте, что GET-запрос к `{comments_url}` выполняет '
+            'фиксированное число SQL-запросов независимо от количества '
+            'комментариев на странице.'
+        )
+
+    def test_04_review_create_reads_title_once(self, user_client):
+        from reviews.models import Title
+
+        title = Title.objects.create(name='Произведение', year=2000)
+        url = f'/api/v1/titles/{title.id}/reviews/'
+        with CaptureQueriesContext(connection) as context:
+            response = user_client.post(url, data={'text': 'Отзыв',
+                                                   'score': 5})
+        assert response.status_code == HTTPStatus.CREATED
+        assert response.json()['title'] == title.name
+        title_reads = [
+            query['sql'] for query in context.captured_queries
+            if query['sql'].startswith('SELECT')
+            and 'FROM "reviews_title"' in query['sql']
+        ]
+        assert len(title_reads) == 1, (
+            f'Проверьте, что POST-запрос к `{url}` читает произведение '
+            'один раз.'
+        )
@@ -0,0 +1,140 @@
+from http import HTTPStatus
+
+import pytest
+
+
+@pytest.mark.django_db(transaction=True)
+class Test10KeysetPagination:
+
+    def create_reviews(self, count):
+        from reviews.models import Review, Title, User
+
+        title = Title.objects.create(name='Произведение', year=2000)
+        for idx in range(count):
+            author = User.objects.create_user(
+                username=f'author{idx}', email=f'author{idx}@yamdb.fake'
+            )
+            Review.objects.create(
+                title=title, author=author, text=f'Отзыв {idx}', score=5
+            )
+        return title
+
+    def get(self, client, url):
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{url}` возвращает ответ со '
+            'статусом 200.'
+        )
+        return response.json()
+
+    def test_01_cursor_walk(self, client):
+        from reviews.models import Review
+
+        title = self.create_reviews(7)
+        expected = list(
+            Review.objects.order_by('-pub_date', '-id')
+            .values_list('id', flat=True)
+        )
+        url = (f'/api/v1/titles/{title.id}/reviews/'
+               '?pagination=cursor&page_size=3')
+        data = self.get(client, url)
+        assert 'count' not in data and data['previous'] is None, (
+            'В режиме курсора ответ не должен содержать `count`, а у первой '
+            'страницы не должно быть ссылки `previous`.'
+        )
+        pages = [data]
+        while data['next']:
+            data = self.get(client, data['next'])
+            pages.append(data)
+        ids = [item['id'] for page in pages for item in page['results']]
+        assert ids == expected, (
+            'Проверьте, что курсорная пагинация отдаёт все отзывы по '
+            'порядку `-pub_date`, `-id` без пропусков и повторов.'
+        )
+
+        data = self.get(client, pages[-1]['previous'])
+        assert [item['id'] for item in data['results']] == expected[3:6], (
+            'Проверьте, что ссылка `previous` в режиме курсора ведёт на '
+            'предыдущую страницу.'
+        )
+
+    def test_02_page_size_limit(self, client, settings):
+        settings.CURSOR_PAGINATION_MAX_PAGE_SIZE = 4
+        title = self.create_reviews(6)
+        url = (f'/api/v1/titles/{title.id}/reviews/'
+               '?pagination=cursor&page_size=100')
+        data = self.get(client, url)
+        assert len(data['results']) == 4, (
+            'Размер страницы в режиме курсора не должен превышать '
+            '`CURSOR_PAGINATION_MAX_PAGE_SIZE`.'
+        )
+
+    def test_03_invalid_cursor(self, client):
+        title = self.create_reviews(1)
+        response = client.get(
+            f'/api/v1/titles/{title.id}/reviews/?cursor=broken'
+        )
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+@pytest.mark.django_db(transaction=True)
+class Test10TitlePagination:
+
+    def create_titles(self, count):
+        from reviews.models import Title
+
+        for idx in range(count):
+            Title.objects.create(name=f'Произведение {idx}', year=2000)
+
+    def test_01_without_count(self, client):
+        self.create_titles(6)
+        url = '/api/v1/titles/?count=none'
+        data = client.get(url).json()
+        assert data['count'] is None and len(data['results']) == 5, (
+            f'Проверьте, что GET-запрос к `{url}` не считает общее '
+            'количество произведений и возвращает полную страницу.'
+        )
+        assert data['next'] and data['previous'] is None
+        data = client.get(data['next']).json()
+        assert len(data['results']) == 1 and data['next'] is None
+        assert data['previous']
+
+    def test_02_cached_count(self, client, admin_client):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        self.create_titles(2)
+        url = '/api/v1/titles/?year=2000'
+        assert client.get(url).json()['count'] == 2
+        with CaptureQueriesContext(connection) as context:
+            assert client.get(url).json()['count'] == 2
+        assert not any(
+            'COUNT(' in query['sql'] for query in context.captured_queries
+        ), (
+            'Проверьте, что количество произведений для одинаковых фильтров '
+            'берётся из кеша.'
+        )
+        self.create_titles(1)
+        assert client.get(url).json()['count'] == 3, (
+            'Проверьте, что кешированное количество произведений '
+            'сбрасывается при изменении каталога.'
+        )
+
+    def test_03_count_version_eviction(self, client):
+        from api.caching import RESPONSE_VERSION_KEY, response_cache
+
+        def evict_version():
+            response_cache().delete(
+                RESPONSE_VERSION_KEY.format('reviews.title')
+            )
+
+        url = '/api/v1/titles/?year=2000'
+        self.create_titles(2)
+        evict_version()
+        assert client.get(url).json()['count'] == 2
+        self.create_titles(1)
+        evict_version()
+        assert client.get(url).json()['count'] == 3, (
+            'Проверьте, что после вытеснения версии из кеша не возвращается '
+            'сохранённое ранее количество произведений.'
+        )
@@ -0,0 +1,148 @@
+import csv
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from tests.conftest import MANAGE_PATH
+
+DATA_DIR = f'{MANAGE_PATH}/static/data'
+
+
+def csv_rows(filename):
+    with open(f'{DATA_DIR}/{filename}', encoding='utf-8', newline='') as f:
+        return sum(1 for _ in csv.DictReader(f))
+
+
+@pytest.mark.django_db(transaction=True)
+class Test11DataCommands:
+
+    def test_01_import_csv(self):
+        from reviews.models import Comments, Review, Title, User
+
+        call_command('test_data_db', batch_size=10, workers=2)
+        stdout = StringIO()
+        call_command('test_data_db', batch_size=10, workers=1, stdout=stdout)
+        report = stdout.getvalue()
+        assert 'review.csv: 0 строк, пропущено ' in report, (
+            'Проверьте, что уже загруженные строки не считаются '
+            'загруженными повторно.'
+        )
+        assert User.objects.count() == csv_rows('users.csv')
+        assert Title.objects.count() == csv_rows('titles.csv')
+        assert Review.objects.count() == csv_rows('review.csv'), (
+            'Проверьте, что повторная загрузка не создаёт дубликатов.'
+        )
+        assert Comments.objects.count() == csv_rows('comments.csv')
+        assert (
+            Title.genre.through.objects.count() == csv_rows('genre_title.csv')
+        )
+        review = Review.objects.get(pk=1)
+        assert review.pub_date.year == 2019, (
+            'Проверьте, что дата публикации отзыва берётся из файла.'
+        )
+        title = review.title
+        scores = list(title.reviews.values_list('score', flat=True))
+        assert title.rating == sum(scores) // len(scores), (
+            'Проверьте, что после загрузки рейтинги произведений '
+            'пересчитываются.'
+        )
+
+    def clear_database(self):
+        from reviews.models import Category, Genre, Title, User
+
+        for model in (User, Title, Category, Genre):
+            model.objects.all().delete()
+
+    def read_files(self, path):
+        return {item.name: item.read_bytes() for item in path.iterdir()}
+
+    def test_02_export_round_trip(self, tmp_path):
+        from reviews.models import Review
+
+        call_command('test_data_db', workers=1)
+        csv_dir, ndjson_dir = tmp_path / 'csv', tmp_path / 'ndjson'
+        call_command('export_data', path=str(csv_dir), chunk_size=10)
+        call_command(
+            'export_data', path=str(ndjson_dir), format='ndjson', gzip=True
+        )
+        exported = self.read_files(csv_dir)
+        assert sorted(exported) == [
+            'category.csv', 'comments.csv', 'genre.csv', 'genre_title.csv',
+            'review.csv', 'titles.csv', 'users.csv',
+        ]
+        reviews_count = Review.objects.count()
+        assert exported['review.csv'].count(b'\n') >= reviews_count + 1
+
+        for source in (csv_dir, ndjson_dir):
+            self.clear_database()
+            call_command('test_data_db', path=str(source), workers=1)
+            result_dir = tmp_path / f'result-{source.name}'
+            call_command('export_data', path=str(result_dir))
+            assert self.read_files(result_dir) == exported, (
+                'Проверьте, что выгруженные файлы загружаются командой '
+                '`test_data_db` без изменений.'
+            )
+
+    def generated_reviews(self):
+        from reviews.models import Review
+
+        return list(Review.objects.order_by('id').values_list(
+            'title__name', 'author__username', 'score', 'text', 'pub_date'
+        ))
+
+    def test_03_generate_data(self):
+        from reviews.models import Comments, Review, Title, User
+
+        sizes = {
+            'users': 20, 'categories': 2, 'genres': 5, 'titles': 10,
+            'reviews': 50, 'comments': 50,
+        }
+        call_command('generate_data', seed=7, **sizes)
+        assert User.objects.count() == 20 and Title.objects.count() == 10
+        assert Review.objects.exists() and Comments.objects.exists()
+        title = Title.objects.filter(rating_count__gt=0).first()
+        assert title.rating_count == title.reviews.count(), (
+            'Проверьте, что после генерации данных рейтинги пересчитаны.'
+        )
+        first_run = self.generated_reviews()
+
+        self.clear_database()
+        call_command('generate_data', seed=7, **sizes)
+        assert self.generated_reviews() == first_run, (
+            'Проверьте, что генерация с одинаковым `seed` воспроизводима.'
+        )
+
+    def test_04_parallel_parse_window(self):
+        from concurrent.futures import Future
+
+        from reviews.management.commands.test_data_db import (
+            parse_in_parallel, parse_rows)
+
+        class Executor:
+            def __init__(self):
+                self.futures = []
+
+            def submit(self, function, *args):
+                future = Future()
+                future.set_result(function(*args))
+                self.futures.append(future)
+                return future
+
+        executor = Executor()
+        consumed = []
+
+        def batches():
+            for number in range(10):
+                # Блок читается, только когда освободилось место в окне.
+                assert len(executor.futures) - len(consumed) < 3
+                yield [{'id': str(number)}]
+
+        for batch in parse_in_parallel(
+            executor, batches(), lambda row: int(row['id']), window=3
+        ):
+            consumed.append(batch)
+        assert consumed == [[number] for number in range(10)], (
+            'Проверьте, что блоки разбираются с сохранением порядка.'
+        )
+        assert parse_rows([{}], lambda row: int(row['id'])) == [None]
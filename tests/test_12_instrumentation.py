@@ -0,0 +1,78 @@
+import logging
+
+import pytest
+
+
+@pytest.fixture
+def timing_log(caplog):
+    logger = logging.getLogger('api_yamdb.timing')
+    logger.addHandler(caplog.handler)
+    with caplog.at_level(logging.INFO, logger='api_yamdb.timing'):
+        yield caplog
+    logger.removeHandler(caplog.handler)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test12ServerTiming:
+
+    def test_01_disabled_by_default(self, client):
+        response = client.get('/api/v1/titles/')
+        assert not response.has_header('Server-Timing'), (
+            'Заголовок `Server-Timing` не должен добавляться, если '
+            '`API_TIMING_ENABLED` выключен.'
+        )
+
+    def test_02_server_timing(self, client, settings, timing_log):
+        from reviews.models import Title
+
+        settings.API_TIMING_ENABLED = True
+        title = Title.objects.create(name='Произведение', year=2000)
+        response = client.get('/api/v1/titles/')
+        header = response.get('Server-Timing', '')
+        for metric in ('db;dur=', 'app;dur=', 'render;dur=', 'total;dur='):
+            assert metric in header, (
+                f'Проверьте, что заголовок `Server-Timing` содержит `{metric}`.'
+            )
+        assert 'queries' in header
+
+        client.get(f'/api/v1/titles/{title.id}/reviews/')
+        messages = [record.getMessage() for record in timing_log.records]
+        assert any('view=TitleViewSet.list' in m for m in messages), (
+            'Проверьте, что в лог пишется имя вьюсета и действия.'
+        )
+        assert any('view=ReviewViewSet.list' in m for m in messages)
+
+    def test_03_only_api_requests(self, client, settings):
+        settings.API_TIMING_ENABLED = True
+        response = client.get('/redoc/')
+        assert not response.has_header('Server-Timing')
+
+
+@pytest.mark.django_db(transaction=True)
+class Test12Profiling:
+
+    def test_01_sampled_profiles(self, client, settings, tmp_path):
+        from io import StringIO
+
+        from django.core.management import call_command
+
+        settings.API_PROFILING_VIEWS = ('TitleViewSet.list',)
+        settings.API_PROFILING_RATE = 1.0
+        settings.API_PROFILING_DIR = tmp_path
+        settings.API_PROFILING_MAX_FILES = 2
+        for _ in range(3):
+            client.get('/api/v1/titles/?year=2000')
+        client.get('/api/v1/genres/')
+
+        profiles = sorted(tmp_path.glob('*.prof'))
+        assert len(profiles) == 2, (
+            'Проверьте, что профили сохраняются только для выбранного вида '
+            'и старые файлы удаляются.'
+        )
+        meta = profiles[0].with_suffix('.json').read_text(encoding='utf-8')
+        assert '"query": {"year": "2000"}' in meta
+
+        out = StringIO()
+        call_command('profile_report', path=str(tmp_path), top=5, stdout=out)
+        assert 'TitleViewSet.list' in out.getvalue()
+        assert 'function calls' in out.getvalue()
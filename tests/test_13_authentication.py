@@ -0,0 +1,108 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+
+def claims_client(user, age=0):
+    from api.authentication import ClaimsAccessToken
+
+    client = APIClient()
+    token = ClaimsAccessToken.for_user(user)
+    token.set_iat(at_time=token.current_time - timedelta(seconds=age))
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+    return client
+
+
+def user_queries(context):
+    return [
+        query['sql'] for query in context.captured_queries
+        if 'reviews_user' in query['sql']
+    ]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test13ClaimsAuthentication:
+
+    def test_01_token_contains_claims(self, client, user):
+        from rest_framework_simplejwt.tokens import AccessToken
+
+        user.confirmation_code = 'code'
+        user.save()
+        response = client.post(
+            '/api/v1/auth/token/',
+            data={'username': user.username, 'confirmation_code': 'code'}
+        )
+        assert response.status_code == HTTPStatus.OK
+        token = AccessToken(response.json()['token'])
+        assert token['username'] == user.username
+        assert token['role'] == user.role
+        assert token['is_superuser'] is False
+
+    def test_02_no_user_query(self, admin):
+        client = claims_client(admin)
+        with CaptureQueriesContext(connection) as context:
+            response = client.post(
+                '/api/v1/categories/', data={'name': 'Фильм', 'slug': 'film'}
+            )
+        assert response.status_code == HTTPStatus.CREATED
+        assert not user_queries(context), (
+            'Проверьте, что права пользователя берутся из токена без '
+            'запроса к таблице пользователей.'
+        )
+
+    def test_03_role_change_invalidates_claims(self, admin):
+        client = claims_client(admin)
+        data = {'name': 'Фильм', 'slug': 'film'}
+        assert client.post('/api/v1/categories/', data=data).status_code == (
+            HTTPStatus.CREATED
+        )
+        admin.role = 'user'
+        admin.save()
+        data = {'name': 'Книга', 'slug': 'book'}
+        response = client.post('/api/v1/categories/', data=data)
+        assert response.status_code == HTTPStatus.FORBIDDEN, (
+            'Проверьте, что после смены роли права из ранее выданного '
+            'токена больше не действуют.'
+        )
+
+    def test_04_deleted_user_rejected(self, user):
+        client = claims_client(user)
+        user.delete()
+        response = client.get('/api/v1/users/me/')
+        assert response.status_code == HTTPStatus.UNAUTHORIZED
+
+    def test_05_profile_uses_database(self, user):
+        client = claims_client(user)
+        response = client.get('/api/v1/users/me/')
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['email'] == user.email
+
+    def test_06_claims_expire_without_cache(self, settings, admin):
+        from django.core.cache import cache
+
+        client = claims_client(
+            admin, age=settings.JWT_USER_CACHE_TIMEOUT + 1
+        )
+        data = {'name': 'Фильм', 'slug': 'film'}
+        assert client.post('/api/v1/categories/', data=data).status_code == (
+            HTTPStatus.CREATED
+        )
+        admin.role = 'user'
+        admin.save()
+        # Так выглядит другой процесс или вытеснение записей из кеша.
+        cache.clear()
+        data = {'name': 'Книга', 'slug': 'book'}
+        response = client.post('/api/v1/categories/', data=data)
+        assert response.status_code == HTTPStatus.FORBIDDEN, (
+            'Проверьте, что права из токена старше JWT_USER_CACHE_TIMEOUT '
+            'проверяются по базе, даже если кеш пуст.'
+        )
+
+        admin.delete()
+        cache.clear()
+        response = client.post('/api/v1/categories/', data=data)
+        assert response.status_code == HTTPStatus.UNAUTHORIZED
@@ -0,0 +1,145 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.core import mail
+from django.core.mail.backends.base import BaseEmailBackend
+from django.core.management import call_command
+from django.utils import timezone
+
+SIGNUP_URL = '/api/v1/auth/signup/'
+
+
+class FailingBackend(BaseEmailBackend):
+    """Почтовый сервер, который не принимает письма."""
+
+    def send_messages(self, email_messages):
+        raise ConnectionError('SMTP недоступен')
+
+
+class UnreachableBackend(BaseEmailBackend):
+    """Почтовый сервер, к которому не удаётся подключиться."""
+
+    def open(self):
+        raise ConnectionRefusedError('SMTP не отвечает')
+
+    def send_messages(self, email_messages):
+        raise AssertionError('Письма не отправляются без соединения.')
+
+
+def signup(client, username='outbox'):
+    return client.post(SIGNUP_URL, data={
+        'username': username, 'email': f'{username}@yamdb.fake',
+    })
+
+
+@pytest.mark.django_db(transaction=True)
+class Test14EmailOutbox:
+
+    def test_01_signup_enqueues_email(self, client, settings):
+        from reviews.models import EmailOutbox, User
+
+        settings.EMAIL_OUTBOX_EAGER = False
+        response = signup(client)
+        assert response.status_code == HTTPStatus.OK
+        assert len(mail.outbox) == 0, (
+            'Проверьте, что регистрация не отправляет письмо синхронно, '
+            'а записывает его в очередь.'
+        )
+        message = EmailOutbox.objects.get()
+        user = User.objects.get(username='outbox')
+        assert message.recipient == 'outbox@yamdb.fake'
+        assert user.confirmation_code in message.body, (
+            'Проверьте, что код подтверждения сохраняется у пользователя '
+            'и попадает в письмо.'
+        )
+
+    def test_02_send_outbox_delivers_pending(self, client, settings):
+        from reviews.models import EmailOutbox
+
+        settings.EMAIL_OUTBOX_EAGER = False
+        signup(client, 'first')
+        signup(client, 'second')
+        call_command('send_outbox')
+        assert sorted(email.to[0] for email in mail.outbox) == [
+            'first@yamdb.fake', 'second@yamdb.fake'
+        ]
+        assert not EmailOutbox.objects.filter(sent_at__isnull=True).exists()
+        call_command('send_outbox')
+        assert len(mail.outbox) == 2, (
+            'Проверьте, что отправленные письма не отправляются повторно.'
+        )
+
+    def test_03_filebased_backend(self, client, settings, tmp_path):
+        settings.EMAIL_OUTBOX_EAGER = False
+        settings.EMAIL_BACKEND = (
+            'django.core.mail.backends.filebased.EmailBackend'
+        )
+        settings.EMAIL_FILE_PATH = tmp_path
+        signup(client)
+        call_command('send_outbox')
+        files = list(tmp_path.iterdir())
+        assert len(files) == 1
+        assert 'outbox@yamdb.fake' in files[0].read_text()
+
+    def test_04_retry_with_backoff(self, client, settings):
+        from reviews.models import EmailOutbox
+        from reviews.outbox import deliver_pending
+
+        settings.EMAIL_OUTBOX_EAGER = False
+        settings.EMAIL_OUTBOX_MAX_ATTEMPTS = 2
+        settings.EMAIL_BACKEND = f'{__name__}.FailingBackend'
+        signup(client)
+        started = timezone.now()
+        assert deliver_pending() == (0, 1)
+        message = EmailOutbox.objects.get()
+        assert message.attempts == 1
+        assert 'SMTP' in message.last_error
+        assert message.next_attempt_at >= started + timedelta(
+            seconds=settings.EMAIL_OUTBOX_RETRY_DELAY
+        ), 'Проверьте, что неудачное письмо откладывается.'
+        assert deliver_pending() == (0, 0)
+
+        EmailOutbox.objects.update(next_attempt_at=started)
+        assert deliver_pending() == (0, 1)
+        message.refresh_from_db()
+        assert message.attempts == 2
+        assert message.next_attempt_at is None, (
+            'Проверьте, что после EMAIL_OUTBOX_MAX_ATTEMPTS попыток письмо '
+            'больше не отправляется.'
+        )
+
+        settings.EMAIL_BACKEND = (
+            'django.core.mail.backends.locmem.EmailBackend'
+        )
+        EmailOutbox.objects.update(next_attempt_at=started)
+        assert deliver_pending() == (1, 0)
+        message.refresh_from_db()
+        assert message.sent_at is not None
+        assert message.last_error == ''
+
+    def test_05_eager_delivery_after_commit(self, client):
+        from reviews.models import EmailOutbox
+
+        signup(client)
+        assert len(mail.outbox) == 1
+        assert EmailOutbox.objects.get().sent_at is not None
+
+    def test_06_mail_server_outage(self, client, settings):
+        from reviews.models import EmailOutbox
+
+        settings.EMAIL_OUTBOX_EAGER = False
+        signup(client, 'first')
+        signup(client, 'second')
+        settings.EMAIL_BACKEND = f'{__name__}.UnreachableBackend'
+        started = timezone.now()
+        call_command('send_outbox')
+        for message in EmailOutbox.objects.all():
+            assert message.attempts == 1, (
+                'Проверьте, что недоступность почтового сервера '
+                'засчитывается как попытка отправки.'
+            )
+            assert 'SMTP' in message.last_error
+            assert message.next_attempt_at >= started + timedelta(
+                seconds=settings.EMAIL_OUTBOX_RETRY_DELAY
+            ), 'Проверьте, что письма откладываются до следующей попытки.'
@@ -0,0 +1,116 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+BULK_URL = '/api/v1/users/bulk/'
+
+
+def users_data(count, prefix='bulk'):
+    return [
+        {'username': f'{prefix}{index}',
+         'email': f'{prefix}{index}@yamdb.fake'}
+        for index in range(count)
+    ]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test15BulkUsers:
+
+    def test_01_bulk_create(self, admin_client, django_user_model):
+        data = users_data(3)
+        data[1]['role'] = 'moderator'
+        response = admin_client.post(BULK_URL, data=data, format='json')
+        assert response.status_code == HTTPStatus.CREATED
+        results = response.json()['results']
+        assert [result['status'] for result in results] == ['created'] * 3
+        assert results[1]['data']['role'] == 'moderator'
+        assert django_user_model.objects.filter(
+            username__startswith='bulk'
+        ).count() == 3
+
+    def test_02_per_item_errors(self, admin_client, admin, django_user_model):
+        data = users_data(2) + [
+            {'username': admin.username, 'email': 'new@yamdb.fake'},
+            {'username': 'bulk0', 'email': 'other@yamdb.fake'},
+            {'username': 'noemail'},
+            {'username': 'badrole', 'email': 'badrole@yamdb.fake',
+             'role': 'owner'},
+        ]
+        response = admin_client.post(BULK_URL, data=data, format='json')
+        assert response.status_code == HTTPStatus.CREATED
+        results = response.json()['results']
+        assert [result['status'] for result in results] == [
+            'created', 'created', 'error', 'error', 'error', 'error'
+        ], 'Проверьте, что результат возвращается для каждого элемента.'
+        assert 'username' in results[2]['errors']
+        assert 'username' in results[3]['errors'], (
+            'Проверьте, что повтор логина внутри пакета - ошибка.'
+        )
+        assert 'email' in results[4]['errors']
+        assert 'role' in results[5]['errors']
+        assert not django_user_model.objects.filter(
+            username__in=('noemail', 'badrole')
+        ).exists()
+
+    def test_03_nothing_created(self, admin_client, admin):
+        data = [{'username': admin.username, 'email': admin.email}]
+        response = admin_client.post(BULK_URL, data=data, format='json')
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert response.json()['results'][0]['status'] == 'error'
+
+    def test_04_invalid_body(self, admin_client, settings):
+        settings.API_BULK_MAX_SIZE = 2
+        assert admin_client.post(
+            BULK_URL, data={'username': 'x'}, format='json'
+        ).status_code == HTTPStatus.BAD_REQUEST
+        assert admin_client.post(
+            BULK_URL, data=users_data(3), format='json'
+        ).status_code == HTTPStatus.BAD_REQUEST
+
+    def test_05_permissions(self, user_client, moderator_client):
+        data = users_data(1)
+        assert APIClient().post(
+            BULK_URL, data=data, format='json'
+        ).status_code == HTTPStatus.UNAUTHORIZED
+        for role_client in (user_client, moderator_client):
+            assert role_client.post(
+                BULK_URL, data=data, format='json'
+            ).status_code == HTTPStatus.FORBIDDEN
+
+    def test_06_queries_do_not_grow(self, admin_client):
+        counts = []
+        # Первый запрос кеширует права администратора.
+        admin_client.post(BULK_URL, data=users_data(1, 'warm'), format='json')
+        for size, prefix in ((5, 'small'), (50, 'large')):
+            with CaptureQueriesContext(connection) as context:
+                response = admin_client.post(
+                    BULK_URL, data=users_data(size, prefix), format='json'
+                )
+            assert response.status_code == HTTPStatus.CREATED
+            counts.append(len(context))
+        assert counts[0] == counts[1], (
+            'Проверьте, что количество запросов не зависит от размера '
+            'пакета.'
+        )
+
+    def test_07_rejected_item_keeps_values_free(self, admin_client, admin,
+                                                django_user_model):
+        data = [
+            {'username': 'fresh', 'email': admin.email},
+            {'username': 'fresh', 'email': 'fresh@yamdb.fake'},
+        ]
+        response = admin_client.post(BULK_URL, data=data, format='json')
+        assert response.status_code == HTTPStatus.CREATED
+        results = response.json()['results']
+        assert [result['status'] for result in results] == [
+            'error', 'created'
+        ], (
+            'Проверьте, что отклонённый элемент не занимает логин '
+            'для следующих элементов пакета.'
+        )
+        assert django_user_model.objects.filter(
+            username='fresh', email='fresh@yamdb.fake'
+        ).exists()
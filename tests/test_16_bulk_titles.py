@@ -0,0 +1,125 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+BULK_URL = '/api/v1/titles/bulk/'
+
+
+def titles_data(count, prefix='Произведение'):
+    return [
+        {'name': f'{prefix} {index}', 'year': 2000, 'category': 'movie',
+         'genre': ['drama', 'comedy']}
+        for index in range(count)
+    ]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test16BulkTitles:
+
+    def test_01_bulk_create(self, admin_client, catalog):
+        from reviews.models import Title
+
+        response = admin_client.post(
+            BULK_URL, data=titles_data(3), format='json'
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        results = response.json()['results']
+        assert [result['status'] for result in results] == ['created'] * 3
+        data = results[0]['data']
+        assert data['category'] == 'movie'
+        assert sorted(data['genre']) == ['comedy', 'drama']
+        title = Title.objects.get(pk=data['id'])
+        assert title.name == 'Произведение 0'
+        assert set(title.genre.values_list('slug', flat=True)) == {
+            'drama', 'comedy'
+        }
+        new = admin_client.post(
+            '/api/v1/titles/', data=titles_data(1, 'Одиночное')[0],
+            format='json'
+        )
+        assert new.status_code == HTTPStatus.CREATED, (
+            'Проверьте, что после пакетной загрузки одиночное создание '
+            'получает свободный id.'
+        )
+
+    def test_02_bulk_update(self, admin_client, catalog):
+        from reviews.models import Title
+
+        created = admin_client.post(
+            BULK_URL, data=titles_data(2), format='json'
+        ).json()['results']
+        first, second = (result['data']['id'] for result in created)
+        response = admin_client.post(BULK_URL, data=[
+            {'id': first, 'name': 'Новое имя'},
+            {'id': second, 'category': 'book', 'genre': ['comedy']},
+            {'name': 'Третье', 'year': 2001, 'category': 'book',
+             'genre': ['drama']},
+        ], format='json')
+        assert response.status_code == HTTPStatus.CREATED
+        assert [result['status'] for result in response.json()['results']] == [
+            'updated', 'updated', 'created'
+        ]
+        title = Title.objects.get(pk=first)
+        assert title.name == 'Новое имя'
+        assert title.category.slug == 'movie'
+        assert title.genre.count() == 2
+        title = Title.objects.get(pk=second)
+        assert title.name == 'Произведение 1'
+        assert title.category.slug == 'book'
+        assert list(title.genre.values_list('slug', flat=True)) == ['comedy']
+
+    def test_03_per_item_errors(self, admin_client, catalog):
+        from reviews.models import Title
+
+        data = titles_data(1) + [
+            {'name': 'Без жанра', 'year': 2000, 'category': 'movie'},
+            {'name': 'Чужая категория', 'year': 2000, 'category': 'music',
+             'genre': ['drama']},
+            {'name': 'Чужой жанр', 'year': 2000, 'category': 'movie',
+             'genre': ['horror']},
+            {'name': 'Будущее', 'year': 3000, 'category': 'movie',
+             'genre': ['drama']},
+            {'id': 100500, 'name': 'Нет такого'},
+        ]
+        response = admin_client.post(BULK_URL, data=data, format='json')
+        assert response.status_code == HTTPStatus.CREATED
+        results = response.json()['results']
+        assert [result['status'] for result in results] == (
+            ['created'] + ['error'] * 5
+        ), 'Проверьте, что результат возвращается для каждого элемента.'
+        for result, field in zip(
+            results[1:], ('genre', 'category', 'genre', 'year', 'id')
+        ):
+            assert field in result['errors']
+        assert Title.objects.count() == 1
+
+    def test_04_permissions(self, user_client, catalog):
+        response = user_client.post(
+            BULK_URL, data=titles_data(1), format='json'
+        )
+        assert response.status_code == HTTPStatus.FORBIDDEN
+
+    def test_05_queries_do_not_grow(self, admin_client, catalog):
+        admin_client.post(BULK_URL, data=titles_data(1, 'Прогрев'),
+                          format='json')
+        counts = []
+        for size in (5, 50):
+            with CaptureQueriesContext(connection) as context:
+                response = admin_client.post(
+                    BULK_URL, data=titles_data(size), format='json'
+                )
+            assert response.status_code == HTTPStatus.CREATED
+            counts.append(len(context))
+        assert counts[0] == counts[1], (
+            'Проверьте, что количество запросов не зависит от размера '
+            'пакета.'
+        )
+
+    def test_06_count_cache_invalidated(self, admin_client, catalog):
+        assert admin_client.get('/api/v1/titles/').json()['count'] == 0
+        admin_client.post(BULK_URL, data=titles_data(2), format='json')
+        assert admin_client.get('/api/v1/titles/').json()['count'] == 2, (
+            'Проверьте, что пакетная загрузка сбрасывает кеш количества.'
+        )
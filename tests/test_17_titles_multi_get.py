@@ -0,0 +1,73 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+BULK_URL = '/api/v1/titles/bulk/'
+
+
+@pytest.fixture
+def titles(catalog):
+    from reviews.models import Title
+
+    result = []
+    for index in range(5):
+        title = Title.objects.create(
+            name=f'Произведение {index}', year=2000,
+            category=catalog['movie'],
+        )
+        title.genre.set([catalog['drama'], catalog['comedy']])
+        result.append(title)
+    return result
+
+
+@pytest.mark.django_db(transaction=True)
+class Test17TitlesMultiGet:
+
+    def test_01_requested_order(self, client, titles):
+        ids = [titles[3].pk, titles[0].pk, titles[4].pk]
+        response = client.get(
+            BULK_URL, {'ids': ','.join(map(str, ids))}
+        )
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        assert [item['id'] for item in data['results']] == ids, (
+            'Проверьте, что произведения возвращаются в порядке id запроса.'
+        )
+        assert data['missing'] == []
+        item = data['results'][0]
+        assert item['category'] == {'name': 'Фильм', 'slug': 'movie'}
+        assert len(item['genre']) == 2
+        assert 'rating' in item
+
+    def test_02_missing_ids(self, client, titles):
+        response = client.get(
+            BULK_URL, {'ids': f'{titles[1].pk},100500,{titles[1].pk}'}
+        )
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        assert [item['id'] for item in data['results']] == [titles[1].pk]
+        assert data['missing'] == [100500], (
+            'Проверьте, что ненайденные id перечисляются в `missing`.'
+        )
+
+    def test_03_invalid_ids(self, client, titles, settings):
+        settings.TITLES_MULTI_GET_MAX_IDS = 3
+        for ids in ('', 'a,b', '1,2,3,4'):
+            response = client.get(BULK_URL, {'ids': ids})
+            assert response.status_code == HTTPStatus.BAD_REQUEST, (
+                f'Проверьте, что `ids={ids}` возвращает 400.'
+            )
+
+    def test_04_constant_queries(self, client, titles):
+        counts = []
+        for chunk in (titles[:1], titles):
+            ids = ','.join(str(title.pk) for title in chunk)
+            with CaptureQueriesContext(connection) as context:
+                client.get(BULK_URL, {'ids': ids})
+            counts.append(len(context))
+        assert counts[0] == counts[1] == 2, (
+            'Проверьте, что произведения и жанры загружаются двумя '
+            'запросами.'
+        )
@@ -0,0 +1,98 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+def select_sql(context):
+    return [
+        query['sql'] for query in context.captured_queries
+        if query['sql'].startswith('SELECT')
+    ]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test18SparseFields:
+
+    def test_01_titles_fields(self, client, title):
+        with CaptureQueriesContext(connection) as context:
+            response = client.get('/api/v1/titles/?fields=id,name')
+        assert response.status_code == HTTPStatus.OK
+        results = response.json()['results']
+        assert set(results[0]) == {'id', 'name'}, (
+            'Проверьте, что `fields` оставляет в ответе только '
+            'перечисленные поля.'
+        )
+        sql = ' '.join(select_sql(context))
+        assert 'reviews_genre' not in sql, (
+            'Проверьте, что жанры не загружаются, если их нет в ответе.'
+        )
+        assert 'reviews_category' not in sql
+        assert '"description"' not in sql
+
+    def test_02_titles_omit(self, client, title):
+        response = client.get(
+            f'/api/v1/titles/{title.pk}/?omit=description,genre'
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert set(response.json()) == {
+            'id', 'category', 'name', 'year', 'rating'
+        }
+        response = client.get('/api/v1/titles/bulk/', {
+            'ids': title.pk, 'fields': 'id,genre'
+        })
+        assert set(response.json()['results'][0]) == {'id', 'genre'}
+
+    def test_03_reviews_keyset(self, client, review):
+        url = f'/api/v1/titles/{review.title_id}/reviews/'
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(
+                url, {'omit': 'text,title', 'pagination': 'cursor'}
+            )
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        assert set(data['results'][0]) == {
+            'author', 'id', 'pub_date', 'score'
+        }
+        sql = select_sql(context)
+        # Произведение из адреса, валидаторы ETag и страница отзывов.
+        assert len(sql) == 3, (
+            'Проверьте, что исключённые поля не загружаются отдельными '
+            'запросами.'
+        )
+        assert '"text"' not in sql[-1]
+        assert 'reviews_title' not in sql[-1]
+
+    def test_04_comments_without_review(self, client, comment):
+        review = comment.review
+        url = (f'/api/v1/titles/{review.title_id}/reviews/{review.pk}'
+               '/comments/')
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url, {'fields': 'id,text'})
+        assert response.status_code == HTTPStatus.OK
+        assert set(response.json()['results'][0]) == {'id', 'text'}
+        # Отзыв из адреса, валидаторы ETag, COUNT(*) и комментарии - без
+        # загрузки отзыва и авторов.
+        assert len(select_sql(context)) == 4, (
+            'Проверьте, что отзыв не загружается, если его нет в ответе.'
+        )
+
+    def test_05_unknown_field(self, client, title):
+        response = client.get('/api/v1/titles/?fields=id,secret')
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        response = client.get('/api/v1/categories/?omit=secret')
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_06_write_ignores_fields(self, admin_client):
+        response = admin_client.post(
+            '/api/v1/categories/?fields=slug',
+            data={'name': 'Книга', 'slug': 'book'},
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        assert response.json() == {'name': 'Книга', 'slug': 'book'}
+
+    def test_07_users_fields(self, admin_client):
+        response = admin_client.get('/api/v1/users/?fields=username')
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['results'] == [{'username': 'TestAdmin'}]
@@ -0,0 +1,91 @@
+import uuid
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from http import HTTPStatus
+
+import pytest
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+
+PAYLOADS = (
+    {'name': 'Произведение «Ёж»', 'year': 2000, 'rating': None},
+    [{'id': 1, 'genre': [{'name': 'Драма', 'slug': 'drama'}]}, []],
+    {'pub_date': datetime(2019, 9, 24, 21, 8, 21, 567891,
+                          tzinfo=timezone.utc),
+     'day': date(2020, 1, 2), 'naive': datetime(2020, 1, 2, 3, 4, 5)},
+    {'lazy': gettext_lazy('Not found.'), 'code': uuid.UUID(int=1),
+     'price': Decimal('1.5'), 1: 'ключ-число'},
+    {'text': 'строка с разделителями ', 'big': 2 ** 70},
+    {'float': 0.1, 'nested': {'tuple': (1, 2), 'bool': True}},
+)
+
+
+class Test19FastJSONRenderer:
+
+    @pytest.mark.parametrize('data', PAYLOADS)
+    def test_same_bytes(self, data):
+        from api.renderers import FastJSONRenderer
+
+        assert FastJSONRenderer().render(data) == (
+            JSONRenderer().render(data)
+        ), 'Проверьте, что FastJSONRenderer выдаёт те же байты.'
+
+    def test_indent(self):
+        from api.renderers import FastJSONRenderer
+
+        data = PAYLOADS[0]
+        media_type = 'application/json; indent=4'
+        assert FastJSONRenderer().render(data, media_type) == (
+            JSONRenderer().render(data, media_type)
+        )
+
+    def test_fallback_without_orjson(self, monkeypatch):
+        from api import parsers, renderers
+
+        monkeypatch.setattr(renderers, 'orjson', None)
+        monkeypatch.setattr(parsers, 'orjson', None)
+        data = PAYLOADS[2]
+        assert renderers.FastJSONRenderer().render(data) == (
+            JSONRenderer().render(data)
+        )
+        assert parsers.FastJSONParser().parse(
+            _stream('{"ключ": [1, 2]}')
+        ) == {'ключ': [1, 2]}
+
+
+def _stream(text):
+    from io import BytesIO
+
+    return BytesIO(text.encode())
+
+
+class Test19FastJSONParser:
+
+    def test_parse(self):
+        from api.parsers import FastJSONParser
+
+        assert FastJSONParser().parse(
+            _stream('{"name": "Ёж", "big": 1180591620717411303424}')
+        ) == {'name': 'Ёж', 'big': 2 ** 70}
+
+    @pytest.mark.parametrize('body', ('{"a": }', '{"a": NaN}', ''))
+    def test_parse_error(self, body):
+        from api.parsers import FastJSONParser
+
+        with pytest.raises(ParseError):
+            FastJSONParser().parse(_stream(body))
+
+
+@pytest.mark.django_db(transaction=True)
+class Test19RendererSettings:
+
+    def test_api_uses_fast_renderer(self, admin_client):
+        response = admin_client.post(
+            '/api/v1/categories/', data={'name': 'Фильм', 'slug': 'film'},
+            format='json',
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        assert response.content == (
+            '{"name":"Фильм","slug":"film"}'.encode()
+        )
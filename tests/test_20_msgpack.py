@@ -0,0 +1,68 @@
+import json
+from http import HTTPStatus
+
+import pytest
+
+msgpack = pytest.importorskip('msgpack')
+
+MSGPACK = 'application/msgpack'
+
+
+def assert_same_payload(client, url):
+    json_response = client.get(url)
+    response = client.get(url, HTTP_ACCEPT=MSGPACK)
+    assert response.status_code == HTTPStatus.OK
+    assert response['Content-Type'] == MSGPACK, (
+        'Проверьте, что `Accept: application/msgpack` выбирает MessagePack.'
+    )
+    assert msgpack.unpackb(response.content) == json.loads(
+        json_response.content
+    ), f'Проверьте, что `{url}` в MessagePack совпадает с JSON.'
+    assert len(response.content) < len(json_response.content)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test20MessagePack:
+
+    def test_01_feeds(self, client, comment):
+        review = comment.review
+        title_url = f'/api/v1/titles/{review.title_id}/'
+        for url in (
+            '/api/v1/titles/',
+            title_url,
+            '/api/v1/categories/',
+            '/api/v1/genres/',
+            f'{title_url}reviews/',
+            f'{title_url}reviews/?pagination=cursor',
+            f'{title_url}reviews/{review.pk}/comments/',
+        ):
+            assert_same_payload(client, url)
+
+    def test_02_users(self, admin_client, review):
+        assert_same_payload(admin_client, '/api/v1/users/')
+
+    def test_03_format_param(self, client, review):
+        response = client.get('/api/v1/genres/?format=msgpack')
+        assert response['Content-Type'] == MSGPACK
+
+    def test_04_msgpack_body(self, admin_client):
+        response = admin_client.post(
+            '/api/v1/categories/',
+            data=msgpack.packb({'name': 'Книга', 'slug': 'book'}),
+            content_type=MSGPACK,
+            HTTP_ACCEPT=MSGPACK,
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        assert msgpack.unpackb(response.content) == {
+            'name': 'Книга', 'slug': 'book'
+        }
+
+    def test_05_invalid_body(self, admin_client):
+        response = admin_client.post(
+            '/api/v1/categories/', data=b'\xc1', content_type=MSGPACK,
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_06_json_is_default(self, client, review):
+        response = client.get('/api/v1/genres/', HTTP_ACCEPT='*/*')
+        assert response['Content-Type'] == 'application/json'
@@ -0,0 +1,85 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import get_with_queries
+
+
+@pytest.mark.django_db(transaction=True)
+class Test21ListCache:
+
+    @pytest.mark.parametrize('url', ('/api/v1/categories/', '/api/v1/genres/'))
+    def test_01_cached_list(self, client, url):
+        first, queries = get_with_queries(client, url)
+        assert first.status_code == HTTPStatus.OK
+        assert queries > 0
+        second, queries = get_with_queries(client, url)
+        assert queries == 0, (
+            f'Проверьте, что повторный запрос `{url}` отдаётся из кеша.'
+        )
+        assert second.json() == first.json()
+
+    def test_02_key_includes_query(self, client):
+        from reviews.models import Category
+
+        Category.objects.create(name='Фильм', slug='movie')
+        Category.objects.create(name='Книга', slug='book')
+        response, _ = get_with_queries(
+            client, '/api/v1/categories/?search=Книга'
+        )
+        assert [item['slug'] for item in response.json()['results']] == [
+            'book'
+        ]
+        response, queries = get_with_queries(
+            client, '/api/v1/categories/?search=Фильм'
+        )
+        assert queries > 0
+        assert [item['slug'] for item in response.json()['results']] == [
+            'movie'
+        ]
+
+    def test_03_api_changes_invalidate(self, client, admin_client):
+        url = '/api/v1/categories/'
+        get_with_queries(client, url)
+        response = admin_client.post(
+            url, data={'name': 'Фильм', 'slug': 'movie'}
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        response, queries = get_with_queries(client, url)
+        assert queries > 0
+        assert response.json()['count'] == 1, (
+            'Проверьте, что создание категории сбрасывает кеш списка.'
+        )
+        admin_client.delete(f'{url}movie/')
+        response, _ = get_with_queries(client, url)
+        assert response.json()['count'] == 0, (
+            'Проверьте, что удаление категории сбрасывает кеш списка.'
+        )
+
+    def test_04_invalidation_is_per_model(self, client):
+        from reviews.models import Genre
+
+        get_with_queries(client, '/api/v1/categories/')
+        get_with_queries(client, '/api/v1/genres/')
+        genre = Genre.objects.create(name='Драма', slug='drama')
+        _, queries = get_with_queries(client, '/api/v1/categories/')
+        assert queries == 0, (
+            'Проверьте, что изменение жанра не сбрасывает кеш категорий.'
+        )
+        response, _ = get_with_queries(client, '/api/v1/genres/')
+        assert response.json()['count'] == 1
+        genre.name = 'Комедия'
+        genre.save()
+        response, _ = get_with_queries(client, '/api/v1/genres/')
+        assert response.json()['results'][0]['name'] == 'Комедия'
+
+    def test_05_cached_formats(self, client):
+        pytest.importorskip('msgpack')
+        url = '/api/v1/genres/'
+        get_with_queries(client, url)
+        response, queries = get_with_queries(
+            client, url, HTTP_ACCEPT='application/msgpack'
+        )
+        assert queries == 0
+        assert response.status_code == HTTPStatus.OK
+        assert response['Content-Type'] == 'application/msgpack'
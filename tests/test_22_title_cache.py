@@ -0,0 +1,224 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import get_with_queries
+
+
+@pytest.fixture
+def catalog(catalog):
+    """Каталог и два произведения разных категорий и жанров."""
+    from reviews.models import Title
+
+    first = Title.objects.create(name='Первое', year=2000,
+                                 category=catalog['movie'])
+    first.genre.set([catalog['drama']])
+    second = Title.objects.create(name='Второе', year=2001,
+                                  category=catalog['book'])
+    second.genre.set([catalog['comedy']])
+    return {**catalog, 'first': first, 'second': second}
+
+
+def detail(title):
+    return f'/api/v1/titles/{title.pk}/'
+
+
+@pytest.mark.django_db(transaction=True)
+class Test22TitleResponseCache:
+
+    def test_01_cached_responses(self, client, catalog):
+        for url in ('/api/v1/titles/', detail(catalog['first'])):
+            first, queries = get_with_queries(client, url)
+            assert first.status_code == HTTPStatus.OK
+            assert queries > 0
+            second, queries = get_with_queries(client, url)
+            assert queries == 0, (
+                f'Проверьте, что повторный запрос `{url}` отдаётся из кеша.'
+            )
+            assert second.json() == first.json()
+
+    def test_02_review_bumps_only_its_title(self, client, admin, catalog):
+        from reviews.models import Review
+
+        first, second = catalog['first'], catalog['second']
+        get_with_queries(client, detail(first))
+        get_with_queries(client, detail(second))
+        review = Review.objects.create(
+            title=first, author=admin, text='Отзыв', score=8
+        )
+        response, queries = get_with_queries(client, detail(first))
+        assert queries > 0
+        assert response.json()['rating'] == 8, (
+            'Проверьте, что новый отзыв сразу виден в рейтинге.'
+        )
+        _, queries = get_with_queries(client, detail(second))
+        assert queries == 0, (
+            'Проверьте, что отзыв сбрасывает кеш только своего '
+            'произведения.'
+        )
+        review.score = 4
+        review.save()
+        response, _ = get_with_queries(client, detail(first))
+        assert response.json()['rating'] == 4
+        review.delete()
+        response, _ = get_with_queries(client, detail(first))
+        assert response.json()['rating'] is None
+
+    def test_03_review_in_list(self, client, admin, catalog):
+        from reviews.models import Review
+
+        get_with_queries(client, '/api/v1/titles/')
+        Review.objects.create(
+            title=catalog['second'], author=admin, text='Отзыв', score=9
+        )
+        response, _ = get_with_queries(client, '/api/v1/titles/')
+        ratings = {
+            item['name']: item['rating']
+            for item in response.json()['results']
+        }
+        assert ratings == {'Первое': None, 'Второе': 9}
+
+    def test_04_genre_rename(self, client, catalog):
+        first, second = catalog['first'], catalog['second']
+        get_with_queries(client, detail(first))
+        get_with_queries(client, detail(second))
+        drama = catalog['drama']
+        drama.name = 'Трагедия'
+        drama.slug = 'tragedy'
+        drama.save()
+        response, _ = get_with_queries(client, detail(first))
+        assert response.json()['genre'] == [
+            {'name': 'Трагедия', 'slug': 'tragedy'}
+        ]
+        _, queries = get_with_queries(client, detail(second))
+        assert queries == 0, (
+            'Проверьте, что переименование жанра не сбрасывает кеш '
+            'произведений других жанров.'
+        )
+        response, _ = get_with_queries(client, '/api/v1/titles/?genre=tragedy')
+        assert response.json()['count'] == 1
+
+    def test_05_category_delete(self, client, admin_client, catalog):
+        first, second = catalog['first'], catalog['second']
+        get_with_queries(client, detail(first))
+        get_with_queries(client, detail(second))
+        response = admin_client.delete('/api/v1/categories/movie/')
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        response, _ = get_with_queries(client, detail(first))
+        assert response.json()['category'] is None, (
+            'Проверьте, что удаление категории сбрасывает кеш её '
+            'произведений.'
+        )
+        _, queries = get_with_queries(client, detail(second))
+        assert queries == 0
+
+    def test_06_genre_set_changes(self, client, catalog):
+        first = catalog['first']
+        get_with_queries(client, detail(first))
+        get_with_queries(client, '/api/v1/titles/?genre=comedy')
+        first.genre.add(catalog['comedy'])
+        response, _ = get_with_queries(client, detail(first))
+        assert len(response.json()['genre']) == 2
+        response, _ = get_with_queries(client, '/api/v1/titles/?genre=comedy')
+        assert response.json()['count'] == 2
+        catalog['comedy'].titles.clear()
+        response, _ = get_with_queries(client, detail(first))
+        genres = response.json()['genre']
+        assert [genre['slug'] for genre in genres] == ['drama']
+
+    def test_07_title_writes(self, client, admin_client, catalog):
+        first = catalog['first']
+        get_with_queries(client, '/api/v1/titles/')
+        get_with_queries(client, detail(first))
+        response = admin_client.patch(
+            detail(first), data={'name': 'Новое имя'}, format='json'
+        )
+        assert response.status_code == HTTPStatus.OK
+        response, _ = get_with_queries(client, detail(first))
+        assert response.json()['name'] == 'Новое имя'
+        response = admin_client.post('/api/v1/titles/bulk/', data=[
+            {'name': 'Третье', 'year': 2002, 'category': 'book',
+             'genre': ['drama']},
+            {'id': first.pk, 'year': 1999},
+        ], format='json')
+        assert response.status_code == HTTPStatus.CREATED
+        response, _ = get_with_queries(client, '/api/v1/titles/')
+        assert response.json()['count'] == 3
+        response, _ = get_with_queries(client, detail(first))
+        assert response.json()['year'] == 1999
+
+    def test_08_version_eviction(self, client, catalog):
+        from api.caching import response_cache
+
+        url = detail(catalog['first'])
+        get_with_queries(client, url)
+        cache = response_cache()
+        # Ключи locmem хранятся с префиксом версии ключа: ':1:'.
+        for key in list(cache._cache):
+            key = key.split(':', 2)[2]
+            if key.startswith('api-response-version:'):
+                cache.delete(key)
+        _, queries = get_with_queries(client, url)
+        assert queries > 0, (
+            'Проверьте, что после вытеснения версий старые ответы не '
+            'используются.'
+        )
+
+    @pytest.mark.parametrize('method', ('paginate_queryset', 'get_object'))
+    def test_09_write_during_request(self, client, admin, catalog,
+                                     monkeypatch, method):
+        from api.views import TitleViewSet
+        from reviews.models import Review
+
+        first = catalog['first']
+        url = '/api/v1/titles/' if method == 'paginate_queryset' else (
+            detail(first)
+        )
+        load = getattr(TitleViewSet, method)
+
+        def load_then_write(view, *args):
+            # Отзыв фиксируется после чтения данных, но до того, как
+            # ответ попадает в кеш.
+            loaded = load(view, *args)
+            monkeypatch.setattr(TitleViewSet, method, load)
+            Review.objects.create(
+                title=first, author=admin, text='Отзыв', score=6
+            )
+            return loaded
+
+        monkeypatch.setattr(TitleViewSet, method, load_then_write)
+        get_with_queries(client, url)
+        response, _ = get_with_queries(client, detail(first))
+        assert response.json()['rating'] == 6
+        response, _ = get_with_queries(client, url)
+        data = response.json()
+        rating = data['results'][0]['rating'] if 'results' in data else (
+            data['rating']
+        )
+        assert rating == 6, (
+            'Проверьте, что ответ, собранный во время записи, не '
+            'сохраняется в кеш под новыми версиями.'
+        )
+
+    def test_10_list_version(self, client, admin_client, catalog):
+        first = catalog['first']
+        book_url = '/api/v1/titles/?category=book'
+        get_with_queries(client, book_url)
+        response = admin_client.patch(
+            detail(first), data={'description': 'Новое описание'},
+            format='json',
+        )
+        assert response.status_code == HTTPStatus.OK
+        _, queries = get_with_queries(client, book_url)
+        assert queries == 0, (
+            'Проверьте, что изменение описания не сбрасывает списки, '
+            'в которые произведение не входит.'
+        )
+        response = admin_client.patch(
+            detail(first), data={'category': 'book'}, format='json'
+        )
+        assert response.status_code == HTTPStatus.OK
+        response, _ = get_with_queries(client, book_url)
+        assert response.json()['count'] == 2, (
+            'Проверьте, что изменение полей для фильтров обновляет списки.'
+        )
@@ -0,0 +1,158 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import get_with_queries
+
+
+def reviews_url(title):
+    return f'/api/v1/titles/{title.pk}/reviews/'
+
+
+@pytest.mark.django_db(transaction=True)
+class Test23ConditionalGet:
+
+    def test_01_validators(self, client, comment):
+        review = comment.review
+        urls = (
+            '/api/v1/titles/',
+            f'/api/v1/titles/{review.title_id}/',
+            '/api/v1/categories/',
+            '/api/v1/genres/',
+            reviews_url(review.title),
+            f'{reviews_url(review.title)}{review.pk}/',
+            f'{reviews_url(review.title)}{review.pk}/comments/',
+        )
+        for url in urls:
+            response = client.get(url)
+            assert response.status_code == HTTPStatus.OK
+            assert response.has_header('ETag'), (
+                f'Проверьте, что ответ `{url}` содержит заголовок ETag.'
+            )
+            assert response.has_header('Last-Modified'), (
+                f'Проверьте, что ответ `{url}` содержит заголовок '
+                'Last-Modified.'
+            )
+            response = client.get(
+                url, HTTP_IF_NONE_MATCH=response['ETag']
+            )
+            assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+                f'Проверьте, что `{url}` с актуальным If-None-Match '
+                'возвращает 304.'
+            )
+            assert not response.content
+
+    def test_02_not_modified_without_page(self, client, review):
+        url = reviews_url(review.title)
+        etag = client.get(url)['ETag']
+        response, queries = get_with_queries(
+            client, url, HTTP_IF_NONE_MATCH=etag
+        )
+        assert response.status_code == HTTPStatus.NOT_MODIFIED
+        # Произведение из адреса и MAX(updated_at), COUNT(*).
+        assert queries == 2, (
+            'Проверьте, что 304 отдаётся без загрузки страницы.'
+        )
+        assert response['ETag'] == etag
+
+    def test_03_if_modified_since(self, client, review):
+        url = reviews_url(review.title)
+        last_modified = client.get(url)['Last-Modified']
+        response = client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            'Проверьте, что If-Modified-Since учитывается.'
+        )
+
+    def test_04_changes(self, client, review):
+        from reviews.models import Review
+
+        url = reviews_url(review.title)
+        etag = client.get(url)['ETag']
+        review.text = 'Новый текст'
+        review.save()
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что изменение отзыва меняет ETag списка.'
+        )
+        etag = response['ETag']
+        Review.objects.filter(pk=review.pk).delete()
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что удаление отзыва меняет ETag списка.'
+        )
+
+    def test_05_related_changes(self, client, admin, catalog, review):
+        title = review.title
+        url = reviews_url(title)
+        etag = client.get(url)['ETag']
+        admin.username = 'renamed'
+        admin.save()
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что смена логина автора меняет ETag отзывов.'
+        )
+        assert response.json()['results'][0]['author'] == 'renamed'
+
+        url = f'/api/v1/titles/{title.pk}/'
+        etag = client.get(url)['ETag']
+        drama = catalog['drama']
+        drama.name = 'Трагедия'
+        drama.save()
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что переименование жанра меняет ETag произведения.'
+        )
+        etag = response['ETag']
+        catalog['movie'].delete()
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что удаление категории меняет ETag произведения.'
+        )
+        assert response.json()['category'] is None
+
+    def test_06_cached_not_modified(self, client, review):
+        url = '/api/v1/titles/'
+        etag = client.get(url)['ETag']
+        response, queries = get_with_queries(
+            client, url, HTTP_IF_NONE_MATCH=etag
+        )
+        assert response.status_code == HTTPStatus.NOT_MODIFIED
+        assert queries == 0, (
+            'Проверьте, что 304 для закешированного ответа отдаётся '
+            'без запросов к базе.'
+        )
+        response, _ = get_with_queries(client, url, HTTP_IF_NONE_MATCH='"x"')
+        assert response.status_code == HTTPStatus.OK
+        assert response['ETag'] == etag
+
+    def test_07_rating_changes_title(self, client, review):
+        url = f'/api/v1/titles/{review.title_id}/'
+        etag = client.get(url)['ETag']
+        review.score = 2
+        review.save()
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['rating'] == 2
+
+    def test_08_patch_changes_validators(self, client, admin_client,
+                                         comment):
+        review = comment.review
+        review_url = f'{reviews_url(review.title)}{review.pk}/'
+        comment_url = f'{review_url}comments/{comment.pk}/'
+        for url, item_url in (
+            (reviews_url(review.title), review_url),
+            (f'{review_url}comments/', comment_url),
+        ):
+            etags = {
+                page: client.get(page)['ETag'] for page in (url, item_url)
+            }
+            response = admin_client.patch(
+                item_url, data={'text': f'Новый текст {url}'}, format='json'
+            )
+            assert response.status_code == HTTPStatus.OK
+            for page, etag in etags.items():
+                response = client.get(page, HTTP_IF_NONE_MATCH=etag)
+                assert response.status_code == HTTPStatus.OK, (
+                    f'Проверьте, что изменение текста через PATCH меняет '
+                    f'ETag `{page}`.'
+                )
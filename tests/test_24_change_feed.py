@@ -0,0 +1,253 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+URL = '/api/v1/changes/'
+
+
+@pytest.fixture(autouse=True)
+def no_settle_delay(settings):
+    settings.CHANGE_FEED_SETTLE_DELAY = 0
+
+
+def create_title(catalog, name='Произведение'):
+    from reviews.models import Title
+
+    title = Title.objects.create(name=name, year=2000,
+                                 category=catalog['movie'])
+    title.genre.set([catalog['drama']])
+    return title
+
+
+def feed(client, **params):
+    response = client.get(URL, params)
+    assert response.status_code == HTTPStatus.OK, response.content
+    return response.json()
+
+
+def changes(data):
+    return [(item['entity'], item['id'], item['action'])
+            for item in data['results']]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test24ChangeFeed:
+
+    def test_01_head_and_changes(self, client, admin, catalog):
+        from reviews.models import Comments, Review
+
+        head = feed(client)
+        assert head['results'] == [] and head['has_more'] is False
+        title = create_title(catalog)
+        review = Review.objects.create(
+            title=title, author=admin, text='Отзыв', score=6
+        )
+        comment = Comments.objects.create(
+            review=review, author=admin, text='Комментарий'
+        )
+
+        data = feed(client, cursor=head['cursor'])
+        # Рейтинг пересчитывается в конце сохранения отзыва.
+        assert changes(data) == [
+            ('review', review.pk, 'created'),
+            ('title', title.pk, 'created'),
+            ('comment', comment.pk, 'created'),
+        ], (
+            'Проверьте, что лента возвращает по одной записи на объект '
+            'в порядке последнего изменения.'
+        )
+        title_data = data['results'][1]['data']
+        assert title_data['rating'] == 6
+        assert title_data['genre'] == [{'name': 'Драма', 'slug': 'drama'}]
+        assert data['results'][0]['parent_id'] == title.pk
+        assert data['results'][2]['parent_id'] == review.pk
+        assert data['results'][2]['data']['text'] == 'Комментарий'
+
+        again = feed(client, cursor=data['cursor'])
+        assert again['results'] == []
+        assert again['cursor'] == data['cursor']
+
+    def test_02_tombstones(self, client, admin, catalog):
+        from reviews.models import Comments, Review
+
+        title = create_title(catalog)
+        review = Review.objects.create(
+            title=title, author=admin, text='Отзыв', score=6
+        )
+        comment = Comments.objects.create(
+            review=review, author=admin, text='Комментарий'
+        )
+        cursor = feed(client)['cursor']
+        review_id = review.pk
+        review.delete()
+
+        data = feed(client, cursor=cursor)
+        assert changes(data) == [
+            ('comment', comment.pk, 'deleted'),
+            ('review', review_id, 'deleted'),
+            ('title', title.pk, 'updated'),
+        ], (
+            'Проверьте, что удаления попадают в ленту вместе с каскадными.'
+        )
+        tombstone = data['results'][1]
+        assert tombstone['data'] is None
+        assert tombstone['parent_id'] == title.pk
+        assert data['results'][2]['data']['rating'] is None
+
+    def test_03_batches(self, client, catalog):
+        cursor, seen = feed(client)['cursor'], []
+        titles = [create_title(catalog, f'Произведение {number}')
+                  for number in range(5)]
+        while True:
+            data = feed(client, cursor=cursor, limit=2)
+            assert len(data['results']) <= 2
+            seen.extend(item['id'] for item in data['results'])
+            cursor = data['cursor']
+            if not data['has_more']:
+                break
+        assert seen == [title.pk for title in titles], (
+            'Проверьте, что лента читается пачками по limit записей.'
+        )
+
+    def test_04_entity_filter(self, client, admin, catalog):
+        from reviews.models import Review
+
+        cursor = feed(client)['cursor']
+        title = create_title(catalog)
+        review = Review.objects.create(
+            title=title, author=admin, text='Отзыв', score=6
+        )
+        data = feed(client, cursor=cursor, entity='review')
+        assert changes(data) == [('review', review.pk, 'created')]
+        response = client.get(URL, {'cursor': cursor, 'entity': 'user'})
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_05_related_changes(self, client, catalog):
+        title = create_title(catalog)
+        cursor = feed(client)['cursor']
+        drama = catalog['drama']
+        drama.name = 'Трагедия'
+        drama.save()
+        data = feed(client, cursor=cursor)
+        assert changes(data) == [('title', title.pk, 'updated')], (
+            'Проверьте, что переименование жанра попадает в ленту '
+            'как изменение произведения.'
+        )
+        assert data['results'][0]['data']['genre'][0]['name'] == 'Трагедия'
+
+    def test_06_bulk_titles(self, admin_client, client, catalog):
+        cursor = feed(client)['cursor']
+        response = admin_client.post(
+            '/api/v1/titles/bulk/',
+            [{'name': 'Пакет', 'year': 2001, 'category': 'movie',
+              'genre': ['drama']}],
+            format='json',
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        title_id = response.json()['results'][0]['data']['id']
+        data = feed(client, cursor=cursor)
+        assert changes(data) == [('title', title_id, 'created')], (
+            'Проверьте, что пакетная загрузка попадает в ленту.'
+        )
+
+    def test_07_expired_cursor(self, client, catalog):
+        from reviews.changelog import prune_changes
+
+        start = feed(client)['cursor']
+        for number in range(3):
+            create_title(catalog, f'Произведение {number}')
+        head = feed(client)['cursor']
+        assert prune_changes(days=0) > 0
+        response = client.get(URL, {'cursor': start})
+        assert response.status_code == HTTPStatus.GONE, (
+            'Проверьте, что курсор до удалённых записей устаревает.'
+        )
+        assert feed(client, cursor=head)['results'] == []
+        response = client.get(URL, {'cursor': head + 100})
+        assert response.status_code == HTTPStatus.GONE
+        response = client.get(URL, {'cursor': 'abc'})
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_08_settle_delay(self, client, settings, catalog):
+        settings.CHANGE_FEED_SETTLE_DELAY = 60
+        cursor = feed(client)['cursor']
+        create_title(catalog)
+        assert feed(client, cursor=cursor)['results'] == [], (
+            'Проверьте, что записи моложе CHANGE_FEED_SETTLE_DELAY '
+            'не отдаются.'
+        )
+
+    def test_09_queries(self, client, admin, catalog):
+        from reviews.models import Review
+
+        cursor = feed(client)['cursor']
+        for number in range(5):
+            title = create_title(catalog, f'Произведение {number}')
+            Review.objects.create(
+                title=title, author=admin, text='Отзыв', score=5
+            )
+        with CaptureQueriesContext(connection) as context:
+            data = feed(client, cursor=cursor)
+        assert len(data['results']) == 10
+        # Границы журнала, пачка записей, произведения с жанрами, отзывы.
+        assert len(context) == 5, (
+            'Проверьте, что объекты ленты загружаются пачкой, '
+            'а не по одному.'
+        )
+
+    def test_10_log_written_in_transaction(self, client, catalog):
+        from django.db import transaction
+
+        from reviews.models import ChangeLog, Title
+
+        cursor = feed(client)['cursor']
+        with transaction.atomic():
+            title = create_title(catalog)
+            assert ChangeLog.objects.filter(object_id=title.pk).exists(), (
+                'Проверьте, что запись журнала пишется в транзакции '
+                'изменения.'
+            )
+        assert changes(feed(client, cursor=cursor)) == [
+            ('title', title.pk, 'created')
+        ]
+        with pytest.raises(RuntimeError):
+            with transaction.atomic():
+                Title.objects.create(name='Отменённое', year=2000)
+                raise RuntimeError
+        assert feed(client, cursor=cursor)['cursor'] == (
+            ChangeLog.objects.latest('id').pk
+        ), 'Проверьте, что откаченные изменения не попадают в журнал.'
+
+    def test_11_cascade_delete_single_insert(self, client, catalog,
+                                             django_user_model):
+        from reviews.models import Comments, Review
+
+        title = create_title(catalog)
+        for number in range(5):
+            author = django_user_model.objects.create_user(
+                username=f'author-{number}', email=f'author-{number}@ya.ru'
+            )
+            review = Review.objects.create(
+                title=title, author=author, text='Отзыв', score=5
+            )
+            Comments.objects.create(
+                review=review, author=author, text='Комментарий'
+            )
+        cursor, title_id = feed(client)['cursor'], title.pk
+        with CaptureQueriesContext(connection) as context:
+            title.delete()
+        inserts = [
+            query for query in context.captured_queries
+            if query['sql'].startswith('INSERT INTO "reviews_changelog"')
+        ]
+        assert len(inserts) == 1, (
+            'Проверьте, что записи журнала каскадного удаления '
+            'вставляются одним запросом.'
+        )
+        data = feed(client, cursor=cursor, entity='title')
+        assert changes(data) == [('title', title_id, 'deleted')], (
+            'Проверьте, что удаляемое произведение не получает записей '
+            'об изменении рейтинга.'
+        )
@@ -0,0 +1,182 @@
+import asyncio
+import json
+import time
+from http import HTTPStatus
+
+import pytest
+from asgiref.sync import sync_to_async
+
+TIMEOUT = 5
+
+
+def parse_events(messages):
+    """События из тела ответа: список пар (event, data)."""
+    body = b''.join(
+        message.get('body', b'') for message in messages
+        if message['type'] == 'http.response.body'
+    ).decode('utf-8')
+    events = []
+    for block in body.split('\n\n'):
+        fields = dict(
+            line.split(': ', 1) for line in block.split('\n')
+            if ': ' in line and not line.startswith(':')
+        )
+        if 'event' in fields:
+            events.append((fields['event'], json.loads(fields['data'])))
+    return events
+
+
+async def wait_for(condition):
+    for _ in range(TIMEOUT * 100):
+        if condition():
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError('Истекло время ожидания.')
+
+
+async def open_stream(title_id, action=None, expected_events=0):
+    """
+    Подключение к потоку через ASGI-приложение проекта: action
+    выполняется после подписки, затем клиент отключается.
+    """
+    from api.events import get_broker, title_topic
+    from api_yamdb.asgi import application
+
+    inbox = asyncio.Queue()
+    messages = []
+
+    async def receive():
+        return await inbox.get()
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {
+        'type': 'http', 'method': 'GET', 'query_string': b'',
+        'path': f'/api/v1/titles/{title_id}/reviews/stream/',
+        'headers': [],
+    }
+    task = asyncio.ensure_future(application(scope, receive, send))
+    topic = title_topic(title_id)
+    await wait_for(lambda: task.done() or get_broker().has_subscribers(topic))
+    if action is not None:
+        await sync_to_async(action)()
+        await wait_for(lambda: len(parse_events(messages)) >= expected_events)
+    await inbox.put({'type': 'http.disconnect'})
+    await asyncio.wait_for(task, TIMEOUT)
+    assert not get_broker().has_subscribers(topic), (
+        'Проверьте, что после отключения клиент отписывается.'
+    )
+    return messages
+
+
+@pytest.mark.django_db(transaction=True)
+class Test25ReviewStream:
+
+    def test_01_new_review_and_rating(self, admin, title):
+        from reviews.models import Review
+
+        def add_review():
+            Review.objects.create(
+                title=title, author=admin, text='Отзыв', score=8
+            )
+
+        messages = asyncio.run(open_stream(title.pk, add_review, 2))
+        start = messages[0]
+        assert start['status'] == HTTPStatus.OK
+        assert (b'content-type', b'text/event-stream; charset=utf-8') in (
+            start['headers']
+        )
+        events = parse_events(messages)
+        assert events[0][0] == 'review', (
+            'Проверьте, что новый отзыв отправляется в поток.'
+        )
+        assert events[0][1]['text'] == 'Отзыв'
+        assert events[0][1]['author'] == admin.username
+        assert events[1] == ('rating', {'id': title.pk, 'rating': 8}), (
+            'Проверьте, что изменение рейтинга отправляется в поток.'
+        )
+
+    def test_02_other_titles(self, admin, title):
+        from reviews.models import Review, Title
+
+        other = Title.objects.create(name='Другое', year=2001)
+
+        def add_reviews():
+            Review.objects.create(
+                title=other, author=admin, text='Не тот', score=3
+            )
+            Review.objects.create(
+                title=title, author=admin, text='Тот', score=5
+            )
+
+        events = parse_events(
+            asyncio.run(open_stream(title.pk, add_reviews, 2))
+        )
+        assert [data.get('text') for _, data in events] == ['Тот', None], (
+            'Проверьте, что поток содержит события только своего '
+            'произведения.'
+        )
+
+    def test_03_unknown_title(self, title):
+        messages = asyncio.run(open_stream(title.pk + 100))
+        assert messages[0]['status'] == HTTPStatus.NOT_FOUND
+
+    def test_04_django_routes(self, title):
+        from api_yamdb.asgi import application
+
+        messages = []
+
+        async def receive():
+            return {'type': 'http.request', 'body': b''}
+
+        async def send(message):
+            messages.append(message)
+
+        scope = {
+            'type': 'http', 'method': 'GET', 'query_string': b'',
+            'path': f'/api/v1/titles/{title.pk}/', 'headers': [],
+            'server': ('testserver', 80), 'scheme': 'http',
+        }
+        asyncio.run(application(scope, receive, send))
+        assert messages[0]['status'] == HTTPStatus.OK, (
+            'Проверьте, что остальные адреса обслуживает Django.'
+        )
+
+    def test_05_heartbeat(self, settings, title):
+        settings.API_EVENTS_HEARTBEAT = 0.01
+        messages = asyncio.run(
+            open_stream(title.pk, lambda: time.sleep(0.1))
+        )
+        assert any(
+            message.get('body') == b': ping\n\n' for message in messages
+        ), 'Проверьте, что в тихий поток отправляются пустые сообщения.'
+
+    def test_06_slow_client(self):
+        from api.events import OVERFLOW, InMemoryBroker
+
+        broker = InMemoryBroker(buffer_size=2)
+
+        async def read():
+            subscription = broker.subscribe('topic')
+            other = broker.subscribe('topic')
+            for number in range(3):
+                broker.publish('topic', 'review', {'number': number})
+            await asyncio.sleep(0)
+            first = await subscription.get()
+            broker.publish('topic', 'review', {'number': 3})
+            await asyncio.sleep(0)
+            second = await subscription.get()
+            subscription.close()
+            other.close()
+            return first, second
+
+        first, second = asyncio.run(read())
+        assert first[1] == OVERFLOW, (
+            'Проверьте, что при переполнении буфера клиент получает '
+            'событие overflow.'
+        )
+        assert second[1:] == ('review', {'number': 3}), (
+            'Проверьте, что после переполнения поток продолжается.'
+        )
+        assert not broker.has_subscribers('topic')
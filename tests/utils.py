@@ -1,5 +1,8 @@
 from http import HTTPStatus
 
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
 
 check_name_and_slug_patterns = (
     (
@@ -305,3 +308,10 @@ def check_fields(obj_type, url_pattern, obj, expected_data, detail=False):
         f'данные {obj_types[obj_type]}{results_in_msg}. Поле `id` не '
         'найдено или не является целым числом.'
     )
+
+
+def get_with_queries(client, url, **extra):
+    """Ответ на GET-запрос и количество выполненных SQL-запросов."""
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url, **extra)
+    return response, len(context)